@@ -12,6 +12,7 @@ Identifies common misconfigurations that cause Reddit bans:
 Usage:
     python3 audit_profiles.py              # Console + JSON only
     python3 audit_profiles.py --sync       # Also sync to Google Sheets "Audit" tab
+    python3 audit_profiles.py --refresh-team  # Re-fetch team users first
 """
 
 import argparse
@@ -78,6 +79,9 @@ class AuditReport:
     # Shared proxy sessions (session_id -> list of profiles)
     shared_sessions: dict[str, list[str]] = field(default_factory=dict)
 
+    # Owner name -> profiles with issues (every team member, even with 0)
+    issues_by_owner: dict[str, int] = field(default_factory=dict)
+
 
 def parse_dataimpulse_proxy(proxy_url: str) -> ProxyAuditInfo:
     """Parse DataImpulse proxy URL for audit.
@@ -270,24 +274,38 @@ def detect_shared_sessions(results: list[ProfileAuditResult]) -> dict[str, list[
     return {k: v for k, v in session_to_profiles.items() if len(v) > 1}
 
 
-async def fetch_profiles() -> list[DolphinProfile]:
-    """Fetch all profiles from Dolphin API."""
+async def fetch_profiles(refresh_team: bool = False) -> tuple[list[DolphinProfile], list[str]]:
+    """Fetch all profiles and team owner names from Dolphin API.
+
+    Owner names come from the shared team users cache, which the profile
+    fetch then reuses.
+
+    Returns:
+        Tuple of (profiles, owner names of every team member)
+    """
     async with DolphinClient() as client:
-        return await client.get_profiles()
+        owner_map = await client.get_owner_map(refresh=refresh_team)
+        return await client.get_profiles(), list(owner_map.values())
 
 
-def generate_report(results: list[ProfileAuditResult], shared_sessions: dict[str, list[str]]) -> AuditReport:
+def generate_report(
+    results: list[ProfileAuditResult],
+    shared_sessions: dict[str, list[str]],
+    owners: list[str] | None = None,
+) -> AuditReport:
     """Generate audit report from results."""
     report = AuditReport(
         total_profiles=len(results),
         profiles_checked=len(results),
         results=results,
         shared_sessions=shared_sessions,
+        issues_by_owner={owner: 0 for owner in owners or []},
     )
 
     for result in results:
         if result.issues:
             report.profiles_with_issues += 1
+            report.issues_by_owner[result.owner] = report.issues_by_owner.get(result.owner, 0) + 1
 
         if "NO_PROXY" in result.issues:
             report.no_proxy_count += 1
@@ -347,6 +365,12 @@ def print_report(report: AuditReport) -> None:
         if len(no_geo_profiles) > 5:
             print(f"      ... and {len(no_geo_profiles) - 5} more")
 
+    if report.issues_by_owner:
+        print()
+        print("BY OWNER:")
+        for owner, count in sorted(report.issues_by_owner.items(), key=lambda kv: -kv[1]):
+            print(f"  {owner}: {count} profile(s) with issues")
+
     print()
 
 
@@ -362,6 +386,7 @@ def save_report_json(report: AuditReport, output_path: Path) -> None:
             "rotating_proxy_count": report.rotating_proxy_count,
             "shared_proxy_count": report.shared_proxy_count,
             "no_geo_count": report.no_geo_count,
+            "issues_by_owner": report.issues_by_owner,
         },
         "shared_sessions": report.shared_sessions,
         "profiles_with_issues": [
@@ -482,14 +507,15 @@ def sync_to_sheets(report: AuditReport) -> dict:
     return {"synced": len(rows)}
 
 
-async def main(sync_to_sheet: bool = False) -> None:
+async def main(sync_to_sheet: bool = False, refresh_team: bool = False) -> None:
     """Run profile audit.
 
     Args:
         sync_to_sheet: If True, also sync results to Google Sheets "Audit" tab
+        refresh_team: If True, re-fetch team users instead of using the cache
     """
     print("Fetching profiles from Dolphin API...")
-    profiles = await fetch_profiles()
+    profiles, owners = await fetch_profiles(refresh_team=refresh_team)
     print(f"Found {len(profiles)} profiles")
 
     print("Auditing profiles...")
@@ -507,7 +533,7 @@ async def main(sync_to_sheet: bool = False) -> None:
         if result.username in shared_usernames and "SHARED_SESSION" not in result.issues:
             result.issues.append("SHARED_SESSION")
 
-    report = generate_report(results, shared_sessions)
+    report = generate_report(results, shared_sessions, owners)
 
     # Print console summary
     print_report(report)
@@ -538,6 +564,11 @@ if __name__ == "__main__":
         action="store_true",
         help="Sync results to Google Sheets 'Audit' tab"
     )
+    parser.add_argument(
+        "--refresh-team",
+        action="store_true",
+        help="Re-fetch Dolphin team users (e.g. after adding a member)"
+    )
     args = parser.parse_args()
 
-    asyncio.run(main(sync_to_sheet=args.sync))
+    asyncio.run(main(sync_to_sheet=args.sync, refresh_team=args.refresh_team))
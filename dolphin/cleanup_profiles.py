@@ -9,6 +9,8 @@ Usage:
     python3 cleanup_profiles.py --scan              # Scan only, show dead profiles
     python3 cleanup_profiles.py --delete            # Delete dead profiles
     python3 cleanup_profiles.py --fix-timezones     # Fix timezones to match proxy state
+    python3 cleanup_profiles.py --fix-timezones --save-plan p.json  # Save plan for review
+    python3 cleanup_profiles.py --apply-plan p.json # Apply a reviewed timezone plan
     python3 cleanup_profiles.py --all               # Do everything
 """
 
@@ -17,7 +19,15 @@ import asyncio
 import re
 import sys
 
+from models import DolphinProfile
+from profile_plan import PlannedChange, ProfilePlan
 from sources.dolphin import DolphinClient
+from sources.dolphin_mutations import (
+    MutationJournal,
+    MutationResult,
+    ProfileMutation,
+    timezone_payload,
+)
 from sources.reddit import RedditChecker
 
 
@@ -102,9 +112,15 @@ async def scan_profiles() -> tuple[list[dict], list[dict], list[dict]]:
     return active, dead, suspended
 
 
-async def delete_profiles(profiles: list[dict], dry_run: bool = False) -> int:
+async def delete_profiles(
+    profiles: list[dict], dry_run: bool = False
+) -> int:
     """Delete profiles from Dolphin.
 
+    Deletes run concurrently through DolphinClient.apply_mutations. No
+    journal is needed: after an interruption, a re-scan no longer finds
+    the profiles already deleted.
+
     Returns:
         Number of profiles deleted
     """
@@ -114,56 +130,115 @@ async def delete_profiles(profiles: list[dict], dry_run: bool = False) -> int:
 
     print(f"\nDeleting {len(profiles)} profiles...")
 
-    deleted = 0
-    async with DolphinClient() as dolphin:
+    if dry_run:
         for p in profiles:
-            if dry_run:
-                print(f"  [DRY-RUN] Would delete: {p['name']}")
-                deleted += 1
-            else:
-                success = await dolphin.delete_profile(p["id"])
-                if success:
-                    print(f"  ✓ Deleted: {p['name']}")
-                    deleted += 1
-                else:
-                    print(f"  ✗ Failed to delete: {p['name']}")
-                await asyncio.sleep(0.1)
-
-    return deleted
+            print(f"  [DRY-RUN] Would delete: {p['name']}")
+        return len(profiles)
 
+    def progress(result: MutationResult) -> None:
+        if result.success:
+            print(f"  ✓ Deleted: {result.mutation.label}")
+        else:
+            print(f"  ✗ Failed to delete: {result.mutation.label} ({result.error})")
 
-async def fix_timezones(dry_run: bool = False) -> int:
+    mutations = [
+        ProfileMutation(kind="delete", profile_id=p["id"], label=p["name"])
+        for p in profiles
+    ]
+    async with DolphinClient() as dolphin:
+        results = await dolphin.apply_mutations(
+            mutations,
+            on_result=progress,
+        )
+
+    return sum(1 for r in results if r.success)
+
+
+def plan_timezones(profiles: list[DolphinProfile]) -> ProfilePlan:
+    """Plan timezone changes only for profiles not already matching their proxy state."""
+    plan = ProfilePlan(kind="fix_timezones", profiles_checked=len(profiles))
+    for p in profiles:
+        state = extract_state_from_proxy(p.proxy_url)
+        if not state:
+            continue
+
+        timezone = STATE_TIMEZONES.get(state)
+        if not timezone or p.timezone == timezone:
+            continue
+
+        plan.changes.append(PlannedChange(
+            profile_id=p.id,
+            profile_name=p.name,
+            setting="timezone",
+            current=p.timezone or "auto",
+            target=timezone,
+            payload=timezone_payload(timezone),
+        ))
+    return plan
+
+
+async def fix_timezones(
+    dry_run: bool = False,
+    save_plan: str | None = None,
+    plan_file: str | None = None,
+    resume: bool = False,
+) -> int:
     """Fix profile timezones to match proxy state.
 
-    Returns:
-        Number of profiles updated
-    """
-    async with DolphinClient() as dolphin:
-        profiles = await dolphin.get_profiles()
+    Only profiles whose timezone differs are planned. The plan (or a
+    reviewed one loaded from plan_file) is applied concurrently through
+    DolphinClient.apply_mutations. A loaded plan is journaled, so an
+    interrupted run can be finished with the same plan_file and resume.
 
-    print(f"\nChecking timezones for {len(profiles)} profiles...")
+    Args:
+        dry_run: Show the plan without applying it
+        save_plan: Write the plan to this path instead of applying it
+        plan_file: Apply a plan saved earlier with save_plan
+        resume: Skip changes an interrupted run of plan_file already applied
 
-    updated = 0
+    Returns:
+        Number of profiles updated (or planned, for dry runs)
+    """
     async with DolphinClient() as dolphin:
-        for i, p in enumerate(profiles):
-            state = extract_state_from_proxy(p.proxy_url)
-            if not state:
-                continue
-
-            timezone = STATE_TIMEZONES.get(state)
-            if not timezone:
-                continue
-
-            if dry_run:
-                print(f"  [DRY-RUN] {p.name}: {state} → {timezone}")
-                updated += 1
-            else:
-                success = await dolphin.update_profile_timezone(p.id, timezone)
-                if success:
-                    updated += 1
-                    if (updated) % 25 == 0:
-                        print(f"  Progress: {updated} timezones updated")
-                await asyncio.sleep(0.1)
+        if plan_file:
+            plan = ProfilePlan.load(plan_file, kind="fix_timezones")
+            print(f"\nLoaded plan from {plan_file} ({plan.created_at})")
+        else:
+            profiles = await dolphin.get_profiles()
+            print(f"\nChecking timezones for {len(profiles)} profiles...")
+            plan = plan_timezones(profiles)
+
+        print(f"  {len(plan.changes)} to update, {plan.unchanged} already correct or unmapped")
+
+        if save_plan:
+            plan.save(save_plan)
+            print(f"  Plan saved to {save_plan} - review it, then run with --apply-plan")
+            return len(plan.changes)
+
+        if dry_run:
+            for c in plan.changes:
+                print(f"  [DRY-RUN] {c.profile_name}: {c.current} → {c.target}")
+            return len(plan.changes)
+
+        updated = 0
+
+        def progress(result: MutationResult) -> None:
+            nonlocal updated
+            if not result.success:
+                print(f"  ✗ Failed: {result.mutation.label} ({result.error})")
+                return
+            if result.resumed:
+                return  # Counted by the interrupted run
+            updated += 1
+            if updated % 25 == 0:
+                print(f"  Progress: {updated} timezones updated")
+
+        await dolphin.apply_mutations(
+            plan.mutations(),
+            journal=MutationJournal(plan.kind, plan.created_at) if plan_file else None,
+            resume=resume,
+            on_result=progress,
+        )
 
     return updated
 
@@ -196,8 +271,21 @@ def main():
     parser.add_argument("--fix-timezones", action="store_true", help="Fix timezones to match proxy state")
     parser.add_argument("--all", action="store_true", help="Do scan, delete, and fix timezones")
     parser.add_argument("--dry-run", action="store_true", help="Preview changes without applying")
+    parser.add_argument("--save-plan", metavar="PATH", help="Save the timezone plan for review (no changes made)")
+    parser.add_argument("--apply-plan", metavar="PATH", help="Apply a timezone plan saved with --save-plan")
+    parser.add_argument("--resume", action="store_true", help="With --apply-plan, skip changes an interrupted run of that plan already applied")
+    parser.add_argument("--refresh-team", action="store_true", help="Re-fetch Dolphin team users (e.g. after adding a member)")
     args = parser.parse_args()
 
+    if args.refresh_team:
+        DolphinClient.invalidate_team_users()
+
+    if args.resume and not args.apply_plan:
+        parser.error("--resume requires --apply-plan")
+
+    if args.apply_plan:
+        args.fix_timezones = True
+
     if not any([args.scan, args.delete, args.fix_timezones, args.all]):
         parser.print_help()
         sys.exit(1)
@@ -228,12 +316,14 @@ def main():
 
     # Fix timezones if requested
     if args.fix_timezones:
-        if args.dry_run:
-            updated = asyncio.run(fix_timezones(dry_run=True))
+        if args.dry_run or args.save_plan:
+            updated = asyncio.run(fix_timezones(
+                dry_run=True, save_plan=args.save_plan, plan_file=args.apply_plan
+            ))
             print(f"\n[DRY-RUN] Would update {updated} timezones.")
         else:
             print(f"\nUpdating timezones to match proxy states...")
-            updated = asyncio.run(fix_timezones())
+            updated = asyncio.run(fix_timezones(plan_file=args.apply_plan, resume=args.resume))
             print(f"\nUpdated {updated} timezones.")
 
 
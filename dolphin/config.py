@@ -7,6 +7,7 @@ import json
 import logging
 from logging.handlers import TimedRotatingFileHandler
 from pathlib import Path
+from typing import Literal
 
 from pydantic import SecretStr, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -28,6 +29,13 @@ class Settings(BaseSettings):
     # Dolphin Anty API
     dolphin_api_key: SecretStr
     dolphin_api_url: str = "https://dolphin-anty-api.com"
+    dolphin_page_concurrency: int = 4  # /browser_profiles pages fetched at once
+    dolphin_profile_cache: bool = False  # Serve profiles from the local SQLite cache
+    dolphin_profile_cache_ttl: float = 900.0  # Seconds before the cache re-syncs
+    dolphin_profile_cache_full_sync_hours: float = 24.0  # Full crawl at least this often
+    dolphin_team_users_ttl: float = 3600.0  # Seconds team users are cached (0 = off)
+    dolphin_mutation_concurrency: int = 8  # Profile updates/deletes in flight
+    dolphin_mutation_retries: int = 5  # Attempts per update/delete (429, 5xx, network)
 
     # Reddit checking
     reddit_user_agent: str = "DolphinTracker/2.0"
@@ -35,6 +43,30 @@ class Settings(BaseSettings):
     reddit_max_delay: float = 5.0
     reddit_max_retries: int = 5
     reddit_backoff_base: float = 2.0
+    reddit_use_profile_proxies: bool = False  # Check each account via its own proxy
+    reddit_proxy_timeout: float = 30.0
+    reddit_batch_lookup: bool = False  # Batch karma lookups (100 accounts/request)
+    reddit_batch_shadowban: bool = False  # Batch shadowban checks (100 posts/request)
+    reddit_activity_source: Literal["listings", "overview"] = "listings"
+    reddit_activity_cursors: bool = False  # Fetch only items newer than the last run
+    reddit_adaptive_rate_limit: bool = False  # Pace by X-Ratelimit-* headers
+    reddit_breaker_threshold: int = 3  # Consecutive 429s/network errors per egress (0 = off)
+    reddit_breaker_cooldown: float = 60.0  # Seconds an open egress pauses before probing
+    reddit_egress_share: int = 1  # Processes sharing the direct egress/OAuth app (set by --workers)
+
+    # Reddit app-only OAuth (optional - enabled when client ID and secret are set)
+    reddit_client_id: str | None = None
+    reddit_client_secret: SecretStr | None = None
+    reddit_oauth_token_url: str = "https://www.reddit.com/api/v1/access_token"
+    reddit_oauth_api_base: str = "https://oauth.reddit.com"
+
+    # Tracker execution
+    tracker_concurrency: int = 1  # Accounts checked in parallel
+    tracker_adaptive_schedule: bool = False  # Only check accounts that are due
+
+    # Daemon mode (tracker.py --daemon)
+    daemon_cycle_hours: float = 24.0  # Every account is checked once per cycle
+    daemon_flush_seconds: float = 300.0  # How often results reach CSV/Sheets/state
 
     # Google Sheets sync (optional - only required for sheets sync feature)
     google_credentials_json: SecretStr | None = None
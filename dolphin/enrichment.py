@@ -0,0 +1,83 @@
+"""
+Derived account fields, computed once per result.
+
+Warmup tier, limit status, threshold warnings, account age and the karma
+delta string used to be recomputed independently by the warmup alerts, the
+run summary and the Sheets row/summary builders (each with its own
+datetime.now()). enrich_results fills AccountResult.derived once, against a
+single reference timestamp, and every consumer reads from it.
+"""
+
+from datetime import datetime, timezone
+
+from models import (
+    AccountDerived,
+    AccountResult,
+    calculate_account_age,
+    calculate_warmup_status,
+)
+from warmup import check_warmup_thresholds, get_warmup_limits
+
+
+def _limit_status(warnings: list[str]) -> str:
+    """Collapse threshold warnings into OK/WARNING/EXCEEDED."""
+    if any("EXCEEDED" in w for w in warnings):
+        return "EXCEEDED"
+    if any("WARNING" in w for w in warnings):
+        return "WARNING"
+    return "OK"
+
+
+def _format_delta(karma_change: int) -> str:
+    """Format karma_change as +N or -N for readability."""
+    if karma_change > 0:
+        return f"+{karma_change}"
+    return str(karma_change)  # "0" or already has minus sign
+
+
+def enrich_result(result: AccountResult, now: datetime | None = None) -> AccountDerived:
+    """Compute and attach the derived fields for one result.
+
+    Args:
+        result: Result to enrich (result.derived is replaced)
+        now: Reference time (defaults to current UTC time)
+
+    Returns:
+        The AccountDerived now stored on result.derived
+    """
+    now = now or datetime.now(tz=timezone.utc)
+    created_utc = result.reddit.created_utc
+
+    limits_info = get_warmup_limits(created_utc, now)
+    limits = limits_info["limits"]
+
+    warnings: list[str] = []
+    limit_status = "N/A"
+    if result.activity and limits:
+        warnings = check_warmup_thresholds(result.activity, limits)
+        limit_status = _limit_status(warnings)
+    elif result.reddit.status == "active":
+        limit_status = "OK"  # Active but no activity data (or limits) yet
+
+    result.derived = AccountDerived(
+        tier=limits_info["tier"],
+        limits=limits,
+        limit_status=limit_status,
+        warmup_warnings=warnings,
+        account_age=calculate_account_age(created_utc, now),
+        warmup_status=calculate_warmup_status(created_utc, result.reddit.total_karma, now),
+        karma_delta=_format_delta(result.karma_change or 0),
+    )
+    return result.derived
+
+
+def enrich_results(results: list[AccountResult], now: datetime | None = None) -> None:
+    """Enrich a batch of results against one shared reference time."""
+    now = now or datetime.now(tz=timezone.utc)
+    for result in results:
+        enrich_result(result, now)
+
+
+def get_derived(result: AccountResult) -> AccountDerived:
+    """Return a result's derived fields, computing them if not enriched yet."""
+    return result.derived or enrich_result(result)
@@ -0,0 +1,109 @@
+"""
+Append-only result journal for crash-safe tracker runs.
+
+Each AccountResult is written as one JSON line the moment its checks
+finish, so an interrupted run can resume without re-checking accounts
+already done in the current run window.
+"""
+
+import json
+import logging
+import os
+from dataclasses import asdict
+from pathlib import Path
+
+from models import (
+    AccountDerived,
+    AccountResult,
+    ActivityCounts,
+    DolphinProfile,
+    ProxyHealth,
+    RedditStatus,
+)
+
+# Journal file location (same directory as this module)
+JOURNAL_FILE = Path(__file__).parent / "run_journal.jsonl"
+
+logger = logging.getLogger("tracker")
+
+
+def result_to_dict(result: AccountResult) -> dict:
+    """Serialize an AccountResult to a JSON-safe dict.
+
+    The profile's proxy_url (with credentials) is left out; journaled
+    results are never re-checked, so it is not needed to resume.
+    """
+    data = asdict(result)
+    data["profile"].pop("proxy_url", None)
+    return data
+
+
+def result_from_dict(data: dict) -> AccountResult:
+    """Rebuild an AccountResult (with nested dataclasses) from a dict."""
+    proxy_health = data.get("proxy_health")
+    activity = data.get("activity")
+    derived = data.get("derived")
+    return AccountResult(
+        profile=DolphinProfile(**data["profile"]),
+        reddit=RedditStatus(**data["reddit"]),
+        category=data["category"],
+        karma_change=data.get("karma_change", 0),
+        checked_at=data.get("checked_at", ""),
+        proxy_health=ProxyHealth(**proxy_health) if proxy_health else None,
+        activity=ActivityCounts(**activity) if activity else None,
+        derived=AccountDerived(**derived) if derived else None,
+    )
+
+
+class RunJournal:
+    """Per-profile result journal for one run window (e.g. one day)."""
+
+    def __init__(self, run_window: str, path: Path = JOURNAL_FILE):
+        self.run_window = run_window
+        self.path = path
+
+    def load(self) -> dict[str, AccountResult]:
+        """
+        Load results already journaled in this run window.
+
+        Lines from other windows and a torn final line (crash mid-write)
+        are skipped.
+
+        Returns:
+            dict mapping profile_id -> AccountResult (latest entry wins)
+        """
+        results: dict[str, AccountResult] = {}
+        if not self.path.exists():
+            return results
+
+        with open(self.path, encoding="utf-8") as f:
+            for line_num, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                    if entry.get("run_window") != self.run_window:
+                        continue
+                    result = result_from_dict(entry["result"])
+                except (json.JSONDecodeError, KeyError, TypeError) as e:
+                    logger.warning(f"Skipping unreadable journal line {line_num}: {e}")
+                    continue
+                results[str(result.profile.id)] = result
+
+        return results
+
+    def append(self, result: AccountResult) -> None:
+        """Durably append one result (flushed and fsynced before returning)."""
+        entry = {"run_window": self.run_window, "result": result_to_dict(result)}
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def clear(self) -> None:
+        """Remove the journal (start of a fresh run or after a completed run)."""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,106 @@
+"""
+Per-stage timing spans and run metrics for tracker runs.
+
+Stages record durations with `with run_metrics.span("stage"):` and events
+with `run_metrics.incr("counter")`. At the end of a run the metrics are
+written as JSON (durations, counts, percentiles) to logs/metrics_*.json so
+slow stages and regressions are visible as the fleet grows.
+"""
+
+import logging
+import math
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator
+
+from state import atomic_write_json
+
+# Metrics files live next to the tracker logs
+METRICS_DIR = Path(__file__).parent / "logs"
+
+logger = logging.getLogger("tracker")
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list (0 if empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class RunMetrics:
+    """Timing spans and counters for one tracker run (or daemon cycle)."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self, label: str = "run") -> None:
+        """Start collecting a fresh run."""
+        self.label = label
+        self.started_at = datetime.now(tz=timezone.utc)
+        self._start = time.monotonic()
+        self.durations: dict[str, list[float]] = defaultdict(list)
+        self.counters: Counter = Counter()
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time a block of code (works around awaits too)."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.durations[name].append(time.monotonic() - start)
+
+    def incr(self, name: str, count: int = 1) -> None:
+        """Increment a named counter."""
+        self.counters[name] += count
+
+    def summary(self) -> dict:
+        """Build a JSON-safe summary with per-stage totals and percentiles."""
+        stages = {}
+        for name, values in sorted(self.durations.items()):
+            ordered = sorted(values)
+            stages[name] = {
+                "count": len(ordered),
+                "total_s": round(sum(ordered), 3),
+                "mean_s": round(sum(ordered) / len(ordered), 3),
+                "p50_s": round(percentile(ordered, 50), 3),
+                "p90_s": round(percentile(ordered, 90), 3),
+                "p99_s": round(percentile(ordered, 99), 3),
+                "max_s": round(ordered[-1], 3),
+            }
+
+        return {
+            "label": self.label,
+            "started_at": self.started_at.isoformat(),
+            "wall_time_s": round(time.monotonic() - self._start, 3),
+            "stages": stages,
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+    def write(self) -> Path:
+        """Write the summary to logs/metrics_{label}_{timestamp}.json."""
+        METRICS_DIR.mkdir(exist_ok=True)
+        stamp = self.started_at.strftime("%Y%m%d_%H%M%S")
+        path = METRICS_DIR / f"metrics_{self.label}_{stamp}.json"
+        atomic_write_json(path, self.summary())
+        return path
+
+    def log_slowest(self, top: int = 5) -> None:
+        """Log the stages with the largest total time."""
+        stages = self.summary()["stages"]
+        slowest = sorted(stages.items(), key=lambda kv: kv[1]["total_s"], reverse=True)
+        logger.info("=== STAGE TIMINGS ===")
+        for name, stats in slowest[:top]:
+            logger.info(
+                f"  {name}: {stats['total_s']:.1f}s total, "
+                f"{stats['count']}x, p50 {stats['p50_s']:.2f}s, p90 {stats['p90_s']:.2f}s"
+            )
+
+
+# Shared metrics for the current run (reset at the start of each run)
+run_metrics = RunMetrics()
@@ -8,11 +8,12 @@ from datetime import datetime, timezone
 from typing import Literal
 
 
-def calculate_account_age(created_utc: float) -> str:
+def calculate_account_age(created_utc: float, now: datetime | None = None) -> str:
     """Convert Reddit created_utc timestamp to human-readable age.
 
     Args:
         created_utc: Unix timestamp from Reddit API (UTC)
+        now: Reference time (defaults to current UTC time)
 
     Returns:
         Human-readable age like "2y 3m", "6m", or "15d"
@@ -22,7 +23,7 @@ def calculate_account_age(created_utc: float) -> str:
         return "N/A"
 
     created = datetime.fromtimestamp(created_utc, tz=timezone.utc)
-    now = datetime.now(tz=timezone.utc)
+    now = now or datetime.now(tz=timezone.utc)
     delta = now - created
 
     days = delta.days
@@ -40,7 +41,9 @@ def calculate_account_age(created_utc: float) -> str:
         return f"{days}d"
 
 
-def calculate_warmup_status(created_utc: float, total_karma: int) -> str:
+def calculate_warmup_status(
+    created_utc: float, total_karma: int, now: datetime | None = None
+) -> str:
     """Determine account warmup status based on age and karma.
 
     Reddit accounts need gradual activity ramp-up. This function classifies
@@ -49,6 +52,7 @@ def calculate_warmup_status(created_utc: float, total_karma: int) -> str:
     Args:
         created_utc: Unix timestamp from Reddit API (UTC)
         total_karma: Combined karma score
+        now: Reference time (defaults to current UTC time)
 
     Returns:
         Status string: "unknown", "new", "warming", "ready", or "established"
@@ -57,7 +61,7 @@ def calculate_warmup_status(created_utc: float, total_karma: int) -> str:
         return "unknown"
 
     created = datetime.fromtimestamp(created_utc, tz=timezone.utc)
-    now = datetime.now(tz=timezone.utc)
+    now = now or datetime.now(tz=timezone.utc)
     delta = now - created
     age_days = delta.days
 
@@ -87,6 +91,7 @@ class DolphinProfile:
     updated_at: str
     proxy: str = ""  # Display-safe proxy (hostname only, for sheet) or "None"
     proxy_url: str = ""  # Full proxy URL with credentials (for health checking)
+    timezone: str = ""  # Manual timezone (IANA name), "" if automatic or unknown
 
 
 @dataclass
@@ -111,6 +116,19 @@ class ProxyHealth:
     error: str | None = None  # Error message if failed
 
 
+@dataclass
+class AccountDerived:
+    """Fields derived from a result, computed once per run (see enrichment.py)."""
+
+    tier: str = "unknown"  # Warmup tier: new/warming/ready/established/unknown
+    limits: dict | None = None  # Activity limits for the tier (WARMUP_TIERS entry)
+    limit_status: str = "N/A"  # OK/WARNING/EXCEEDED/N/A
+    warmup_warnings: list[str] = field(default_factory=list)
+    account_age: str = "N/A"  # Human-readable, e.g. "2y 3m"
+    warmup_status: str = "unknown"  # From calculate_warmup_status
+    karma_delta: str = "0"  # Signed karma_change, e.g. "+12"
+
+
 @dataclass
 class AccountResult:
     """Combined result for tracker output."""
@@ -122,6 +140,7 @@ class AccountResult:
     checked_at: str = ""
     proxy_health: ProxyHealth | None = None
     activity: "ActivityCounts | None" = None
+    derived: AccountDerived | None = None
 
 
 @dataclass
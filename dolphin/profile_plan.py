@@ -0,0 +1,84 @@
+"""
+Reviewable change plans for bulk profile fixes.
+
+remediate_proxies.py and cleanup_profiles.py --fix-timezones compare each
+profile's current config against its target and only plan changes for
+profiles that differ. A plan can be printed, saved as JSON for review
+(--save-plan), and applied later (--apply-plan) through
+DolphinClient.apply_mutations, so a rerun on a healthy fleet sends no
+updates at all.
+
+Saved proxy plans contain proxy credentials in their payloads - keep
+plan files out of version control.
+"""
+
+import json
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Literal
+
+from sources.dolphin_mutations import ProfileMutation
+from state import atomic_write_json
+
+
+@dataclass
+class PlannedChange:
+    """One profile setting that differs from its target."""
+
+    profile_id: str
+    profile_name: str
+    setting: Literal["proxy", "timezone"]
+    current: str  # Display value (proxy login, never the password)
+    target: str
+    payload: dict  # PATCH body that applies the target
+
+    def to_mutation(self) -> ProfileMutation:
+        return ProfileMutation(
+            kind="update",
+            profile_id=self.profile_id,
+            payload=self.payload,
+            label=f"{self.profile_name}: {self.setting} → {self.target}",
+        )
+
+
+@dataclass
+class ProfilePlan:
+    """Minimal change set produced by one tool."""
+
+    kind: str  # Tool that built the plan (also names its mutation journal)
+    profiles_checked: int
+    changes: list[PlannedChange] = field(default_factory=list)
+    created_at: str = field(
+        default_factory=lambda: datetime.now(tz=timezone.utc).isoformat()
+    )
+
+    @property
+    def unchanged(self) -> int:
+        """Profiles already at their target."""
+        return self.profiles_checked - len({c.profile_id for c in self.changes})
+
+    def mutations(self) -> list[ProfileMutation]:
+        return [c.to_mutation() for c in self.changes]
+
+    def save(self, path: str | Path) -> None:
+        """Write the plan as JSON for review."""
+        atomic_write_json(Path(path), asdict(self))
+
+    @classmethod
+    def load(cls, path: str | Path, kind: str) -> "ProfilePlan":
+        """Read a saved plan.
+
+        Raises:
+            ValueError: If the plan was built by a different tool
+        """
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("kind") != kind:
+            raise ValueError(f"{path} is a {data.get('kind')!r} plan, expected {kind!r}")
+        return cls(
+            kind=data["kind"],
+            profiles_checked=data["profiles_checked"],
+            changes=[PlannedChange(**c) for c in data["changes"]],
+            created_at=data.get("created_at", ""),
+        )
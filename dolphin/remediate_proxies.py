@@ -8,7 +8,11 @@ Each profile gets a unique session ID to prevent IP sharing.
 Usage:
     python3 remediate_proxies.py --dry-run          # Preview changes
     python3 remediate_proxies.py --test ProfileName # Test single profile
+    python3 remediate_proxies.py --save-plan p.json # Save planned changes for review
+    python3 remediate_proxies.py --apply-plan p.json  # Apply a reviewed plan
     python3 remediate_proxies.py                    # Run full remediation
+
+Only profiles whose proxy differs from its target are updated.
 """
 
 import argparse
@@ -16,8 +20,13 @@ import asyncio
 import re
 import sys
 from dataclasses import dataclass
+from urllib.parse import urlsplit
 
+from cleanup_profiles import extract_state_from_proxy
+from models import DolphinProfile
+from profile_plan import PlannedChange, ProfilePlan
 from sources.dolphin import DolphinClient
+from sources.dolphin_mutations import MutationJournal, MutationResult, proxy_payload
 
 
 # DataImpulse configuration
@@ -93,92 +102,123 @@ def generate_proxy_url(profile_name: str, state: str) -> str:
     return f"http://{login}:{DATAIMPULSE_PASS}@{DATAIMPULSE_HOST}:{DATAIMPULSE_PORT}"
 
 
-async def remediate_profile(
-    client: DolphinClient,
-    profile_id: str,
-    profile_name: str,
-    old_proxy: str,
-    state: str,
-    dry_run: bool = False,
-) -> RemediationResult:
-    """Remediate a single profile's proxy configuration."""
-    login = generate_proxy_login(profile_name, state)
-    new_proxy_url = generate_proxy_url(profile_name, state)
-
-    result = RemediationResult(
-        profile_id=profile_id,
-        profile_name=profile_name,
-        old_proxy=old_proxy,
-        new_proxy=new_proxy_url,
-        success=False,
-    )
+def proxy_login(proxy_url: str) -> str:
+    """Login part of a proxy URL (for display - never includes the password)."""
+    return urlsplit(proxy_url).username or ""
 
-    if dry_run:
-        result.success = True
-        return result
-
-    try:
-        success = await client.update_profile_proxy(
-            profile_id=profile_id,
-            proxy_type="http",
-            host=DATAIMPULSE_HOST,
-            port=DATAIMPULSE_PORT,
-            login=login,
-            password=DATAIMPULSE_PASS,
-        )
-        result.success = success
-        if not success:
-            result.error = "API returned non-200 status"
-    except Exception as e:
-        result.error = str(e)
 
-    return result
+def plan_remediation(profiles: list[DolphinProfile]) -> ProfilePlan:
+    """Plan proxy changes only for profiles not already on a valid session.
+
+    A profile whose proxy is exactly generate_proxy_url for one of
+    US_STATES keeps its state; every other profile gets its round-robin
+    state from assign_state.
+    """
+    plan = ProfilePlan(kind="remediate_proxies", profiles_checked=len(profiles))
+    for i, profile in enumerate(profiles):
+        current_state = extract_state_from_proxy(profile.proxy_url)
+        if current_state in US_STATES and profile.proxy_url == generate_proxy_url(
+            profile.name, current_state
+        ):
+            continue
+
+        login = generate_proxy_login(profile.name, assign_state(i))
+        plan.changes.append(PlannedChange(
+            profile_id=profile.id,
+            profile_name=profile.name,
+            setting="proxy",
+            current=proxy_login(profile.proxy_url),
+            target=login,
+            payload=proxy_payload(
+                "http", DATAIMPULSE_HOST, DATAIMPULSE_PORT, login, DATAIMPULSE_PASS
+            ),
+        ))
+    return plan
 
 
 async def run_remediation(
     dry_run: bool = False,
     test_profile: str | None = None,
+    save_plan: str | None = None,
+    plan_file: str | None = None,
+    resume: bool = False,
 ) -> list[RemediationResult]:
-    """Run proxy remediation on all profiles."""
-    results = []
-
+    """Run proxy remediation on profiles that need it.
+
+    Builds a plan (or loads a reviewed one from plan_file) and applies it
+    concurrently through DolphinClient.apply_mutations. A loaded plan is
+    journaled, so an interrupted run can be finished with the same
+    plan_file and resume.
+
+    Args:
+        dry_run: Show the plan without applying it
+        test_profile: Only plan for this profile name
+        save_plan: Write the plan to this path instead of applying it
+        plan_file: Apply a plan saved earlier with save_plan
+        resume: Skip changes an interrupted run of plan_file already applied
+
+    Returns:
+        RemediationResult per planned change
+    """
     async with DolphinClient() as client:
-        print("Fetching profiles from Dolphin...")
-        profiles = await client.get_profiles()
-        print(f"Found {len(profiles)} profiles")
-
-        # Filter to single profile if testing
-        if test_profile:
-            profiles = [p for p in profiles if p.name.lower() == test_profile.lower()]
-            if not profiles:
-                print(f"ERROR: Profile '{test_profile}' not found")
-                return results
-            print(f"Testing single profile: {profiles[0].name}")
-
-        # Process each profile with state assignment
-        for i, profile in enumerate(profiles):
-            state = assign_state(i)
-            result = await remediate_profile(
-                client=client,
-                profile_id=profile.id,
-                profile_name=profile.name,
-                old_proxy=profile.proxy_url,
-                state=state,
-                dry_run=dry_run,
+        if plan_file:
+            plan = ProfilePlan.load(plan_file, kind="remediate_proxies")
+            print(f"Loaded plan from {plan_file} ({plan.created_at})")
+        else:
+            print("Fetching profiles from Dolphin...")
+            profiles = await client.get_profiles()
+            print(f"Found {len(profiles)} profiles")
+
+            # Filter to single profile if testing
+            if test_profile:
+                profiles = [p for p in profiles if p.name.lower() == test_profile.lower()]
+                if not profiles:
+                    print(f"ERROR: Profile '{test_profile}' not found")
+                    return []
+                print(f"Testing single profile: {profiles[0].name}")
+
+            plan = plan_remediation(profiles)
+
+        print(f"Plan: {len(plan.changes)} profile(s) to update, {plan.unchanged} already correct")
+        results = [
+            RemediationResult(
+                profile_id=c.profile_id,
+                profile_name=c.profile_name,
+                old_proxy=c.current,
+                new_proxy=c.target,
+                success=dry_run,
             )
-            results.append(result)
-
-            # Status indicator
-            status = "✓" if result.success else "✗"
-            mode = "[DRY-RUN] " if dry_run else ""
-            print(f"{mode}[{i+1}/{len(profiles)}] {status} {profile.name} → {state}")
-
-            if result.error:
-                print(f"    ERROR: {result.error}")
+            for c in plan.changes
+        ]
+
+        if save_plan:
+            plan.save(save_plan)
+            print(f"Plan saved to {save_plan} - review it, then run with --apply-plan")
+            return results
+
+        if dry_run or not plan.changes:
+            return results
+
+        mutations = plan.mutations()
+        finished = 0
+
+        def progress(outcome: MutationResult) -> None:
+            nonlocal finished
+            finished += 1
+            status = "✓" if outcome.success else "✗"
+            print(f"[{finished}/{len(mutations)}] {status} {outcome.mutation.label}")
+            if outcome.error:
+                print(f"    ERROR: {outcome.error}")
+
+        # Only a saved plan can be resumed, so only it is journaled
+        journal = MutationJournal(plan.kind, plan.created_at) if plan_file else None
+        outcomes = await client.apply_mutations(
+            mutations, journal=journal, resume=resume, on_result=progress
+        )
 
-            # Small delay to avoid rate limiting
-            if not dry_run and i < len(profiles):
-                await asyncio.sleep(0.1)
+    for result, outcome in zip(results, outcomes):
+        result.success = outcome.success
+        result.error = outcome.error
 
     return results
 
@@ -194,7 +234,7 @@ def print_summary(results: list[RemediationResult], dry_run: bool = False):
     else:
         print("REMEDIATION SUMMARY")
     print("=" * 60)
-    print(f"Total profiles:  {len(results)}")
+    print(f"Planned changes: {len(results)}")
     print(f"Successful:      {success_count}")
     print(f"Failed:          {fail_count}")
 
@@ -217,8 +257,8 @@ def print_summary(results: list[RemediationResult], dry_run: bool = False):
         print("\nState distribution:")
         from collections import Counter
         state_counts = Counter()
-        for i in range(len(results)):
-            state_counts[assign_state(i)] += 1
+        for r in results:
+            state_counts[extract_state_from_proxy(r.new_proxy)] += 1
         for state, count in sorted(state_counts.items()):
             print(f"  {state}: {count} profiles")
 
@@ -235,11 +275,37 @@ def main():
         metavar="PROFILE",
         help="Test remediation on a single profile by name",
     )
+    parser.add_argument(
+        "--save-plan",
+        metavar="PATH",
+        help="Write the planned changes to a JSON file for review (no changes made)",
+    )
+    parser.add_argument(
+        "--apply-plan",
+        metavar="PATH",
+        help="Apply a plan saved with --save-plan",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="With --apply-plan, skip changes an interrupted run of that plan already applied",
+    )
+    parser.add_argument(
+        "--refresh-team",
+        action="store_true",
+        help="Re-fetch Dolphin team users (e.g. after adding a member)",
+    )
     args = parser.parse_args()
 
-    if not args.dry_run and not args.test:
-        print("WARNING: This will update ALL profile proxies!")
-        print("Run with --dry-run first to preview changes.")
+    if args.refresh_team:
+        DolphinClient.invalidate_team_users()
+
+    if args.resume and not args.apply_plan:
+        parser.error("--resume requires --apply-plan")
+
+    if not args.dry_run and not args.test and not args.save_plan:
+        print("WARNING: This will update every profile proxy that differs from its target!")
+        print("Run with --dry-run or --save-plan first to preview changes.")
         confirm = input("Continue? [y/N]: ")
         if confirm.lower() != "y":
             print("Aborted.")
@@ -248,9 +314,12 @@ def main():
     results = asyncio.run(run_remediation(
         dry_run=args.dry_run,
         test_profile=args.test,
+        save_plan=args.save_plan,
+        plan_file=args.apply_plan,
+        resume=args.resume,
     ))
 
-    print_summary(results, dry_run=args.dry_run)
+    print_summary(results, dry_run=args.dry_run or bool(args.save_plan))
 
     # Exit with error code if any failures
     if any(not r.success for r in results):
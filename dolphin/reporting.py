@@ -30,6 +30,20 @@ def load_karma_history() -> dict:
     return {}
 
 
+def snapshot_karma(snapshot: dict) -> int:
+    """
+    Karma of a history snapshot for deltas, as comment + link karma.
+
+    This is the one definition both Reddit lookup paths can report
+    (batched lookups have no award karma), so karma changes stay
+    consistent when an account switches between about.json and batched
+    lookups. total_karma is still what gets displayed.
+    """
+    if "comment_karma" in snapshot or "link_karma" in snapshot:
+        return snapshot.get("comment_karma", 0) + snapshot.get("link_karma", 0)
+    return snapshot.get("total_karma", 0)
+
+
 def calculate_karma_velocity(history: dict, days: int = 7) -> dict[str, float]:
     """
     Calculate karma velocity (karma gained per day) for each account.
@@ -61,8 +75,8 @@ def calculate_karma_velocity(history: dict, days: int = 7) -> dict[str, float]:
         first_date = sorted_dates[0]
         last_date = sorted_dates[-1]
 
-        first_karma = recent_snapshots[first_date].get("total_karma", 0)
-        last_karma = recent_snapshots[last_date].get("total_karma", 0)
+        first_karma = snapshot_karma(recent_snapshots[first_date])
+        last_karma = snapshot_karma(recent_snapshots[last_date])
 
         # Calculate days between snapshots
         first_dt = datetime.strptime(first_date, "%Y-%m-%d")
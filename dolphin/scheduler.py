@@ -0,0 +1,145 @@
+"""
+Adaptive check scheduling for tracker runs.
+
+Picks each account's next-check time from its warmup tier, recent status
+transitions and karma velocity, so frequent tracker runs only re-check
+accounts that are due. New and at-risk accounts are checked often;
+stable established accounts are checked rarely.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from enrichment import get_derived
+from models import AccountResult
+
+# Base interval between checks per warmup tier (active accounts)
+TIER_INTERVALS = {
+    "new": timedelta(hours=6),
+    "warming": timedelta(hours=8),
+    "ready": timedelta(hours=12),
+    "established": timedelta(hours=48),
+    "unknown": timedelta(hours=24),
+}
+
+# Interval for accounts that are not active, regardless of tier
+STATUS_INTERVALS = {
+    "shadowbanned": timedelta(hours=12),
+    "suspended": timedelta(hours=24),
+    "not_found": timedelta(hours=24),  # Daily, for not_found archival tracking
+    "rate_limited": timedelta(hours=1),  # Inconclusive - retry soon
+    "error": timedelta(hours=1),
+}
+
+# Accounts whose status just changed are re-checked quickly
+AT_RISK_INTERVAL = timedelta(hours=2)
+
+# Karma swings beyond this (karma/day, either direction) halve the interval
+VELOCITY_THRESHOLD = 50.0
+
+# Accounts within this fraction of their interval of the next check are
+# already due. Scheduled runs start a few seconds early or late, so without
+# it a 24h account checked by a daily run would slip to 48h.
+DUE_GRACE_FRACTION = 0.1
+
+
+def compute_check_interval(
+    tier: str,
+    status: str,
+    status_changed: bool = False,
+    karma_velocity: float = 0.0,
+) -> timedelta:
+    """Pick the interval until an account's next check.
+
+    Args:
+        tier: Warmup tier (AccountDerived.tier)
+        status: Reddit status from the latest check
+        status_changed: True if status differs from the previous run
+        karma_velocity: Karma gained per day (negative = losing karma)
+
+    Returns:
+        timedelta until the account is due again
+    """
+    if status_changed:
+        return AT_RISK_INTERVAL
+
+    if status in STATUS_INTERVALS:
+        return STATUS_INTERVALS[status]
+
+    interval = TIER_INTERVALS.get(tier, TIER_INTERVALS["unknown"])
+
+    # Falling karma (removals, downvote brigades) or unusual spikes are early
+    # ban signals - watch those accounts more closely
+    if karma_velocity < 0 or abs(karma_velocity) >= VELOCITY_THRESHOLD:
+        interval = max(interval / 2, AT_RISK_INTERVAL)
+
+    return interval
+
+
+def is_due(schedule: dict, username: str, now: datetime | None = None) -> bool:
+    """Check whether an account should be checked this run.
+
+    Accounts without a schedule entry (never checked) are always due, and
+    accounts are due slightly early (DUE_GRACE_FRACTION of their interval).
+    """
+    entry = schedule.get(username)
+    if not entry or not entry.get("next_check"):
+        return True
+
+    now = now or datetime.now(tz=timezone.utc)
+    try:
+        next_check = datetime.fromisoformat(entry["next_check"])
+    except ValueError:
+        return True
+
+    grace = timedelta(0)
+    try:
+        last_checked = datetime.fromisoformat(entry.get("last_checked", ""))
+        grace = (next_check - last_checked) * DUE_GRACE_FRACTION
+    except ValueError:
+        pass
+    return now >= next_check - grace
+
+
+def update_schedule(
+    schedule: dict,
+    results: list[AccountResult],
+    changed_accounts: list[str],
+    velocities: dict[str, float],
+    now: datetime | None = None,
+) -> dict:
+    """Record next-check times for the accounts checked this run.
+
+    Args:
+        schedule: Previous schedule (username -> entry)
+        results: Results from this run
+        changed_accounts: Usernames whose status changed (from detect_changes)
+        velocities: Username -> karma/day (from calculate_karma_velocity)
+        now: Reference time (defaults to current UTC time)
+
+    Returns:
+        Updated schedule dict. Accounts not checked this run keep their entry.
+    """
+    now = now or datetime.now(tz=timezone.utc)
+    changed = set(changed_accounts)
+    updated = dict(schedule)
+
+    for r in results:
+        username = r.reddit.username
+        tier = "unknown"
+        if r.reddit.status == "active":
+            tier = get_derived(r).tier
+
+        interval = compute_check_interval(
+            tier,
+            r.reddit.status,
+            status_changed=username in changed,
+            karma_velocity=velocities.get(username, 0.0),
+        )
+        updated[username] = {
+            "tier": tier,
+            "status": r.reddit.status,
+            "last_checked": now.isoformat(),
+            "next_check": (now + interval).isoformat(),
+        }
+
+    return updated
@@ -0,0 +1,216 @@
+"""
+Sharded tracker execution.
+
+Profiles are split across N workers with rendezvous (highest-random-weight)
+hashing on shard_key: the profile's proxy, or its ID if it has none. Every
+worker computes the same disjoint partition without talking to the others,
+changing N only moves about 1/N of the keys, and all profiles behind one
+proxy land in the same worker, so only that worker paces the proxy. Each
+worker journals its results and a manifest to SHARD_DIR; a merge step
+combines them into history, state and Sheets.
+
+Workers can be separate processes on one machine (tracker.py --workers N)
+or separate machines sharing SHARD_DIR (tracker.py --shard i/N, then
+tracker.py --merge N).
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+from journal import RunJournal
+from models import AccountResult, DolphinProfile
+from sources.proxies import normalize_proxy
+from state import atomic_write_json
+
+# Shard outputs live next to this module
+SHARD_DIR = Path(__file__).parent / "shards"
+
+logger = logging.getLogger("tracker")
+
+
+def shard_key(profile: DolphinProfile) -> str:
+    """Key a profile is sharded on: its normalized proxy URL, else its ID.
+
+    Uses the same normalization as RedditChecker's per-proxy clients, so
+    profiles sharing a proxy (and its rate limit budget) share a shard.
+    """
+    config = normalize_proxy(profile.proxy_url or "")
+    if config:
+        return f"proxy:{config.url}"
+    return f"profile:{profile.id}"
+
+
+def shard_for(key: str, shard_count: int) -> int:
+    """Return the shard index (0..shard_count-1) that owns a shard_key."""
+    best_index = 0
+    best_weight = -1
+    for index in range(shard_count):
+        digest = hashlib.sha1(f"{index}:{key}".encode()).digest()
+        weight = int.from_bytes(digest[:8], "big")
+        if weight > best_weight:
+            best_index, best_weight = index, weight
+    return best_index
+
+
+def parse_shard_spec(spec: str) -> tuple[int, int]:
+    """Parse an "i/N" shard spec (1-based i) into a 0-based (index, count)."""
+    try:
+        index_str, count_str = spec.split("/", 1)
+        index, count = int(index_str), int(count_str)
+    except ValueError:
+        raise ValueError(f"Invalid shard spec '{spec}', expected i/N (e.g. 1/4)")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard spec '{spec}', need 1 <= i <= N")
+    return index - 1, count
+
+
+def shard_journal(index: int, count: int, run_window: str) -> RunJournal:
+    """Result journal for one shard worker."""
+    SHARD_DIR.mkdir(exist_ok=True)
+    return RunJournal(run_window, path=_journal_path(index, count))
+
+
+def _journal_path(index: int, count: int) -> Path:
+    return SHARD_DIR / f"shard_{index + 1}_of_{count}.jsonl"
+
+
+def _manifest_path(index: int, count: int) -> Path:
+    return SHARD_DIR / f"shard_{index + 1}_of_{count}.manifest.json"
+
+
+def clear_manifest(index: int, count: int) -> None:
+    """Mark a shard as unfinished (called when a worker starts)."""
+    _manifest_path(index, count).unlink(missing_ok=True)
+
+
+def write_manifest(
+    index: int,
+    count: int,
+    run_window: str,
+    profile_ids: set[str],
+    unchecked: list[DolphinProfile],
+) -> None:
+    """
+    Atomically write a shard's manifest once its checks are complete.
+
+    The manifest marks the shard as finished and carries what the merge step
+    needs besides results: every Dolphin profile ID the worker saw (for stale
+    detection) and its profiles that were skipped (for state carry-forward).
+    Skipped profiles are stored without proxy_url, which holds credentials.
+    """
+    SHARD_DIR.mkdir(exist_ok=True)
+    manifest = {
+        "shard": index + 1,
+        "count": count,
+        "run_window": run_window,
+        "profile_ids": sorted(profile_ids),
+        "unchecked": [
+            {k: v for k, v in asdict(p).items() if k != "proxy_url"} for p in unchecked
+        ],
+    }
+
+    atomic_write_json(_manifest_path(index, count), manifest)
+
+
+def _read_manifest(index: int, count: int) -> dict | None:
+    path = _manifest_path(index, count)
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def shard_run_window(count: int) -> str | None:
+    """
+    Run window of the shard outputs left in SHARD_DIR (None if there are none).
+
+    Workers record the window they were started with, which is not today's
+    date once a run crosses midnight. Finished shards (manifests) are read
+    first, then the journals of unfinished ones; the latest window wins.
+    """
+    windows = set()
+    for index in range(count):
+        manifest = _read_manifest(index, count)
+        if manifest and manifest.get("run_window"):
+            windows.add(manifest["run_window"])
+    if not windows:
+        for index in range(count):
+            path = _journal_path(index, count)
+            if not path.exists():
+                continue
+            with open(path, encoding="utf-8") as f:
+                try:
+                    window = json.loads(f.readline()).get("run_window")
+                except (json.JSONDecodeError, AttributeError):
+                    continue
+            if window:
+                windows.add(window)
+    return max(windows) if windows else None
+
+
+def load_shard_outputs(
+    count: int,
+    run_window: str,
+) -> tuple[list[AccountResult], set[str], list[DolphinProfile]]:
+    """
+    Combine the outputs of all shard workers for a run window.
+
+    Raises:
+        RuntimeError: If any shard has no manifest for this window (not finished).
+
+    Returns:
+        Tuple of (results, all Dolphin profile IDs, unchecked profiles)
+    """
+    results: list[AccountResult] = []
+    profile_ids: set[str] = set()
+    unchecked: list[DolphinProfile] = []
+    missing = []
+
+    for index in range(count):
+        manifest = _read_manifest(index, count)
+        if not manifest or manifest.get("run_window") != run_window:
+            missing.append(index + 1)
+            continue
+
+        profile_ids.update(manifest["profile_ids"])
+        unchecked.extend(DolphinProfile(**p) for p in manifest["unchecked"])
+        results.extend(shard_journal(index, count, run_window).load().values())
+
+    if missing:
+        raise RuntimeError(f"Shards not finished for {run_window}: {missing}")
+
+    return results, profile_ids, unchecked
+
+
+def clear_shard_outputs(count: int) -> None:
+    """Remove journals and manifests once they have been merged."""
+    for index in range(count):
+        _manifest_path(index, count).unlink(missing_ok=True)
+        _journal_path(index, count).unlink(missing_ok=True)
+
+
+async def run_workers(count: int, script: Path, extra_args: list[str]) -> list[int]:
+    """
+    Local coordinator: run one worker process per shard and wait for all.
+
+    The workers share this machine's direct egress (and any OAuth app), so
+    each gets 1/count of its request budget via REDDIT_EGRESS_SHARE. Each
+    profile proxy belongs to one worker (shard_key) and keeps its budget.
+
+    Returns:
+        list of worker exit codes in shard order
+    """
+    env = {**os.environ, "REDDIT_EGRESS_SHARE": str(count)}
+    procs = []
+    for index in range(count):
+        args = [str(script), "--shard", f"{index + 1}/{count}", *extra_args]
+        logger.info(f"Starting shard worker {index + 1}/{count}")
+        procs.append(await asyncio.create_subprocess_exec(sys.executable, *args, env=env))
+
+    return list(await asyncio.gather(*(p.wait() for p in procs)))
@@ -9,8 +9,9 @@ from datetime import datetime
 import gspread
 
 from config import settings
-from models import AccountResult, calculate_account_age, calculate_warmup_status
-from warmup import get_warmup_limits, check_warmup_thresholds
+from enrichment import get_derived
+from models import AccountResult
+from summary import RunSummary
 
 
 # Column headers for the Google Sheet (17 columns: A-Q)
@@ -40,21 +41,7 @@ ARCHIVE_HEADERS = HEADERS + ["archive_reason", "archived_at"]
 
 def _to_row(result: AccountResult) -> list:
     """Convert AccountResult to a row list matching HEADERS order."""
-    # Calculate account age from Reddit created_utc
-    account_age = calculate_account_age(result.reddit.created_utc)
-
-    # Calculate warmup status from age and karma
-    warmup_status = calculate_warmup_status(
-        result.reddit.created_utc, result.reddit.total_karma
-    )
-
-    # Format karma_delta as +N or -N for readability
-    if result.karma_change > 0:
-        karma_delta = f"+{result.karma_change}"
-    elif result.karma_change < 0:
-        karma_delta = str(result.karma_change)  # Already has minus sign
-    else:
-        karma_delta = "0"
+    derived = get_derived(result)
 
     # Get proxy health status
     proxy_health_status = "N/A"
@@ -68,23 +55,6 @@ def _to_row(result: AccountResult) -> list:
         comments_today = result.activity.comments_today
         posts_today = result.activity.posts_today
 
-    # Get warmup tier and calculate limit status
-    limits_info = get_warmup_limits(result.reddit.created_utc)
-    warmup_tier = limits_info["tier"]
-
-    # Determine limit_status based on threshold checks
-    limit_status = "N/A"
-    if result.activity and limits_info["limits"]:
-        warnings = check_warmup_thresholds(result.activity, limits_info["limits"])
-        if any("EXCEEDED" in w for w in warnings):
-            limit_status = "EXCEEDED"
-        elif any("WARNING" in w for w in warnings):
-            limit_status = "WARNING"
-        else:
-            limit_status = "OK"
-    elif result.reddit.status == "active":
-        limit_status = "OK"  # Active but no activity data yet
-
     return [
         result.profile.id,
         result.profile.name,
@@ -92,16 +62,16 @@ def _to_row(result: AccountResult) -> list:
         result.reddit.total_karma,
         result.reddit.comment_karma,
         result.reddit.link_karma,
-        account_age,
-        warmup_status,
+        derived.account_age,
+        derived.warmup_status,
         result.profile.owner,
         result.profile.proxy or "None",
         proxy_health_status,
-        karma_delta,
+        derived.karma_delta,
         comments_today,
         posts_today,
-        warmup_tier,
-        limit_status,
+        derived.tier,
+        derived.limit_status,
         result.checked_at or datetime.now().isoformat(),
     ]
 
@@ -119,66 +89,33 @@ def _ensure_headers(worksheet: gspread.Worksheet) -> None:
         worksheet.update("A1:Q1", [HEADERS])
 
 
-def _update_summary_row(worksheet: gspread.Worksheet, results: list[AccountResult]) -> None:
+def _update_summary_row(worksheet: gspread.Worksheet, summary: RunSummary) -> None:
     """Update the summary row (row 2) with aggregate stats."""
-    # Count statuses
-    status_counts: dict[str, int] = {}
-    proxy_fail_count = 0
-    total_karma = 0
-    total_delta = 0
-
-    # Count warmup limit statuses
-    limit_status_counts: dict[str, int] = {"OK": 0, "WARNING": 0, "EXCEEDED": 0}
-    total_comments = 0
-    total_posts = 0
-
-    for result in results:
-        status = result.reddit.status
-        status_counts[status] = status_counts.get(status, 0) + 1
-        total_karma += result.reddit.total_karma or 0
-        total_delta += result.karma_change or 0
-
-        if result.proxy_health and result.proxy_health.status != "pass":
-            proxy_fail_count += 1
-
-        # Count activity and limit status
-        if result.activity:
-            total_comments += result.activity.comments_today
-            total_posts += result.activity.posts_today
-
-            # Calculate limit status for this result
-            limits_info = get_warmup_limits(result.reddit.created_utc)
-            if limits_info["limits"]:
-                warnings = check_warmup_thresholds(result.activity, limits_info["limits"])
-                if any("EXCEEDED" in w for w in warnings):
-                    limit_status_counts["EXCEEDED"] += 1
-                elif any("WARNING" in w for w in warnings):
-                    limit_status_counts["WARNING"] += 1
-                else:
-                    limit_status_counts["OK"] += 1
-
-    total = len(results)
-    active = status_counts.get("active", 0)
-    suspended = status_counts.get("suspended", 0)
-    shadowbanned = status_counts.get("shadowbanned", 0)
-    not_found = status_counts.get("not_found", 0)
+    total = len(summary)
+    active = summary.statuses["active"]
+    suspended = summary.statuses["suspended"]
+    shadowbanned = summary.statuses["shadowbanned"]
+    not_found = summary.statuses["not_found"]
+    proxy_fail_count = summary.proxy_failures
 
     # Format delta with sign
+    total_delta = summary.total_delta
     delta_str = f"+{total_delta}" if total_delta >= 0 else str(total_delta)
 
     # Format limit status summary
-    limit_summary = f"{limit_status_counts['OK']} OK"
-    if limit_status_counts["WARNING"] > 0:
-        limit_summary += f" / {limit_status_counts['WARNING']} warn"
-    if limit_status_counts["EXCEEDED"] > 0:
-        limit_summary += f" / {limit_status_counts['EXCEEDED']} over"
+    limit_summary = f"{summary.limit_statuses['OK']} OK"
+    if summary.limit_statuses["WARNING"] > 0:
+        limit_summary += f" / {summary.limit_statuses['WARNING']} warn"
+    if summary.limit_statuses["EXCEEDED"] > 0:
+        limit_summary += f" / {summary.limit_statuses['EXCEEDED']} over"
 
     # Build summary cells matching header columns (17 columns: A-Q)
     summary_row = [
         "SUMMARY",  # profile_id column
-        f"{total} accounts",  # username column
+        # username column
+        f"{total} of {summary.fleet_size} checked this run" if summary.partial else f"{total} accounts",
         f"{active} active / {suspended} suspended / {shadowbanned} shadow / {not_found} missing",  # status
-        total_karma,  # total_karma
+        summary.total_karma,  # total_karma
         "",  # comment_karma
         "",  # link_karma
         "",  # account_age
@@ -187,8 +124,8 @@ def _update_summary_row(worksheet: gspread.Worksheet, results: list[AccountResul
         f"{proxy_fail_count} failing" if proxy_fail_count else "All OK",  # proxy
         "",  # proxy_health
         delta_str,  # karma_delta
-        total_comments,  # comments_today
-        total_posts,  # posts_today
+        summary.total_comments,  # comments_today
+        summary.total_posts,  # posts_today
         "",  # warmup_tier
         limit_summary,  # limit_status
         datetime.now().strftime("%Y-%m-%d %H:%M"),  # checked_at
@@ -197,7 +134,10 @@ def _update_summary_row(worksheet: gspread.Worksheet, results: list[AccountResul
     worksheet.update("A2:Q2", [summary_row])
 
 
-def sync_to_sheet(results: list[AccountResult]) -> dict:
+def sync_to_sheet(
+    results: list[AccountResult],
+    summary: RunSummary | None = None,
+) -> dict:
     """
     Sync account results to Google Sheets.
 
@@ -208,6 +148,9 @@ def sync_to_sheet(results: list[AccountResult]) -> dict:
 
     Args:
         results: List of AccountResult from tracker
+        summary: Aggregate for the summary row, when the upserted results
+            are only part of the fleet (daemon flushes). Defaults to a
+            summary of results.
 
     Returns:
         dict with "updated" and "inserted" counts
@@ -272,7 +215,7 @@ def sync_to_sheet(results: list[AccountResult]) -> dict:
         worksheet.append_rows(inserts)
 
     # Update summary row with aggregate stats
-    _update_summary_row(worksheet, results)
+    _update_summary_row(worksheet, summary if summary is not None else RunSummary(results))
 
     return {
         "updated": len(updates),
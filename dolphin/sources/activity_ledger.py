@@ -0,0 +1,234 @@
+"""
+Persisted per-account activity cursors and ledger.
+
+For each account and listing (comments, submitted or overview) the ledger
+keeps a cursor: the newest item fullname already seen. get_activity_counts
+then only fetches items newer than the cursor (the newest page, paging
+with Reddit's `before` parameter if the cursor is not on it) and records
+them here, so today's counts and rolling-window
+counts (e.g. last 24h) come from the local ledger instead of
+re-downloading each account's history every run.
+
+Reddit returns an empty page when the `before` item has been deleted,
+which looks the same as an idle account, so RedditChecker looks for the
+cursor on the listing's newest page first and re-syncs at once when it
+is not there and nothing follows it with `before`. As a backstop, a
+cursor's sync time only advances when new items arrive (or on a full
+fetch), and a cursor with no new items for CURSOR_RESYNC_HOURS - well
+above the longest adaptive check interval - is replaced by one full
+fetch. Dormant accounts cost one full fetch a week.
+
+Shard worker processes share the file: save() re-reads it under a lock
+and merges this process's accounts into it. The daemon saves from a worker
+thread while checks keep recording, so it takes a snapshot() of the changed
+accounts on the event loop and hands only that copy to write().
+"""
+
+import copy
+import json
+import logging
+import time
+from pathlib import Path
+
+from state import atomic_write_json, file_lock
+
+# Ledger file location (tracker directory, next to the state files)
+ACTIVITY_LEDGER_FILE = Path(__file__).parent.parent / "activity_cursors.json"
+
+# Items older than this are pruned (longest rolling window we answer)
+LEDGER_RETENTION_DAYS = 7
+
+# Cursors older than this are ignored (full re-fetch)
+CURSOR_RESYNC_HOURS = 7 * 24
+
+logger = logging.getLogger("tracker")
+
+
+class ActivityLedger:
+    """Per-account listing cursors plus recent item timestamps."""
+
+    def __init__(self, path: Path = ACTIVITY_LEDGER_FILE):
+        self.path = path
+        # username (lowercase) -> {"cursors": {listing: fullname},
+        #   "synced_at": {listing: unix time}, "latest_post": fullname,
+        #   "items": {fullname: [kind, created_utc]}}
+        self._accounts: dict[str, dict] = {}
+        self._changed: set[str] = set()  # Accounts to merge on save
+
+    def _read(self) -> dict[str, dict]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            logger.warning(f"Failed to load activity ledger: {e}")
+            return {}
+
+    def load(self) -> "ActivityLedger":
+        """Load the ledger from disk (empty on missing or corrupt file)."""
+        self._accounts = self._read()
+        return self
+
+    def snapshot(self) -> dict[str, dict]:
+        """Copy the accounts changed since the last snapshot and mark them saved.
+
+        Call from the thread that records (the event loop); the copy can then
+        be saved from any thread. Pass it to restore() if the save fails.
+        """
+        changed = {
+            username: copy.deepcopy(self._accounts[username]) for username in self._changed
+        }
+        self._changed.clear()
+        return changed
+
+    def restore(self, changed: dict[str, dict]) -> None:
+        """Mark a snapshot's accounts unsaved again (after a failed save)."""
+        self._changed.update(changed)
+
+    def save(self) -> None:
+        """Merge accounts changed since the last save into the file."""
+        changed = self.snapshot()
+        try:
+            self.write(changed)
+        except OSError:
+            self.restore(changed)
+            raise
+
+    def write(self, changed: dict[str, dict]) -> None:
+        """Merge a snapshot() into the file (safe from a worker thread).
+
+        The file is re-read under a lock, so concurrent processes (shard
+        workers) never drop each other's accounts. Only the snapshot is
+        read, never the live ledger.
+        """
+        if not changed:
+            return
+        with file_lock(self.path):
+            accounts = self._read()
+            for username, ours in changed.items():
+                accounts[username] = _merge_account(accounts.get(username), ours)
+            atomic_write_json(self.path, accounts)
+
+    def _account(self, username: str) -> dict:
+        key = username.lower()
+        self._changed.add(key)
+        return self._accounts.setdefault(
+            key, {"cursors": {}, "synced_at": {}, "items": {}}
+        )
+
+    def cursor(self, username: str, listing: str) -> str | None:
+        """Newest fullname seen for a listing, or None if unknown or stale."""
+        account = self._accounts.get(username.lower())
+        if not account:
+            return None
+        synced_at = account["synced_at"].get(listing, 0)
+        if time.time() - synced_at > CURSOR_RESYNC_HOURS * 3600:
+            return None
+        return account["cursors"].get(listing)
+
+    def record(
+        self,
+        username: str,
+        listing: str,
+        items: list[tuple[str, str, float]],
+        full_sync: bool = False,
+    ) -> None:
+        """Add fetched items (newest first) and advance the listing's cursor.
+
+        Args:
+            username: Reddit username
+            listing: "comments", "submitted" or "overview"
+            items: (fullname, kind, created_utc) tuples, newest first
+            full_sync: True if fetched without a cursor (re-anchors the cursor
+                and refreshes its sync time even when nothing was returned)
+        """
+        account = self._account(username)
+        for fullname, kind, created_utc in items:
+            if fullname:
+                account["items"][fullname] = [kind, created_utc]
+
+        # Newest first, so the first post is the newest one seen
+        post = next((f for f, kind, _ in items if kind == "t3" and f), None)
+        if post:
+            account["latest_post"] = post
+
+        if items and items[0][0]:
+            account["cursors"][listing] = items[0][0]
+        elif full_sync:
+            # Empty listing - nothing left to anchor on
+            account["cursors"].pop(listing, None)
+        if items or full_sync:
+            account["synced_at"][listing] = time.time()
+
+        account["items"] = _prune(account["items"])
+
+    def count(self, username: str, since: float) -> tuple[int, int]:
+        """Count ledger items created at or after `since` (unix time).
+
+        Returns:
+            Tuple of (comments, posts)
+        """
+        account = self._accounts.get(username.lower())
+        if not account:
+            return 0, 0
+
+        comments = posts = 0
+        for kind, created_utc in account["items"].values():
+            if created_utc < since:
+                continue
+            if kind == "t1":
+                comments += 1
+            elif kind == "t3":
+                posts += 1
+        return comments, posts
+
+    def rolling_counts(self, username: str, hours: float = 24) -> tuple[int, int]:
+        """Comments and posts in the last `hours` (up to LEDGER_RETENTION_DAYS)."""
+        return self.count(username, time.time() - hours * 3600)
+
+    def newest_post(self, username: str) -> str | None:
+        """Fullname of the newest post seen (kept past LEDGER_RETENTION_DAYS)."""
+        account = self._accounts.get(username.lower())
+        return account.get("latest_post") if account else None
+
+
+def _prune(items: dict[str, list]) -> dict[str, list]:
+    """Drop items outside the longest rolling window."""
+    cutoff = time.time() - LEDGER_RETENTION_DAYS * 86400
+    return {fullname: entry for fullname, entry in items.items() if entry[1] >= cutoff}
+
+
+def _fullname_age(fullname: str) -> int:
+    """Sort key for fullnames (base-36 IDs grow over time)."""
+    try:
+        return int(fullname.partition("_")[2], 36)
+    except ValueError:
+        return -1
+
+
+def _merge_account(stored: dict | None, ours: dict) -> dict:
+    """Combine an account's entry on disk with this process's copy.
+
+    Items are unioned; each listing keeps whichever cursor was synced last.
+    """
+    if not stored:
+        return ours
+
+    merged = {
+        "cursors": dict(stored.get("cursors", {})),
+        "synced_at": dict(stored.get("synced_at", {})),
+        "items": _prune({**stored.get("items", {}), **ours["items"]}),
+    }
+    for listing in set(ours["cursors"]) | set(ours["synced_at"]):
+        if ours["synced_at"].get(listing, 0) >= merged["synced_at"].get(listing, 0):
+            for field in ("cursors", "synced_at"):
+                if listing in ours.get(field, {}):
+                    merged[field][listing] = ours[field][listing]
+                else:
+                    merged[field].pop(listing, None)
+
+    posts = [p for p in (stored.get("latest_post"), ours.get("latest_post")) if p]
+    if posts:
+        merged["latest_post"] = max(posts, key=_fullname_age)
+    return merged
@@ -0,0 +1,106 @@
+"""
+Circuit breaker shared by every Reddit request on one egress identity.
+
+Consecutive 429s or network errors on an egress (direct connection or one
+proxy) open the breaker: new requests on that egress wait out a cooldown
+instead of each worker retrying into the same rate-limit storm. After the
+cooldown a single half-open probe request is let through; success closes
+the breaker, failure re-opens it with a longer cooldown.
+"""
+
+import asyncio
+import logging
+import time
+
+from metrics import run_metrics
+
+# How often waiters re-check while a half-open probe is in flight
+PROBE_POLL_SECONDS = 1.0
+
+# Re-opening after a failed probe doubles the cooldown, up to this factor
+MAX_COOLDOWN_FACTOR = 8
+
+logger = logging.getLogger("tracker")
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker for one egress."""
+
+    def __init__(self, name: str, threshold: int, cooldown: float):
+        """
+        Args:
+            name: Egress label for logs (never includes proxy credentials)
+            threshold: Consecutive failures that open the breaker (0 disables)
+            cooldown: Seconds to stay open before probing
+        """
+        self.name = name
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.open_until = 0.0
+        self._factor = 1
+        self._probing = False
+
+    def _transition(self, state: str) -> None:
+        self.state = state
+        run_metrics.incr(f"reddit.breaker.{state}")
+
+    def _open(self, retry_after: float | None) -> None:
+        wait = max(self.cooldown * self._factor, retry_after or 0.0)
+        self.open_until = time.monotonic() + wait
+        self._transition("open")
+        logger.warning(f"Reddit circuit open for {self.name}, pausing requests {wait:.0f}s")
+
+    async def before_request(self) -> bool:
+        """Wait until a request may be sent on this egress.
+
+        Returns:
+            True if this request is the half-open probe
+        """
+        while True:
+            if self.state == "closed" or self.threshold <= 0:
+                return False
+
+            now = time.monotonic()
+            if self.state == "open":
+                if now < self.open_until:
+                    with run_metrics.span("reddit.breaker_wait"):
+                        await asyncio.sleep(self.open_until - now)
+                    continue
+                self._transition("half_open")
+
+            if not self._probing:
+                self._probing = True
+                return True
+            await asyncio.sleep(PROBE_POLL_SECONDS)
+
+    def record_success(self, probe: bool) -> None:
+        """A request got a non-429 response."""
+        if probe and self.state == "half_open":
+            self._probing = False
+            self._factor = 1
+            self._transition("closed")
+            logger.info(f"Reddit circuit closed for {self.name}")
+        if self.state == "closed":
+            self.failures = 0
+
+    def record_failure(self, probe: bool, retry_after: float | None = None) -> None:
+        """A request got a 429 or a network error."""
+        if probe and self.state == "half_open":
+            self._probing = False
+            self._factor = min(self._factor * 2, MAX_COOLDOWN_FACTOR)
+            self._open(retry_after)
+            return
+
+        if self.state != "closed" or self.threshold <= 0:
+            return  # Already open - in-flight stragglers don't extend it
+
+        self.failures += 1
+        if self.failures >= self.threshold:
+            self._open(retry_after)
+
+    def abandon(self, probe: bool) -> None:
+        """A request was cancelled before finishing (frees the probe slot)."""
+        if probe:
+            self._probing = False
@@ -0,0 +1,117 @@
+"""
+Selective-field JSON decoders for Reddit and Dolphin responses.
+
+Listing payloads carry full comment/post bodies, HTML and media metadata,
+and profile pages carry fingerprint settings, none of which the tracker
+reads. These msgspec Structs declare only the fields we use; msgspec skips
+everything else while parsing, so no intermediate dicts are built for it.
+"""
+
+from typing import Any
+
+import msgspec
+
+
+# --- Reddit ---
+
+
+class ListingItemData(msgspec.Struct):
+    name: str = ""  # Fullname, e.g. t3_abc123
+    permalink: str = ""
+    created_utc: float = 0.0
+
+
+class ListingItem(msgspec.Struct):
+    kind: str = ""  # t1 = comment, t3 = post
+    data: ListingItemData = msgspec.field(default_factory=ListingItemData)
+
+
+class ListingData(msgspec.Struct):
+    children: list[ListingItem] = []
+    after: str | None = None
+
+
+class Listing(msgspec.Struct):
+    """User listings (submitted/comments/overview) and /api/info results."""
+
+    data: ListingData = msgspec.field(default_factory=ListingData)
+
+
+class AccountData(msgspec.Struct):
+    """Account fields from about.json or user_data_by_account_ids.json.
+
+    Reddit sends null for some fields (e.g. karma of suspended or new
+    accounts), so they are nullable; RedditChecker reads null as 0.
+    """
+
+    id: str | None = ""
+    total_karma: int | None = None  # Absent from batched lookups
+    comment_karma: int | None = 0
+    link_karma: int | None = 0
+    created_utc: float | None = 0.0
+    is_suspended: bool | None = False
+
+
+class About(msgspec.Struct):
+    data: AccountData = msgspec.field(default_factory=AccountData)
+
+
+# --- Dolphin ---
+
+
+class ProfileRecord(msgspec.Struct):
+    """One /browser_profiles entry (notes and proxy are small, kept raw)."""
+
+    id: int | str
+    name: str
+    userId: int | None = None
+    notes: Any = None
+    proxy: Any = None
+    timezone: Any = None
+    created_at: str | None = ""
+    updated_at: str | None = ""
+
+
+class ProfilePage(msgspec.Struct):
+    data: list[ProfileRecord] = []
+    total: int | None = None  # Pagination metadata (absent on some API versions)
+    last_page: int | None = None
+
+
+class TeamUser(msgspec.Struct):
+    id: int | str
+    username: str | None = ""
+    displayName: str | None = ""
+    role: str | None = ""
+
+
+class TeamUsers(msgspec.Struct):
+    data: list[TeamUser] = []
+
+
+_listing = msgspec.json.Decoder(Listing)
+_about = msgspec.json.Decoder(About)
+_accounts = msgspec.json.Decoder(dict[str, AccountData])
+_profile_page = msgspec.json.Decoder(ProfilePage)
+_team_users = msgspec.json.Decoder(TeamUsers)
+
+
+def decode_listing(content: bytes) -> Listing:
+    return _listing.decode(content)
+
+
+def decode_about(content: bytes) -> AccountData:
+    return _about.decode(content).data
+
+
+def decode_accounts(content: bytes) -> dict[str, AccountData]:
+    """Decode a user_data_by_account_ids.json response (fullname -> account)."""
+    return _accounts.decode(content)
+
+
+def decode_profile_page(content: bytes) -> ProfilePage:
+    return _profile_page.decode(content)
+
+
+def decode_team_users(content: bytes) -> TeamUsers:
+    return _team_users.decode(content)
@@ -1,12 +1,53 @@
 """
 Dolphin Anty API client.
 Async client for fetching browser profiles and team users.
+
+With DOLPHIN_PROFILE_CACHE=true, profiles are served from a local SQLite
+store (sources/profile_cache.py) for DOLPHIN_PROFILE_CACHE_TTL seconds.
+After that, a sync pulls only profiles whose updated_at is newer than the
+cache and uses the reported total to detect deletions; a full crawl
+replaces the cache only when that check fails.
 """
 
+import asyncio
+import logging
+import math
+import random
+import time
+from collections import deque
+from typing import AsyncIterator, Callable
+
 import httpx
 
 from config import settings
+from metrics import run_metrics
 from models import DolphinProfile
+from sources.decoders import (
+    ProfilePage,
+    ProfileRecord,
+    decode_profile_page,
+    decode_team_users,
+)
+from sources.dolphin_mutations import (
+    MutationJournal,
+    MutationResult,
+    ProfileMutation,
+    proxy_payload,
+    timezone_payload,
+)
+from sources.profile_cache import ProfileCache
+from sources.team_users import team_key, team_users_cache
+
+# Profiles per /browser_profiles page
+PAGE_SIZE = 100
+
+# Listing order for incremental syncs (newest changes first)
+SYNC_SORT_PARAMS = {"sortBy": "updated_at", "order": "desc"}
+
+# Base delay (seconds) for mutation retry backoff
+BACKOFF_BASE = 1.0
+
+logger = logging.getLogger("tracker")
 
 
 def format_proxy(proxy_data: dict | None) -> tuple[str, str]:
@@ -49,11 +90,54 @@ def format_proxy(proxy_data: dict | None) -> tuple[str, str]:
     return display_proxy, full_url
 
 
+def parse_profile(p: ProfileRecord, user_map: dict) -> DolphinProfile:
+    """Build a DolphinProfile from a decoded /browser_profiles entry."""
+    # Extract notes content (handles dict or empty)
+    notes = p.notes
+    if isinstance(notes, dict):
+        notes_content = notes.get("content", "") or ""
+    else:
+        notes_content = ""
+
+    # Get owner from user_map
+    owner = user_map.get(p.userId, "Unknown")
+
+    # Extract proxy info from profile
+    proxy_data = p.proxy if isinstance(p.proxy, dict) else None
+    display_proxy, full_proxy_url = format_proxy(proxy_data) if proxy_data else ("None", "")
+
+    # Timezone is only fixed in manual mode (automatic follows the proxy IP)
+    tz_data = p.timezone if isinstance(p.timezone, dict) else {}
+    timezone = ""
+    if tz_data.get("mode") == "manual":
+        timezone = tz_data.get("value") or ""
+
+    return DolphinProfile(
+        id=str(p.id),
+        name=p.name,
+        owner=owner,
+        notes=notes_content,
+        created_at=p.created_at or "",
+        updated_at=p.updated_at or "",
+        proxy=display_proxy,
+        proxy_url=full_proxy_url,
+        timezone=timezone,
+    )
+
+
 class DolphinClient:
     """Async client for Dolphin Anty API."""
 
-    def __init__(self):
+    def __init__(self, use_cache: bool | None = None):
+        """
+        Args:
+            use_cache: Serve profiles from the local profile cache.
+                Defaults to settings.dolphin_profile_cache.
+        """
         self.client: httpx.AsyncClient | None = None
+        if use_cache is None:
+            use_cache = settings.dolphin_profile_cache
+        self.cache: ProfileCache | None = ProfileCache() if use_cache else None
 
     async def __aenter__(self):
         self.client = httpx.AsyncClient(
@@ -68,89 +152,242 @@ class DolphinClient:
     async def __aexit__(self, *args):
         if self.client:
             await self.client.aclose()
+        if self.cache:
+            self.cache.close()
 
-    async def get_team_users(self) -> list[dict]:
-        """Fetch all team user IDs and names."""
+    async def get_team_users(self, refresh: bool = False) -> list[dict]:
+        """Fetch all team user IDs and names.
+
+        Served from the shared team users cache (sources/team_users.py)
+        while it is younger than settings.dolphin_team_users_ttl.
+
+        Args:
+            refresh: Skip the cache and fetch from the API
+        """
         if not self.client:
             raise RuntimeError("Use async context manager")
 
-        response = await self.client.get("/team/users")
+        key = self._team_key()
+        if not refresh:
+            cached = team_users_cache.get(key, settings.dolphin_team_users_ttl)
+            if cached is not None:
+                run_metrics.incr("dolphin.team_users_cache_hit")
+                return cached
+
+        with run_metrics.span("dolphin.team_users"):
+            response = await self.client.get("/team/users")
         response.raise_for_status()
-        data = response.json()
+        data = decode_team_users(response.content)
 
         users = []
-        for user in data.get("data", []):
+        for user in data.data:
             users.append({
-                "id": user["id"],
-                "username": user.get("username", ""),
-                "displayName": user.get("displayName", ""),
-                "role": user.get("role", ""),
+                "id": user.id,
+                "username": user.username or "",
+                "displayName": user.displayName or "",
+                "role": user.role or "",
             })
+        team_users_cache.set(key, users)
         return users
 
+    async def get_owner_map(self, refresh: bool = False) -> dict[int | str, str]:
+        """Map team user ID -> owner name (display name, else username).
+
+        Args:
+            refresh: Skip the team users cache and fetch from the API
+        """
+        return {
+            u["id"]: u.get("displayName") or u.get("username", "Unknown")
+            for u in await self.get_team_users(refresh=refresh)
+        }
+
+    @staticmethod
+    def invalidate_team_users() -> None:
+        """Forget cached team users (e.g. after adding a team member).
+
+        Tools expose this as --refresh-team.
+        """
+        team_users_cache.invalidate()
+
+    def _team_key(self) -> str:
+        return team_key(
+            settings.dolphin_api_url, settings.dolphin_api_key.get_secret_value()
+        )
+
     async def get_profiles(self) -> list[DolphinProfile]:
         """Fetch all browser profiles with pagination and owner info."""
+        return [profile async for profile in self.iter_profiles()]
+
+    async def _get_page(self, params: dict, page: int) -> ProfilePage:
+        """Fetch and decode one /browser_profiles page."""
+        with run_metrics.span("dolphin.page"):
+            response = await self.client.get(
+                "/browser_profiles", params={**params, "page": page}
+            )
+            response.raise_for_status()
+            return decode_profile_page(response.content)
+
+    async def _page_params(self) -> tuple[dict, dict]:
+        """Build the /browser_profiles filter and the owner lookup map.
+
+        Returns:
+            Tuple of (params with every team user ID, user ID -> owner name)
+        """
+        user_map = await self.get_owner_map()
+        params = {"limit": PAGE_SIZE}
+        for i, user_id in enumerate(user_map):
+            params[f"users[{i}]"] = user_id
+        return params, user_map
+
+    async def iter_profiles(self) -> AsyncIterator[DolphinProfile]:
+        """Yield browser profiles page by page as each page is parsed.
+
+        Lets callers start working on the first profiles while later pages
+        are still loading, without holding the whole fleet in memory.
+        With the profile cache enabled, profiles come from the local store.
+        """
         if not self.client:
             raise RuntimeError("Use async context manager")
 
-        # First get team users to build owner lookup map
-        team_users = await self.get_team_users()
-        user_ids = [u["id"] for u in team_users]
-        user_map = {
-            u["id"]: u.get("displayName") or u.get("username", "Unknown")
-            for u in team_users
-        }
+        if self.cache:
+            for profile in await self._cached_profiles():
+                yield profile
+            return
 
-        profiles = []
-        page = 1
+        async for profile in self._crawl_profiles():
+            yield profile
 
-        while True:
-            # Build params with user IDs for filtering
-            params = {"limit": 100, "page": page}
-            for i, uid in enumerate(user_ids):
-                params[f"users[{i}]"] = uid
+    async def _crawl_profiles(self) -> AsyncIterator[DolphinProfile]:
+        """Yield every profile from the API (full crawl).
 
-            response = await self.client.get("/browser_profiles", params=params)
-            response.raise_for_status()
-            data = response.json()
+        Page 1 reports the page count, so the remaining pages are fetched
+        concurrently and yielded in page order, at most
+        settings.dolphin_page_concurrency pages ahead of the consumer.
+        Without pagination metadata, or if the fleet grew past the reported
+        count, pages are followed one at a time.
+        """
+        # Team users first - the page filter needs every user ID
+        params, user_map = await self._page_params()
 
-            if not data.get("data"):
-                break
+        data = await self._get_page(params, 1)
+        for p in data.data:
+            yield parse_profile(p, user_map)
+        if len(data.data) < PAGE_SIZE:
+            return
 
-            for p in data["data"]:
-                # Extract notes content (handles dict or empty)
-                notes = p.get("notes", {})
-                if isinstance(notes, dict):
-                    notes_content = notes.get("content", "") or ""
-                else:
-                    notes_content = ""
-
-                # Get owner from user_map
-                owner = user_map.get(p.get("userId"), "Unknown")
-
-                # Extract proxy info from profile
-                proxy_data = p.get("proxy", {})
-                display_proxy, full_proxy_url = format_proxy(proxy_data) if proxy_data else ("None", "")
-
-                profiles.append(
-                    DolphinProfile(
-                        id=str(p["id"]),
-                        name=p["name"],
-                        owner=owner,
-                        notes=notes_content,
-                        created_at=p.get("created_at", ""),
-                        updated_at=p.get("updated_at", ""),
-                        proxy=display_proxy,
-                        proxy_url=full_proxy_url,
-                    )
-                )
-
-            # Check if more pages
-            if len(data["data"]) < 100:
-                break
+        last_page = data.last_page
+        if last_page is None and data.total is not None:
+            last_page = math.ceil(data.total / PAGE_SIZE)
+        last_page = last_page or 1
+
+        page = 1
+        if last_page > 1:
+            # Sliding window: at most dolphin_page_concurrency pages are in
+            # flight or buffered ahead of the consumer, and the next page is
+            # only requested once a page has been fully yielded
+            next_pages = iter(range(2, last_page + 1))
+            window: deque[asyncio.Task] = deque()
+
+            def schedule() -> None:
+                n = next(next_pages, None)
+                if n is not None:
+                    window.append(asyncio.create_task(self._get_page(params, n)))
+
+            for _ in range(max(1, settings.dolphin_page_concurrency)):
+                schedule()
+            try:
+                while window:
+                    data = await window.popleft()
+                    page += 1
+                    for p in data.data:
+                        yield parse_profile(p, user_map)
+                    schedule()
+            finally:
+                # Consumer stopped early or a page failed - stop the rest
+                for task in window:
+                    task.cancel()
+
+        # Follow any pages beyond the reported count one at a time
+        while len(data.data) == PAGE_SIZE:
             page += 1
+            data = await self._get_page(params, page)
+            for p in data.data:
+                yield parse_profile(p, user_map)
+
+    async def _cached_profiles(self) -> list[DolphinProfile]:
+        """Read profiles from the cache, syncing it first if it is stale."""
+        if self.cache.is_fresh(settings.dolphin_profile_cache_ttl):
+            run_metrics.incr("dolphin.cache_hit")
+            return self.cache.all()
+
+        with run_metrics.span("dolphin.sync"):
+            # Deletes are caught by count only, so a delete plus a create the
+            # sync window misses (e.g. an imported profile with an older
+            # updated_at) leaves a ghost - re-crawl everything periodically
+            crawl_age = time.time() - self.cache.crawled_at()
+            crawl_due = crawl_age >= settings.dolphin_profile_cache_full_sync_hours * 3600
+            if self.cache.count() and not crawl_due and await self._sync_changes():
+                return self.cache.all()
+
+            logger.info("Profile cache: full sync")
+            profiles = [p async for p in self._crawl_profiles()]
+            self.cache.replace_all(profiles)
+            return profiles
+
+    async def _sync_changes(self) -> bool:
+        """Pull profiles changed since the last sync into the cache.
+
+        Pages through /browser_profiles newest-updated first and stops at
+        the cache's newest updated_at. Deletions are detected by count: the
+        reported total must equal the cached profiles plus the new ones. A
+        delete paired with a create older than the watermark keeps the
+        counts equal; the periodic full crawl
+        (DOLPHIN_PROFILE_CACHE_FULL_SYNC_HOURS) catches that.
 
-        return profiles
+        Returns:
+            True if the cache is now current; False if a full crawl is
+            needed (deletions, or the API ignored the sort or total)
+        """
+        params, user_map = await self._page_params()
+        params.update(SYNC_SORT_PARAMS)
+        watermark = self.cache.watermark()
+        known = self.cache.ids()
+
+        changed: list[DolphinProfile] = []
+        total = None
+        page = 0
+        while True:
+            page += 1
+            data = await self._get_page(params, page)
+            if total is None:
+                total = data.total
+                if total is None:
+                    return False
+            stamps = [p.updated_at or "" for p in data.data]
+            if stamps != sorted(stamps, reverse=True):
+                logger.debug("Profile cache: listing not sorted by updated_at")
+                return False
+
+            # >= so profiles updated within the watermark's second are re-read
+            changed.extend(
+                parse_profile(p, user_map) for p in data.data
+                if (p.updated_at or "") >= watermark
+            )
+            if len(data.data) < PAGE_SIZE or (stamps and stamps[-1] < watermark):
+                break
+
+        added = {p.id for p in changed} - known
+        if total != len(known) + len(added):
+            logger.info(
+                f"Profile cache: {len(known) + len(added) - total:+d} profile(s) "
+                f"vs Dolphin, resyncing"
+            )
+            return False
+
+        self.cache.upsert(changed)
+        run_metrics.incr("dolphin.sync_changed", len(changed))
+        logger.info(f"Profile cache: {len(changed)} changed profile(s) synced")
+        return True
 
     async def update_profile_proxy(
         self,
@@ -177,25 +414,14 @@ class DolphinClient:
         if not self.client:
             raise RuntimeError("Use async context manager")
 
-        # Build full proxy URL for the 'name' field
-        full_url = f"{proxy_type}://{login}:{password}@{host}:{port}"
-
-        proxy_data = {
-            "proxy": {
-                "type": proxy_type,
-                "host": host,
-                "port": port,
-                "name": full_url,
-                "login": login,
-                "password": password,
-            }
-        }
-
         response = await self.client.patch(
             f"/browser_profiles/{profile_id}",
-            json=proxy_data,
+            json=proxy_payload(proxy_type, host, port, login, password),
         )
 
+        if self.cache:
+            # Picked up by the next (incremental) sync
+            self.cache.invalidate()
         return response.status_code == 200
 
     async def update_profile_timezone(
@@ -215,18 +441,14 @@ class DolphinClient:
         if not self.client:
             raise RuntimeError("Use async context manager")
 
-        data = {
-            "timezone": {
-                "mode": "manual",
-                "value": timezone,
-            }
-        }
-
         response = await self.client.patch(
             f"/browser_profiles/{profile_id}",
-            json=data,
+            json=timezone_payload(timezone),
         )
 
+        if self.cache:
+            # Picked up by the next (incremental) sync
+            self.cache.invalidate()
         return response.status_code == 200
 
     async def delete_profile(self, profile_id: str) -> bool:
@@ -242,4 +464,138 @@ class DolphinClient:
             raise RuntimeError("Use async context manager")
 
         response = await self.client.delete(f"/browser_profiles/{profile_id}")
+        if response.status_code == 200 and self.cache:
+            self.cache.delete([profile_id])
         return response.status_code == 200
+
+    async def _apply_one(
+        self,
+        mutation: ProfileMutation,
+        semaphore: asyncio.Semaphore,
+        pause: list[float],
+    ) -> MutationResult:
+        """Run one mutation with retries (see apply_mutations)."""
+        result = MutationResult(mutation=mutation, success=False)
+        path = f"/browser_profiles/{mutation.profile_id}"
+
+        for attempt in range(settings.dolphin_mutation_retries):
+            async with semaphore:
+                # Honor a 429 pause set by any worker
+                wait = pause[0] - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+
+                result.attempts += 1
+                try:
+                    with run_metrics.span("dolphin.mutation"):
+                        if mutation.kind == "delete":
+                            response = await self.client.delete(path)
+                        else:
+                            response = await self.client.patch(path, json=mutation.payload)
+                except httpx.RequestError as e:
+                    response = None
+                    result.error = str(e)
+
+            delay = BACKOFF_BASE * (2**attempt) + random.uniform(0, 1)
+            if response is None:
+                # Network error - the same request is safe to resend
+                run_metrics.incr("dolphin.mutation_network_error")
+                await asyncio.sleep(delay)
+                continue
+
+            result.status_code = response.status_code
+            if response.status_code == 200 or (
+                mutation.kind == "delete" and response.status_code == 404
+            ):
+                # A 404 on delete means an earlier attempt already removed it
+                result.success = True
+                result.error = ""
+                return result
+
+            result.error = f"HTTP {response.status_code}"
+            if response.status_code == 429:
+                try:
+                    delay = float(response.headers.get("Retry-After", ""))
+                except ValueError:
+                    pass
+                run_metrics.incr("dolphin.rate_limited")
+                logger.warning(f"Dolphin rate limited, pausing mutations {delay:.1f}s")
+                # Every worker waits, not just this one
+                pause[0] = max(pause[0], time.monotonic() + delay)
+                continue
+            if response.status_code >= 500:
+                await asyncio.sleep(delay)
+                continue
+            return result  # Other 4xx - retrying won't help
+
+        return result
+
+    async def apply_mutations(
+        self,
+        mutations: list[ProfileMutation],
+        journal: MutationJournal | None = None,
+        resume: bool = False,
+        concurrency: int | None = None,
+        on_result: Callable[[MutationResult], None] | None = None,
+    ) -> list[MutationResult]:
+        """Apply many profile mutations concurrently.
+
+        PATCH and DELETE are idempotent, so failed requests (network errors,
+        429 and 5xx) are retried with exponential backoff; a 429 pauses
+        every worker for its Retry-After. Successful operations are recorded
+        in the journal. With resume=True, operations the same run's journal
+        already records are skipped; otherwise the journal starts over. It
+        is cleared once every operation has succeeded.
+
+        Args:
+            mutations: Operations to apply
+            journal: Journal for this run (None = no resume support)
+            resume: Skip operations already recorded by this run's journal
+            concurrency: Requests in flight. Defaults to
+                settings.dolphin_mutation_concurrency.
+            on_result: Called with each result as it finishes (progress)
+
+        Returns:
+            MutationResult per mutation, in input order
+        """
+        if not self.client:
+            raise RuntimeError("Use async context manager")
+
+        done: set[str] = set()
+        if journal and resume:
+            done = journal.load()
+            logger.info(f"Resuming: {len(done)} operation(s) already applied")
+        if journal and not done:
+            journal.start()
+
+        semaphore = asyncio.Semaphore(
+            max(1, concurrency or settings.dolphin_mutation_concurrency)
+        )
+        pause = [0.0]  # Shared monotonic time before which nobody sends
+
+        async def run(mutation: ProfileMutation) -> MutationResult:
+            if mutation.key in done:
+                result = MutationResult(mutation=mutation, success=True, resumed=True)
+            else:
+                result = await self._apply_one(mutation, semaphore, pause)
+                if result.success and journal:
+                    journal.append(result)
+            if on_result:
+                on_result(result)
+            return result
+
+        results = await asyncio.gather(*(run(m) for m in mutations))
+
+        if self.cache:
+            deleted = [
+                r.mutation.profile_id for r in results
+                if r.success and r.mutation.kind == "delete"
+            ]
+            self.cache.delete(deleted)
+            if any(r.success and r.mutation.kind == "update" for r in results):
+                # Picked up by the next (incremental) sync
+                self.cache.invalidate()
+
+        if journal and all(r.success for r in results):
+            journal.clear()
+        return list(results)
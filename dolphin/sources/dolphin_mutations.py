@@ -0,0 +1,150 @@
+"""
+Bulk Dolphin profile mutations and their resume journal.
+
+A ProfileMutation describes one PATCH or DELETE against a profile;
+DolphinClient.apply_mutations runs many of them concurrently. When
+applying a saved plan, every successful operation is appended to a
+per-tool JSONL journal whose header names the plan (its creation time).
+Only an explicit resume of that same plan skips what the journal
+records; any other run starts the journal over. Operations are keyed by
+profile, kind and a hash of the payload (payloads can hold proxy
+passwords, which never reach the journal).
+"""
+
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Literal
+
+# Journal directory (tracker directory, next to the state files)
+MUTATION_JOURNAL_DIR = Path(__file__).parent.parent
+
+logger = logging.getLogger("tracker")
+
+
+def proxy_payload(
+    proxy_type: str, host: str, port: int, login: str, password: str
+) -> dict:
+    """PATCH body that sets a profile's proxy."""
+    # Full proxy URL goes in the 'name' field (read back by format_proxy)
+    full_url = f"{proxy_type}://{login}:{password}@{host}:{port}"
+    return {
+        "proxy": {
+            "type": proxy_type,
+            "host": host,
+            "port": port,
+            "name": full_url,
+            "login": login,
+            "password": password,
+        }
+    }
+
+
+def timezone_payload(timezone: str) -> dict:
+    """PATCH body that sets a profile's timezone (IANA name)."""
+    return {
+        "timezone": {
+            "mode": "manual",
+            "value": timezone,
+        }
+    }
+
+
+@dataclass
+class ProfileMutation:
+    """One change to a Dolphin profile."""
+
+    kind: Literal["update", "delete"]
+    profile_id: str
+    payload: dict = field(default_factory=dict)  # PATCH body (update only)
+    label: str = ""  # Shown in progress output (e.g. profile name)
+
+    @property
+    def key(self) -> str:
+        """Identity used by the journal (same key = same effect)."""
+        payload = json.dumps(self.payload, sort_keys=True).encode()
+        return f"{self.kind}:{self.profile_id}:{hashlib.sha256(payload).hexdigest()[:16]}"
+
+
+@dataclass
+class MutationResult:
+    """Outcome of one ProfileMutation."""
+
+    mutation: ProfileMutation
+    success: bool
+    status_code: int | None = None
+    error: str = ""
+    attempts: int = 0
+    resumed: bool = False  # Already applied by an earlier, interrupted run
+
+
+class MutationJournal:
+    """Keys of operations applied by one run of a bulk change."""
+
+    def __init__(self, name: str, run_id: str, directory: Path = MUTATION_JOURNAL_DIR):
+        """
+        Args:
+            name: Tool name (one journal file per tool)
+            run_id: Identifies the run; a journal from another run is ignored
+            directory: Where the journal file lives
+        """
+        self.path = directory / f"mutations_{name}.jsonl"
+        self.run_id = run_id
+
+    def load(self) -> set[str]:
+        """Keys applied so far by this run (empty if the file is another run's).
+
+        A torn final line is skipped.
+        """
+        done: set[str] = set()
+        if not self.path.exists():
+            return done
+
+        with open(self.path, encoding="utf-8") as f:
+            for line_num, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                    if line_num == 1:
+                        if entry["run_id"] != self.run_id:
+                            logger.info(f"Ignoring {self.path.name}: it belongs to another run")
+                            return set()
+                        continue
+                    done.add(entry["key"])
+                except (json.JSONDecodeError, KeyError, TypeError) as e:
+                    if line_num == 1:
+                        logger.warning(f"Ignoring {self.path.name}: unreadable header")
+                        return set()
+                    logger.warning(f"Skipping unreadable mutation journal line {line_num}: {e}")
+        return done
+
+    def start(self) -> None:
+        """Begin a fresh journal for this run (replaces any earlier one)."""
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"run_id": self.run_id}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def append(self, result: MutationResult) -> None:
+        """Durably record one applied operation."""
+        entry = {
+            "key": result.mutation.key,
+            "profile_id": result.mutation.profile_id,
+            "status_code": result.status_code,
+        }
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def clear(self) -> None:
+        """Remove the journal once a bulk change has fully succeeded."""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,152 @@
+"""
+Local SQLite store of Dolphin browser profiles.
+
+Holds the last synced copy of every profile (keyed by profile id) so the
+tracker and the maintenance scripts can read the fleet without a full
+/browser_profiles crawl each time. DolphinClient decides when to sync; this
+module only stores rows and sync metadata. Uses the stdlib sqlite3 module,
+so concurrent readers (e.g. shard processes) are safe.
+"""
+
+import logging
+import sqlite3
+import time
+from dataclasses import astuple, fields
+from pathlib import Path
+
+from models import DolphinProfile
+
+# Cache location (tracker directory, next to the state files)
+PROFILE_CACHE_FILE = Path(__file__).parent.parent / "profiles.db"
+
+# Column order matches the DolphinProfile fields
+_COLUMNS = [f.name for f in fields(DolphinProfile)]
+
+logger = logging.getLogger("tracker")
+
+
+class ProfileCache:
+    """Persistent profile rows plus the time of the last sync."""
+
+    def __init__(self, path: Path = PROFILE_CACHE_FILE):
+        self.path = path
+        self._db: sqlite3.Connection | None = None
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, timeout=30)
+            columns = ", ".join(f"{c} TEXT" for c in _COLUMNS if c != "id")
+            with self._db:
+                existing = [
+                    row[1] for row in self._db.execute("PRAGMA table_info(profiles)")
+                ]
+                if existing and existing != [*_COLUMNS, "position"]:
+                    # DolphinProfile fields changed - rebuilt by the next sync
+                    logger.info("Profile cache schema changed, rebuilding")
+                    self._db.execute("DROP TABLE profiles")
+                    self._db.execute("DROP TABLE IF EXISTS meta")
+                self._db.execute(
+                    f"CREATE TABLE IF NOT EXISTS profiles "
+                    f"(id TEXT PRIMARY KEY, {columns}, position INTEGER)"
+                )
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+                )
+        return self._db
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _set_meta(self, db: sqlite3.Connection, key: str, value: float) -> None:
+        db.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value))
+        )
+
+    def _set_synced(self, db: sqlite3.Connection, synced_at: float) -> None:
+        self._set_meta(db, "synced_at", synced_at)
+
+    def _meta(self, key: str) -> float:
+        row = self._conn().execute(
+            "SELECT value FROM meta WHERE key = ?", (key,)
+        ).fetchone()
+        return float(row[0]) if row else 0.0
+
+    def synced_at(self) -> float:
+        """Unix time of the last successful sync (0 if never or invalidated)."""
+        return self._meta("synced_at")
+
+    def crawled_at(self) -> float:
+        """Unix time of the last full crawl (0 if never)."""
+        return self._meta("crawled_at")
+
+    def is_fresh(self, ttl: float) -> bool:
+        """True if the last sync is less than `ttl` seconds old."""
+        synced_at = self.synced_at()
+        return synced_at > 0 and time.time() - synced_at < ttl
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+    def ids(self) -> set[str]:
+        return {row[0] for row in self._conn().execute("SELECT id FROM profiles")}
+
+    def watermark(self) -> str:
+        """Newest updated_at among cached profiles ("" if empty)."""
+        row = self._conn().execute("SELECT MAX(updated_at) FROM profiles").fetchone()
+        return row[0] or ""
+
+    def all(self) -> list[DolphinProfile]:
+        """Every cached profile, in the order the API listed them."""
+        rows = self._conn().execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM profiles ORDER BY position"
+        )
+        return [DolphinProfile(*row) for row in rows]
+
+    def replace_all(self, profiles: list[DolphinProfile]) -> None:
+        """Replace the cache with a full crawl and mark it synced."""
+        db = self._conn()
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        with db:
+            db.execute("DELETE FROM profiles")
+            db.executemany(
+                f"INSERT OR REPLACE INTO profiles ({', '.join(_COLUMNS)}, position) "
+                f"VALUES ({placeholders}, ?)",
+                [(*astuple(p), i) for i, p in enumerate(profiles)],
+            )
+            now = time.time()
+            self._set_synced(db, now)
+            self._set_meta(db, "crawled_at", now)
+
+    def upsert(self, profiles: list[DolphinProfile]) -> None:
+        """Insert or update changed profiles and mark the cache synced.
+
+        Existing rows keep their position; new profiles go at the end.
+        """
+        db = self._conn()
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        updates = ", ".join(f"{c} = excluded.{c}" for c in _COLUMNS if c != "id")
+        with db:
+            end = db.execute("SELECT COALESCE(MAX(position), -1) FROM profiles").fetchone()[0]
+            db.executemany(
+                f"INSERT INTO profiles ({', '.join(_COLUMNS)}, position) "
+                f"VALUES ({placeholders}, ?) "
+                f"ON CONFLICT(id) DO UPDATE SET {updates}",
+                [(*astuple(p), end + 1 + i) for i, p in enumerate(profiles)],
+            )
+            self._set_synced(db, time.time())
+
+    def delete(self, profile_ids: list[str]) -> None:
+        """Drop profiles deleted through the API (cache stays fresh)."""
+        db = self._conn()
+        with db:
+            db.executemany(
+                "DELETE FROM profiles WHERE id = ?", [(str(i),) for i in profile_ids]
+            )
+
+    def invalidate(self) -> None:
+        """Force the next read to sync (e.g. after a profile was modified)."""
+        db = self._conn()
+        with db:
+            self._set_synced(db, 0.0)
@@ -0,0 +1,120 @@
+"""
+Header-driven rate limiting for Reddit requests.
+
+Reddit reports the request budget on every response:
+X-Ratelimit-Remaining (requests left in the window), X-Ratelimit-Used and
+X-Ratelimit-Reset (seconds until the window resets). RateLimiter tracks
+that budget for one egress identity (direct connection or one proxy) and
+spreads the remaining requests evenly over the rest of the window, with
+randomized spacing (INFRA-02), so the checker slows down before a 429
+instead of backing off after one.
+"""
+
+import asyncio
+import random
+import time
+
+import httpx
+
+# Requests kept in hand at the end of each window (never spent)
+RESERVE = 1
+
+# Randomization around the even spacing (0.5x - 1.5x, mean 1x)
+JITTER = 0.5
+
+
+def _header_float(headers: httpx.Headers, name: str) -> float | None:
+    try:
+        return float(headers[name])
+    except (KeyError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Request budget for one egress identity."""
+
+    def __init__(self, min_delay: float, max_delay: float, share: int = 1):
+        """
+        Args:
+            min_delay: Lower bound of the random spacing used while the budget
+                is unknown (before the first response with rate limit headers)
+            max_delay: Upper bound of that spacing
+            share: Processes pacing the same egress independently; each
+                spaces its requests `share` times wider
+        """
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.share = max(1, share)
+        self.remaining: float | None = None
+        self.used: float | None = None
+        self.reset_at = 0.0  # time.monotonic() when the window resets
+        self.limit: float | None = None  # Requests per window (used + remaining)
+        self.window = 0.0  # Longest reset seen, i.e. the window length
+        self._next_at = 0.0  # Earliest start for the next request
+
+    def update(self, headers: httpx.Headers) -> None:
+        """Record the budget reported by a response (ignored if absent)."""
+        remaining = _header_float(headers, "x-ratelimit-remaining")
+        reset = _header_float(headers, "x-ratelimit-reset")
+        if remaining is None or reset is None:
+            return
+
+        self.remaining = remaining
+        self.used = _header_float(headers, "x-ratelimit-used")
+        self.reset_at = time.monotonic() + reset
+        self.window = max(self.window, reset)
+        if self.used is not None:
+            self.limit = self.used + remaining
+
+    def _roll_over(self, at: float) -> None:
+        """Assume a fresh window once the reported one has ended."""
+        if self.limit is None or self.window <= 0 or at < self.reset_at:
+            return
+        while self.reset_at <= at:
+            self.reset_at += self.window
+        self.remaining = self.limit
+
+    def pause(self, seconds: float) -> None:
+        """Hold all requests on this egress for at least `seconds` (e.g. after a 429)."""
+        self._next_at = max(self._next_at, time.monotonic() + seconds)
+
+    def _spacing(self, at: float) -> float:
+        """Gap to leave after a request starting at `at`."""
+        if self.remaining is None or at >= self.reset_at:
+            # Budget unknown or window over - fall back to configured jitter
+            return random.uniform(self.min_delay, self.max_delay) * self.share
+
+        window = self.reset_at - at
+        usable = self.remaining - RESERVE
+        if usable <= 0:
+            # Last request of the window - the next one waits for the reset
+            return window
+
+        even = window / usable
+        return even * random.uniform(1 - JITTER, 1 + JITTER) * self.share
+
+    async def acquire(self) -> float:
+        """Wait for this egress's next request slot.
+
+        Slots are reserved synchronously, so concurrent workers sharing an
+        egress queue up behind each other instead of bursting.
+
+        Returns:
+            Seconds waited
+        """
+        now = time.monotonic()
+        start = max(now, self._next_at)
+        self._roll_over(start)
+        if self.remaining is not None and start < self.reset_at and self.remaining <= RESERVE:
+            # Budget spent - wait for the window to reset
+            start = self.reset_at + random.uniform(0, 1)
+            self._roll_over(start)
+        self._next_at = start + self._spacing(start)
+        if self.remaining is not None and start < self.reset_at:
+            # Count the request now; the response headers will correct it
+            self.remaining -= 1
+
+        wait = start - now
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
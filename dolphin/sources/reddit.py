@@ -1,80 +1,574 @@
 """
 Reddit account checker with anti-detection patterns.
 Uses randomized delays and exponential backoff for rate limit handling.
+
+Optionally routes each account's requests through its own Dolphin profile
+proxy, so the fleet is spread over many egress IPs instead of one.
+
+In batch lookup mode, karma and created_utc for up to 100 accounts are
+fetched per /api/user_data_by_account_ids.json call (prefetch_accounts),
+using account fullnames learned from earlier about.json responses.
+
+In batch shadowban mode, the per-account submitted.json + permalink check
+is deferred: the newest post fullname seen by get_activity_counts is
+collected, and verify_shadowbans checks visibility for up to 100 posts per
+/api/info.json call.
+
+User listings (submitted/comments) go through a per-account response cache
+with in-flight deduplication, so check_shadowban and get_activity_counts
+share one submitted.json fetch per account. Callers release_account once
+an account's checks are done, so the cache only holds accounts in flight.
+
+With REDDIT_ACTIVITY_SOURCE=overview, activity counts come from
+overview.json (comments and posts interleaved, newest first), paged with
+`after` only until an item from before today (UTC) is reached. The first
+overview page also supplies the newest post for shadowban checks, so
+submitted.json is only fetched when that page has no post.
+
+Every request goes through _get, which applies the egress's circuit
+breaker (sources/breaker.py) and pacing before sending. Responses are
+decoded with the selective-field structs in sources/decoders.py.
+
+When REDDIT_CLIENT_ID/REDDIT_CLIENT_SECRET are set, requests use an
+app-only OAuth token against oauth.reddit.com (sources/reddit_oauth.py),
+paced by the adaptive rate limiter against the app's higher quota.
+
+With REDDIT_ACTIVITY_CURSORS=true, each listing is fetched only back to
+the newest item seen last time (sources/activity_ledger.py), and counts
+come from the persisted ledger.
 """
 
 import asyncio
+import logging
 import random
+import time
 from datetime import datetime, timezone
-from typing import Literal
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable, Literal, TypeVar
 
 import httpx
+import msgspec
 
 from config import settings
+from metrics import run_metrics
 from models import RedditStatus, ActivityCounts
+from sources.proxies import normalize_proxy
+from sources.activity_ledger import ActivityLedger
+from sources.breaker import CircuitBreaker
+from sources.decoders import (
+    AccountData,
+    Listing,
+    ListingItem,
+    decode_about,
+    decode_accounts,
+    decode_listing,
+)
+from sources.ratelimit import RateLimiter
+from sources.reddit_ids import RedditIdCache
+from sources.reddit_oauth import TokenManager
+
+# Base URL for anonymous requests (OAuth mode uses settings.reddit_oauth_api_base)
+PUBLIC_API_BASE = "https://www.reddit.com"
+
+# Max account fullnames per /api/user_data_by_account_ids.json call
+BATCH_LOOKUP_SIZE = 100
+
+# Max post fullnames per /api/info.json call
+BATCH_INFO_SIZE = 100
+
+# Listing size for user submissions (shared by shadowban and activity checks)
+SUBMITTED_LIMIT = 25
+
+# overview.json page size (Reddit maximum) and safety cap on pages per account
+OVERVIEW_PAGE_SIZE = 100
+OVERVIEW_MAX_PAGES = 10
+
+logger = logging.getLogger("tracker")
+
+# Items and results of RedditChecker.iter_checks
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def _listing_username(url: str) -> str:
+    """Lowercase account name of a /user/<name>/... listing URL."""
+    return url.partition("/user/")[2].partition("/")[0].lower()
 
 
 class RedditChecker:
     """Check Reddit account status with anti-detection measures."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        use_profile_proxies: bool | None = None,
+        batch_lookup: bool | None = None,
+        batch_shadowban: bool | None = None,
+    ):
+        """
+        Args:
+            use_profile_proxies: Route requests through the proxy_url passed to
+                each check. Defaults to settings.reddit_use_profile_proxies.
+            batch_lookup: Enable prefetch_accounts batched lookups.
+                Defaults to settings.reddit_batch_lookup.
+            batch_shadowban: Defer shadowban checks to verify_shadowbans.
+                Defaults to settings.reddit_batch_shadowban.
+        """
         self.client: httpx.AsyncClient | None = None
+        self.use_profile_proxies = (
+            settings.reddit_use_profile_proxies
+            if use_profile_proxies is None
+            else use_profile_proxies
+        )
+        # Normalized proxy URL -> client, reused across calls
+        self._proxy_clients: dict[str, httpx.AsyncClient] = {}
+        self.batch_lookup = (
+            settings.reddit_batch_lookup if batch_lookup is None else batch_lookup
+        )
+        # Username -> t2 fullname, learned from about.json (persisted)
+        self._ids = RedditIdCache()
+        # Lowercase username -> account data from prefetch_accounts, used once
+        self._prefetched: dict[str, AccountData] = {}
+        self.batch_shadowban = (
+            settings.reddit_batch_shadowban if batch_shadowban is None else batch_shadowban
+        )
+        # Lowercase username -> newest post fullname (t3_...), awaiting verify_shadowbans
+        self._latest_posts: dict[str, str] = {}
+        # Lowercase username -> listing URL -> (status_code, listing) future,
+        # shared by concurrent callers until release_account
+        self._listings: dict[str, dict[str, asyncio.Future]] = {}
+        # App-only OAuth (None = anonymous www.reddit.com endpoints)
+        self.oauth: TokenManager | None = None
+        if settings.reddit_client_id and settings.reddit_client_secret:
+            self.oauth = TokenManager(
+                settings.reddit_oauth_token_url,
+                settings.reddit_client_id,
+                settings.reddit_client_secret.get_secret_value(),
+                api_base=settings.reddit_oauth_api_base,
+            )
+        self.api_base = (settings.reddit_oauth_api_base if self.oauth else PUBLIC_API_BASE).rstrip("/")
+        # OAuth quotas are large and reported in headers - always pace by them
+        self.adaptive_rate_limit = settings.reddit_adaptive_rate_limit or self.oauth is not None
+        # Egress client -> request pacing, header-driven in adaptive mode
+        # (None key = the OAuth app's quota)
+        self._limiters: dict[httpx.AsyncClient | None, RateLimiter] = {}
+        # Egress client -> circuit breaker shared by all workers on it
+        self._breakers: dict[httpx.AsyncClient, CircuitBreaker] = {}
+
+        self.activity_cursors = settings.reddit_activity_cursors
+        # Per-account listing cursors and recent item timestamps (persisted)
+        self.activity_ledger = ActivityLedger()
 
     async def __aenter__(self):
         self.client = httpx.AsyncClient(
             timeout=httpx.Timeout(10.0),
             headers={"User-Agent": settings.reddit_user_agent},
         )
+        self._ids.load()
+        if self.activity_cursors:
+            self.activity_ledger.load()
         return self
 
     async def __aexit__(self, *args):
         if self.client:
             await self.client.aclose()
+        for client in self._proxy_clients.values():
+            if client is not self.client:  # Unusable proxies map to it
+                await client.aclose()
+        self._proxy_clients.clear()
+        self._limiters.clear()
+        self._breakers.clear()
+        self._prefetched.clear()
+        self._latest_posts.clear()
+        self.clear_cache()
+        self.save_state()
+
+    def snapshot_state(self) -> tuple[dict, dict]:
+        """Copy unsaved ID cache and ledger changes for save_state.
+
+        Call on the event loop. The daemon saves the copy from a worker
+        thread while checks keep updating the live cache and ledger.
+        """
+        return self._ids.snapshot(), self.activity_ledger.snapshot()
+
+    def restore_state(self, snapshot: tuple[dict, dict]) -> None:
+        """Mark a snapshot's changes unsaved again (event loop, after a failed save)."""
+        ids, accounts = snapshot
+        self._ids.restore(ids)
+        self.activity_ledger.restore(accounts)
+
+    def save_state(self, snapshot: tuple[dict, dict] | None = None) -> bool:
+        """Persist the ID cache and activity ledger (end of run or daemon flush).
 
-    async def _random_delay(self) -> None:
-        """Sleep for random duration to avoid detection patterns.
+        Args:
+            snapshot: From snapshot_state(); taken now when omitted
+
+        Returns:
+            False if anything failed to save. A given snapshot must then be
+            passed to restore_state; one taken here is restored already.
+        """
+        taken_here = snapshot is None
+        if taken_here:
+            snapshot = self.snapshot_state()
+        ids, accounts = snapshot
+        saved = True
+        try:
+            self._ids.write(ids)
+        except OSError as e:
+            logger.warning(f"Failed to save Reddit ID cache: {e}")
+            saved = False
+        try:
+            self.activity_ledger.write(accounts)
+        except OSError as e:
+            logger.warning(f"Failed to save activity ledger: {e}")
+            saved = False
+        if not saved and taken_here:
+            self.restore_state(snapshot)
+        return saved
+
+    def _client_for(self, proxy_url: str | None) -> httpx.AsyncClient:
+        """Return the HTTP client for a profile's egress.
+
+        Falls back to the shared direct client when proxy routing is disabled,
+        the profile has no proxy configured, or its proxy is unusable (bad
+        URL, or SOCKS without httpx[socks]) - one bad Dolphin proxy must not
+        abort the run.
+        """
+        if not self.client:
+            raise RuntimeError("Use async context manager")
+
+        if not self.use_profile_proxies or not proxy_url or proxy_url == "None":
+            return self.client
+
+        # Normalize URL using provider (handles credential encoding)
+        config = normalize_proxy(proxy_url)
+        normalized_url = config.url if config else proxy_url
+
+        client = self._proxy_clients.get(normalized_url)
+        if client is None:
+            try:
+                client = httpx.AsyncClient(
+                    proxy=normalized_url,
+                    timeout=httpx.Timeout(settings.reddit_proxy_timeout),
+                    headers={"User-Agent": settings.reddit_user_agent},
+                )
+            except (ImportError, httpx.InvalidURL, ValueError) as e:
+                # Error text can include the URL - log its scheme only
+                scheme, sep, _ = normalized_url.partition("://")
+                if not sep:
+                    scheme = "schemeless"
+                logger.warning(
+                    f"Unusable {scheme} profile proxy ({type(e).__name__}), "
+                    f"using the direct connection"
+                )
+                run_metrics.incr("reddit.proxy_unusable")
+                self._proxy_clients[normalized_url] = self.client
+                return self.client
+            self._proxy_clients[normalized_url] = client
+            # Label the breaker by proxy host only (no credentials in logs)
+            url = httpx.URL(normalized_url)
+            self._breakers[client] = self._new_breaker(f"proxy {url.host}:{url.port}")
+        return client
+
+    def _new_breaker(self, name: str) -> CircuitBreaker:
+        return CircuitBreaker(
+            name,
+            threshold=settings.reddit_breaker_threshold,
+            cooldown=settings.reddit_breaker_cooldown,
+        )
+
+    def _breaker_for(self, client: httpx.AsyncClient) -> CircuitBreaker:
+        breaker = self._breakers.get(client)
+        if breaker is None:
+            breaker = self._new_breaker("direct")
+            self._breakers[client] = breaker
+        return breaker
+
+    def _limiter_for(self, client: httpx.AsyncClient) -> RateLimiter:
+        # OAuth limits are per app, not per IP - one budget for every egress
+        if self.oauth:
+            client = None
+        limiter = self._limiters.get(client)
+        if limiter is None:
+            # Local --workers processes share the direct egress and the OAuth
+            # app, so each takes its share; each proxy is owned by one shard
+            # (shards.shard_key) and keeps its full budget
+            shared = client is None or client is self.client
+            limiter = RateLimiter(
+                settings.reddit_min_delay,
+                settings.reddit_max_delay,
+                share=settings.reddit_egress_share if shared else 1,
+            )
+            self._limiters[client] = limiter
+        return limiter
+
+    async def _random_delay(self, client: httpx.AsyncClient | None = None) -> None:
+        """Wait for the egress's next request slot, a random gap after the last.
 
         CRITICAL for INFRA-02: Uses random.uniform, never fixed values.
+        Slots are shared by every worker on the egress, so concurrency only
+        overlaps requests across different egresses. Without adaptive rate
+        limiting the limiter never sees headers and keeps the configured
+        REDDIT_MIN_DELAY..REDDIT_MAX_DELAY spacing; with it, the spacing
+        comes from the egress's reported budget (see sources/ratelimit.py).
         """
-        delay = random.uniform(settings.reddit_min_delay, settings.reddit_max_delay)
-        await asyncio.sleep(delay)
+        with run_metrics.span("reddit.pacing"):
+            await self._limiter_for(client or self.client).acquire()
+
+    async def _get(
+        self, client: httpx.AsyncClient, url: str, params: dict | None = None
+    ) -> httpx.Response:
+        """Send one GET on an egress: breaker, pacing, request, bookkeeping.
+
+        Every Reddit request goes through here so that the egress's circuit
+        breaker and rate limiter see all of its traffic.
+
+        Raises:
+            httpx.RequestError: On network errors (counted by the breaker)
+        """
+        breaker = self._breaker_for(client)
+        probe = await breaker.before_request()
+        try:
+            await self._random_delay(client)
+            response = await client.get(url, params=params, headers=await self._auth_headers())
+            if response.status_code == 401 and self.oauth:
+                # Token revoked or expired early - refresh once and retry,
+                # paced and counted like any other request
+                self.oauth.invalidate()
+                if self.adaptive_rate_limit:
+                    self._limiter_for(client).update(response.headers)
+                await self._random_delay(client)
+                response = await client.get(url, params=params, headers=await self._auth_headers())
+        except httpx.RequestError:
+            breaker.record_failure(probe)
+            raise
+        except BaseException:
+            breaker.abandon(probe)
+            raise
+
+        if self.adaptive_rate_limit:
+            self._limiter_for(client).update(response.headers)
 
-    async def check_account(self, username: str) -> RedditStatus:
+        if response.status_code == 429:
+            try:
+                retry_after = float(response.headers.get("Retry-After", ""))
+            except ValueError:
+                retry_after = None
+            breaker.record_failure(probe, retry_after)
+        else:
+            breaker.record_success(probe)
+        return response
+
+    async def _auth_headers(self) -> dict[str, str] | None:
+        """Bearer header in OAuth mode (token requests use the direct client).
+
+        Raises:
+            httpx.RequestError: If no token can be obtained, so callers treat
+                it like any other failed request
+        """
+        if not self.oauth:
+            return None
+        try:
+            token = await self.oauth.get_token(self.client)
+        except httpx.HTTPStatusError as e:
+            raise httpx.RequestError(
+                f"Reddit OAuth token request failed: HTTP {e.response.status_code}",
+                request=e.request,
+            ) from e
+        return {"Authorization": f"bearer {token}"}
+
+    def clear_cache(self) -> None:
+        """Forget cached listing responses (start of a new run or daemon cycle)."""
+        self._listings.clear()
+
+    def release_account(self, username: str) -> None:
+        """Drop an account's cached listings once all of its checks are done."""
+        self._listings.pop(username.lower(), None)
+
+    async def _fetch_listing(self, client: httpx.AsyncClient, url: str) -> tuple[int, Listing]:
+        """GET a user listing at most once per account check.
+
+        Concurrent and later callers for the same URL share one request (and
+        one _random_delay). Only 200 responses stay cached; errors and
+        non-200 statuses are shared with callers already waiting, then
+        forgotten so the next caller retries.
+
+        Returns:
+            Tuple of (status_code, decoded listing; empty for non-200 or
+            undecodable bodies)
+
+        Raises:
+            httpx.RequestError: On network errors
+        """
+        listings = self._listings.setdefault(_listing_username(url), {})
+        future = listings.get(url)
+        if future is not None:
+            run_metrics.incr("reddit.listing_cache_hit")
+            # Shield so a cancelled waiter doesn't cancel the shared fetch
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        listings[url] = future
+        try:
+            response = await self._get(client, url)
+            data = Listing()
+            if response.status_code == 200:
+                try:
+                    data = decode_listing(response.content)
+                except msgspec.DecodeError as e:
+                    logger.debug(f"Undecodable listing {url}: {e}")
+        except BaseException as e:
+            listings.pop(url, None)
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                future.exception()  # Mark retrieved; the error is raised below
+            raise
+
+        if response.status_code != 200:
+            listings.pop(url, None)
+        future.set_result((response.status_code, data))
+        return response.status_code, data
+
+    def _submitted_url(self, username: str) -> str:
+        return f"{self.api_base}/user/{username}/submitted.json?limit={SUBMITTED_LIMIT}"
+
+    async def prefetch_accounts(self, usernames: list[str]) -> int:
+        """Look up karma and created_utc for many accounts in batched calls.
+
+        Only accounts whose fullname is already cached can be batched; the
+        rest (and any account missing from the response, e.g. suspended or
+        deleted) fall back to about.json in check_account, which also tells
+        403 from 404. Batched calls use the shared direct client.
+
+        Args:
+            usernames: Accounts about to be checked
+
+        Returns:
+            Number of accounts resolved from batched responses
+        """
+        if not self.client:
+            raise RuntimeError("Use async context manager")
+
+        by_fullname: dict[str, str] = {}
+        for username in usernames:
+            fullname = self._ids.get(username)
+            if fullname:
+                by_fullname[fullname] = username
+
+        fullnames = list(by_fullname)
+        resolved = 0
+        for start in range(0, len(fullnames), BATCH_LOOKUP_SIZE):
+            chunk = fullnames[start:start + BATCH_LOOKUP_SIZE]
+            try:
+                with run_metrics.span("reddit.batch_lookup"):
+                    response = await self._get(
+                        self.client,
+                        f"{self.api_base}/api/user_data_by_account_ids.json",
+                        params={"ids": ",".join(chunk)},
+                    )
+            except httpx.RequestError as e:
+                logger.warning(f"Batched account lookup failed: {e}")
+                continue
+
+            if response.status_code != 200:
+                # Unresolved accounts fall back to about.json
+                logger.warning(f"Batched account lookup failed: HTTP {response.status_code}")
+                continue
+
+            try:
+                accounts = decode_accounts(response.content)
+            except msgspec.DecodeError as e:
+                logger.warning(f"Batched account lookup returned unexpected data: {e}")
+                continue
+
+            for fullname, data in accounts.items():
+                username = by_fullname.get(fullname)
+                if not username or data.is_suspended:
+                    continue
+                self._prefetched[username.lower()] = data
+                resolved += 1
+
+        run_metrics.incr("reddit.batch_resolved", resolved)
+        return resolved
+
+    async def _active_status(
+        self, username: str, data: AccountData, proxy_url: str | None
+    ) -> RedditStatus:
+        """Build the status for an account whose profile data was returned.
+
+        In batch shadowban mode the status is provisionally "active" until
+        verify_shadowbans runs.
+        """
+        # Check for shadowban (profile exists but posts hidden)
+        shadowban_status = "active"
+        if not self.batch_shadowban:
+            with run_metrics.span("reddit.shadowban"):
+                shadowban_status = await self.check_shadowban(username, proxy_url)
+
+        comment_karma = data.comment_karma or 0
+        link_karma = data.link_karma or 0
+        total_karma = data.total_karma
+        if total_karma is None:
+            # Batched responses have no total_karma field (karma deltas
+            # compare comment + link karma, see reporting.snapshot_karma)
+            total_karma = comment_karma + link_karma
+        return RedditStatus(
+            username=username,
+            status=shadowban_status,
+            total_karma=total_karma,
+            comment_karma=comment_karma,
+            link_karma=link_karma,
+            created_utc=data.created_utc or 0,
+        )
+
+    async def check_account(
+        self, username: str, proxy_url: str | None = None
+    ) -> RedditStatus:
         """Check single Reddit account with backoff on rate limits.
 
+        Args:
+            username: Reddit username to check
+            proxy_url: Profile proxy to route through (if proxy routing enabled)
+
         Handles:
         - 200: Active account with karma
         - 404: Account not found
         - 403: Account suspended
         - 429: Rate limited (triggers exponential backoff)
-        - Other: Error status
+        - Other, or an undecodable 200 body: Error status
+
+        Accounts resolved by prefetch_accounts skip the about.json request.
         """
-        if not self.client:
-            raise RuntimeError("Use async context manager")
+        client = self._client_for(proxy_url)
 
-        url = f"https://www.reddit.com/user/{username}/about.json"
+        prefetched = self._prefetched.pop(username.lower(), None)
+        if prefetched is not None:
+            return await self._active_status(username, prefetched, proxy_url)
 
-        for attempt in range(settings.reddit_max_retries):
-            # Random delay before each request (INFRA-02)
-            await self._random_delay()
+        url = f"{self.api_base}/user/{username}/about.json"
 
+        for attempt in range(settings.reddit_max_retries):
             try:
-                response = await self.client.get(url)
+                # Random delay before each request (INFRA-02)
+                with run_metrics.span("reddit.about"):
+                    response = await self._get(client, url)
 
                 if response.status_code == 200:
-                    data = response.json().get("data", {})
-
-                    # Check for shadowban (profile exists but posts hidden)
-                    shadowban_status = await self.check_shadowban(username)
+                    try:
+                        data = decode_about(response.content)
+                    except msgspec.DecodeError as e:
+                        # One malformed response must not abort the whole run
+                        logger.warning(f"about.json for {username} returned unexpected data: {e}")
+                        return RedditStatus(
+                            username=username,
+                            status="error",
+                            error_message=f"Unexpected about.json response: {e}",
+                        )
+                    if data.id:
+                        # Learn the fullname for future batched lookups
+                        self._ids.set(username, data.id)
 
-                    return RedditStatus(
-                        username=username,
-                        status=shadowban_status,
-                        total_karma=data.get("total_karma", 0),
-                        comment_karma=data.get("comment_karma", 0),
-                        link_karma=data.get("link_karma", 0),
-                        created_utc=data.get("created_utc", 0),
-                    )
+                    return await self._active_status(username, data, proxy_url)
 
                 elif response.status_code == 404:
                     return RedditStatus(username=username, status="not_found")
@@ -85,6 +579,9 @@ class RedditChecker:
                 elif response.status_code == 429:
                     # Rate limited - exponential backoff with jitter (INFRA-03)
                     retry_after = response.headers.get("Retry-After")
+                    if not retry_after and self.adaptive_rate_limit:
+                        # The window reset is the exact wait
+                        retry_after = response.headers.get("X-Ratelimit-Reset")
                     if retry_after:
                         delay = float(retry_after)
                     else:
@@ -92,8 +589,13 @@ class RedditChecker:
                         delay = settings.reddit_backoff_base * (2**attempt)
                         delay += random.uniform(0, 1)
 
-                    print(f"Rate limited, backing off {delay:.1f}s...")
-                    await asyncio.sleep(delay)
+                    run_metrics.incr("reddit.rate_limited")
+                    logger.warning(f"Rate limited on {username}, backing off {delay:.1f}s")
+                    if self.adaptive_rate_limit:
+                        # Hold every request on this egress, not just this one
+                        self._limiter_for(client).pause(delay)
+                    else:
+                        await asyncio.sleep(delay)
                     continue
 
                 else:
@@ -105,6 +607,7 @@ class RedditChecker:
 
             except httpx.RequestError as e:
                 # Network error - retry with backoff
+                run_metrics.incr("reddit.network_error")
                 if attempt < settings.reddit_max_retries - 1:
                     delay = settings.reddit_backoff_base * (2**attempt)
                     delay += random.uniform(0, 1)
@@ -120,53 +623,85 @@ class RedditChecker:
         # Exhausted all retries
         return RedditStatus(username=username, status="rate_limited")
 
-    async def check_shadowban(self, username: str) -> Literal["active", "shadowbanned"]:
+    def _overview_url(self, username: str) -> str:
+        return f"{self.api_base}/user/{username}/overview.json?limit={OVERVIEW_PAGE_SIZE}"
+
+    async def _newest_post(
+        self, client: httpx.AsyncClient, username: str
+    ) -> tuple[int, ListingItem | None]:
+        """Find the account's newest post through the run's listing cache.
+
+        In overview mode the first overview.json page (the same request
+        _count_overview starts with) is used; submitted.json is only
+        fetched when that page has no post but the listing goes further.
+
+        Returns:
+            Tuple of (status_code, newest post or None if there is none)
+
+        Raises:
+            httpx.RequestError: On network errors
+        """
+        if settings.reddit_activity_source == "overview":
+            status_code, overview = await self._fetch_listing(
+                client, self._overview_url(username)
+            )
+            if status_code != 200:
+                return status_code, None
+            post = next((c for c in overview.data.children if c.kind == "t3"), None)
+            if post is not None or not overview.data.after:
+                return status_code, post
+
+        status_code, submitted = await self._fetch_listing(
+            client, self._submitted_url(username)
+        )
+        posts = submitted.data.children
+        return status_code, posts[0] if posts else None
+
+    async def check_shadowban(
+        self, username: str, proxy_url: str | None = None
+    ) -> Literal["active", "shadowbanned"]:
         """
         Detect if an active account is actually shadowbanned.
 
         Only call this for accounts that passed basic check_account() as "active".
         Shadowban = profile exists but posts are not publicly visible.
 
+        Args:
+            username: Reddit username to check
+            proxy_url: Profile proxy to route through (if proxy routing enabled)
+
         Returns:
             "active" - account is truly active (or has no posts to verify)
             "shadowbanned" - profile exists but posts are hidden
         """
-        if not self.client:
-            raise RuntimeError("Use async context manager")
-
-        # Step 1: Fetch user's submitted posts
-        submitted_url = f"https://www.reddit.com/user/{username}/submitted.json"
+        client = self._client_for(proxy_url)
 
+        # Step 1: Find the newest post (listing shared with get_activity_counts)
         try:
-            await self._random_delay()
-            submitted_resp = await self.client.get(submitted_url)
+            status_code, post = await self._newest_post(client, username)
 
-            if submitted_resp.status_code == 429:
+            if status_code == 429:
                 # Rate limited - default to active (conservative)
                 return "active"
 
-            if submitted_resp.status_code != 200:
+            if status_code != 200:
                 # Can't check - default to active (conservative)
                 return "active"
 
-            posts = submitted_resp.json().get("data", {}).get("children", [])
-
-            if not posts:
+            if post is None:
                 # No posts to verify - cannot detect shadowban
                 return "active"
 
             # Step 2: Check if most recent post is publicly visible
-            recent_post = posts[0].get("data", {})
-            permalink = recent_post.get("permalink")
+            permalink = post.data.permalink
 
             if not permalink:
                 return "active"
 
             # Step 3: Verify post visibility via direct permalink
-            post_url = f"https://www.reddit.com{permalink}.json"
+            post_url = f"{self.api_base}{permalink}.json"
 
-            await self._random_delay()
-            post_resp = await self.client.get(post_url)
+            post_resp = await self._get(client, post_url)
 
             if post_resp.status_code == 404:
                 # Post exists on profile but not publicly visible = shadowbanned
@@ -179,32 +714,470 @@ class RedditChecker:
             # Network error - default to active (conservative)
             return "active"
 
-    async def check_accounts(self, usernames: list[str]) -> list[RedditStatus]:
-        """Check multiple Reddit accounts.
+    async def verify_shadowbans(self, usernames: list[str]) -> set[str]:
+        """Batch-verify that each account's newest post is publicly visible.
+
+        Posts collected by get_activity_counts are looked up through
+        /api/info.json, up to 100 per request. A post missing from the
+        response is hidden, i.e. the account is shadowbanned. Accounts with
+        no recorded post, and whole batches that fail, count as not
+        shadowbanned (conservative, like check_shadowban).
+
+        Args:
+            usernames: Accounts provisionally marked active
 
-        Returns list of RedditStatus in same order as input.
+        Returns:
+            Set of usernames (as given) that are shadowbanned
         """
-        results = []
+        if not self.client:
+            raise RuntimeError("Use async context manager")
+
+        by_post: dict[str, str] = {}
         for username in usernames:
-            result = await self.check_account(username)
-            results.append(result)
-        return results
+            fullname = self._latest_posts.pop(username.lower(), None)
+            if fullname:
+                by_post[fullname] = username
+
+        fullnames = list(by_post)
+        shadowbanned: set[str] = set()
+        for start in range(0, len(fullnames), BATCH_INFO_SIZE):
+            chunk = fullnames[start:start + BATCH_INFO_SIZE]
+            try:
+                with run_metrics.span("reddit.shadowban_batch"):
+                    response = await self._get(
+                        self.client,
+                        f"{self.api_base}/api/info.json",
+                        params={"id": ",".join(chunk)},
+                    )
+            except httpx.RequestError as e:
+                logger.warning(f"Batched shadowban check failed: {e}")
+                continue
+
+            if response.status_code != 200:
+                logger.warning(f"Batched shadowban check failed: HTTP {response.status_code}")
+                continue
+
+            try:
+                children = decode_listing(response.content).data.children
+            except msgspec.DecodeError as e:
+                logger.warning(f"Batched shadowban check returned unexpected data: {e}")
+                continue
+            visible = {c.data.name for c in children}
+            shadowbanned.update(by_post[f] for f in chunk if f not in visible)
+
+        return shadowbanned
+
+    async def iter_checks(
+        self,
+        items: Iterable[T] | AsyncIterable[T],
+        check: Callable[[int, T], Awaitable[R]],
+        status_of: Callable[[R], RedditStatus],
+        username_of: Callable[[T], str],
+        concurrency: int = 1,
+        ordered: bool = False,
+        on_shadowbanned: Callable[[R], None] | None = None,
+    ) -> AsyncIterator[tuple[int, R]]:
+        """Run `check` over items with bounded concurrency, yielding each as it finishes.
+
+        The engine behind iter_check_accounts and tracker.check_profiles.
+        Items are consumed as the iterable yields them, through a bounded
+        queue, so a slow source (e.g. Dolphin paging) overlaps with checking
+        without being drained ahead of it. Every request still goes through
+        _get, so pacing, rate limits and the circuit breaker apply to each
+        worker as usual.
+
+        In batch lookup mode, items are queued BATCH_LOOKUP_SIZE at a time
+        after one prefetch_accounts call for them. In batch shadowban mode,
+        active results are held back until verify_shadowbans has run for
+        them (every BATCH_INFO_SIZE results, and once at the end), so no
+        provisional "active" status is ever yielded.
+
+        Args:
+            items: Accounts to check (e.g. usernames or Dolphin profiles)
+            check: Checks one item, given its input position
+            status_of: The RedditStatus inside a check's result
+            username_of: Reddit username of an item (for batched lookups)
+            concurrency: Items checked at once
+            ordered: Yield in input order (buffers results that finish early)
+            on_shadowbanned: Called for each held-back result found
+                shadowbanned, after its status has been set
+
+        Yields:
+            (input position, result) tuples, as completed (or in input order)
+
+        Raises:
+            Exception: The first one raised by `check`, `items` or a batched
+                lookup (remaining checks are cancelled)
+        """
+        concurrency = max(1, concurrency)
+        queue: asyncio.Queue[tuple[int, T] | None] = asyncio.Queue(maxsize=concurrency * 2)
+        # Finished checks; None once every worker is done
+        done: asyncio.Queue[tuple[int, R] | BaseException | None] = asyncio.Queue()
+        chunk_size = BATCH_LOOKUP_SIZE if self.batch_lookup else 1
+
+        async def producer() -> None:
+            index = 0
+            chunk: list[T] = []
+
+            async def enqueue() -> None:
+                nonlocal index, chunk
+                batch, chunk = chunk, []
+                if self.batch_lookup:
+                    await self.prefetch_accounts([username_of(item) for item in batch])
+                for item in batch:
+                    await queue.put((index, item))
+                    index += 1
+
+            if isinstance(items, AsyncIterable):
+                async for item in items:
+                    chunk.append(item)
+                    if len(chunk) >= chunk_size:
+                        await enqueue()
+            else:
+                for item in items:
+                    chunk.append(item)
+                    if len(chunk) >= chunk_size:
+                        await enqueue()
+            if chunk:
+                await enqueue()
+            for _ in range(concurrency):
+                await queue.put(None)
+
+        async def worker() -> None:
+            while True:
+                entry = await queue.get()
+                if entry is None:
+                    return
+                index, item = entry
+                await done.put((index, await check(index, item)))
+
+        async def run(checks: list[asyncio.Task]) -> None:
+            try:
+                await asyncio.gather(*checks)
+            except Exception as e:
+                await done.put(e)
+                return
+            await done.put(None)
+
+        tasks = [asyncio.create_task(producer())]
+        tasks += [asyncio.create_task(worker()) for _ in range(concurrency)]
+        tasks.append(asyncio.create_task(run(list(tasks))))
+        unverified: dict[int, R] = {}
+        buffered: dict[int, R] = {}
+        next_index = 0
+        try:
+            while True:
+                entry = await done.get()
+                if isinstance(entry, BaseException):
+                    raise entry
+                finished = entry is None
+
+                ready: list[tuple[int, R]] = []
+                if not finished:
+                    index, result = entry
+                    if self.batch_shadowban and status_of(result).status == "active":
+                        unverified[index] = result
+                    else:
+                        ready.append(entry)
+                if unverified and (len(unverified) >= BATCH_INFO_SIZE or finished):
+                    shadowbanned = await self.verify_shadowbans(
+                        [status_of(held).username for held in unverified.values()]
+                    )
+                    for held in unverified.values():
+                        if status_of(held).username in shadowbanned:
+                            status_of(held).status = "shadowbanned"
+                            if on_shadowbanned:
+                                on_shadowbanned(held)
+                    ready.extend(unverified.items())
+                    unverified = {}
+
+                for index, result in ready:
+                    if not ordered:
+                        yield index, result
+                        continue
+
+                    buffered[index] = result
+                    while next_index in buffered:
+                        yield next_index, buffered.pop(next_index)
+                        next_index += 1
+
+                if finished:
+                    return
+        finally:
+            # Consumer stopped early or a check failed - stop the rest
+            for task in tasks:
+                task.cancel()
+
+    async def iter_check_accounts(
+        self,
+        usernames: Iterable[str] | AsyncIterable[str],
+        proxy_urls: dict[str, str | None] | None = None,
+        concurrency: int = 1,
+        ordered: bool = False,
+    ) -> AsyncIterator[RedditStatus]:
+        """Check accounts with bounded concurrency, yielding each as it finishes.
 
-    async def get_activity_counts(self, username: str) -> ActivityCounts:
+        Runs check_account for each username on iter_checks, so batched
+        lookups and batch shadowban hold-back work as in tracker runs.
+
+        Args:
+            usernames: Reddit usernames to check
+            proxy_urls: Username -> profile proxy to route its checks through
+            concurrency: Accounts checked at once
+            ordered: Yield in input order (buffers results that finish early)
+
+        Yields:
+            RedditStatus per username, as completed (or in input order)
+        """
+        proxy_urls = proxy_urls or {}
+
+        async def check(index: int, username: str) -> RedditStatus:
+            proxy_url = proxy_urls.get(username)
+            try:
+                status = await self.check_account(username, proxy_url)
+                if self.batch_shadowban and status.status == "active":
+                    await self._record_newest_post(self._client_for(proxy_url), username)
+            finally:
+                self.release_account(username)
+            return status
+
+        async for _, status in self.iter_checks(
+            usernames,
+            check,
+            status_of=lambda status: status,
+            username_of=lambda username: username,
+            concurrency=concurrency,
+            ordered=ordered,
+        ):
+            yield status
+
+    async def check_accounts(
+        self,
+        usernames: list[str],
+        proxy_urls: dict[str, str | None] | None = None,
+        concurrency: int = 1,
+    ) -> list[RedditStatus]:
+        """Check multiple Reddit accounts.
+
+        Returns list of RedditStatus in same order as input. Tracker runs use
+        tracker.check_profiles instead, which also fetches activity and proxy
+        health for each profile.
+        """
+        return [
+            status
+            async for status in self.iter_check_accounts(
+                usernames, proxy_urls=proxy_urls, concurrency=concurrency, ordered=True
+            )
+        ]
+
+    async def _record_newest_post(self, client: httpx.AsyncClient, username: str) -> None:
+        """Remember the account's newest post for verify_shadowbans.
+
+        Uses _newest_post, so the post is found however old it is (the
+        first overview page is usually already cached by the activity count).
+        """
+        try:
+            status_code, post = await self._newest_post(client, username)
+        except httpx.RequestError:
+            return  # Unverified - counts as not shadowbanned (conservative)
+        if status_code == 200 and post is not None and post.data.name:
+            self._latest_posts[username.lower()] = post.data.name
+
+    async def _count_overview(
+        self, client: httpx.AsyncClient, username: str, today_start: float
+    ) -> tuple[int, int]:
+        """Count today's comments and posts from overview.json.
+
+        Pages until an item older than today_start (or the end of the
+        listing), so counts stay exact for busy accounts while most
+        accounts need a single request.
+
+        Returns:
+            Tuple of (comments_today, posts_today)
+
+        Raises:
+            httpx.RequestError: On network errors
+        """
+        comments_today = 0
+        posts_today = 0
+        after = None
+
+        for _ in range(OVERVIEW_MAX_PAGES):
+            url = self._overview_url(username)
+            if after:
+                url += f"&after={after}"
+            status_code, data = await self._fetch_listing(client, url)
+            if status_code != 200:
+                # On 404/403/429 - keep counts so far (don't block)
+                break
+
+            for item in data.data.children:
+                if item.data.created_utc < today_start:
+                    # Newest first - everything after this is older too
+                    return comments_today, posts_today
+                if item.kind == "t1":
+                    comments_today += 1
+                elif item.kind == "t3":
+                    posts_today += 1
+
+            after = data.data.after
+            if not after:
+                break
+
+        return comments_today, posts_today
+
+    def _cached_listing(self, url: str) -> Listing | None:
+        """A listing already fetched successfully for this check (no request)."""
+        future = self._listings.get(_listing_username(url), {}).get(url)
+        if future is None or not future.done() or future.cancelled() or future.exception():
+            return None
+        status_code, data = future.result()
+        return data if status_code == 200 else None
+
+    async def _sync_listing(
+        self, client: httpx.AsyncClient, username: str, listing: str, since: float
+    ) -> None:
+        """Fetch a listing's new items into the activity ledger.
+
+        With a cursor, fetches the newest page (or reuses a submitted page
+        already fetched by check_shadowban) and keeps the items above the
+        cursor, so an idle account costs one request. Only when the cursor
+        is not on that page does it page with `before` from the cursor
+        towards the newest item; an empty result there, or a listing that
+        fits on the newest page without the cursor, means the cursor item
+        was deleted and hides new activity, so the listing is re-synced at
+        once from the page already fetched. Without a cursor (first run, or
+        stale cursor), pages with `after` back to `since`, like
+        _count_overview.
+
+        Raises:
+            httpx.RequestError: On network errors (ledger left unchanged)
+        """
+        ledger = self.activity_ledger
+        base = f"{self.api_base}/user/{username}/{listing}.json"
+        if listing == "submitted":
+            first_url = self._submitted_url(username)
+        elif listing == "overview":
+            first_url = f"{base}?limit={OVERVIEW_PAGE_SIZE}"
+        else:
+            first_url = f"{base}?limit=25"
+
+        cursor = ledger.cursor(username, listing)
+        children = []
+        # Newest page fetched for the cursor check, reused by a re-sync
+        newest = None
+        if cursor:
+            newest_url = first_url
+            newest = self._cached_listing(first_url)
+            if newest:
+                run_metrics.incr("reddit.cursor_cache_hit")
+            else:
+                newest_url = f"{base}?limit={OVERVIEW_PAGE_SIZE}"
+                status_code, newest = await self._fetch_listing(client, newest_url)
+                if status_code != 200:
+                    return
+            names = [c.data.name for c in newest.data.children]
+            if cursor in names:
+                children = newest.data.children[:names.index(cursor)]
+            elif newest.data.after:
+                # More new items than one page, or the cursor item is gone
+                before = cursor
+                for _ in range(OVERVIEW_MAX_PAGES):
+                    url = f"{base}?limit={OVERVIEW_PAGE_SIZE}&before={before}"
+                    status_code, data = await self._fetch_listing(client, url)
+                    if status_code != 200:
+                        return
+                    page = data.data.children
+                    children = page + children  # Newer pages come first
+                    if len(page) < OVERVIEW_PAGE_SIZE or not page[0].data.name:
+                        break
+                    before = page[0].data.name
+
+            if cursor not in names and not children:
+                # `before` a deleted or removed item is empty too
+                run_metrics.incr("reddit.cursor_lost")
+                cursor = None
+
+        if not cursor:
+            # A re-sync continues from the newest page instead of refetching it
+            page_url = newest_url if newest else first_url
+            url = page_url
+            for _ in range(OVERVIEW_MAX_PAGES):
+                if newest:
+                    data, newest = newest, None
+                else:
+                    status_code, data = await self._fetch_listing(client, url)
+                    if status_code != 200:
+                        return
+                page = data.data.children
+                children.extend(page)
+                after = data.data.after
+                if not after or not page or page[-1].data.created_utc < since:
+                    break
+                url = f"{page_url}&after={after}"
+
+        run_metrics.incr("reddit.cursor_new_items", len(children))
+        ledger.record(
+            username,
+            listing,
+            [(c.data.name, c.kind, c.data.created_utc) for c in children if c.data.created_utc > 0],
+            full_sync=cursor is None,
+        )
+
+    async def _ledger_activity(
+        self, client: httpx.AsyncClient, username: str, today_start: float
+    ) -> tuple[int, int]:
+        """Sync the account's listings and count today's items from the ledger.
+
+        A listing that fails to sync keeps its earlier ledger entries, so
+        counts degrade to "as of the last successful sync" instead of 0.
+
+        Returns:
+            Tuple of (comments_today, posts_today)
+        """
+        listings = (
+            ["overview"] if settings.reddit_activity_source == "overview"
+            else ["comments", "submitted"]
+        )
+        # Full syncs reach back far enough for both today and a 24h window
+        since = min(today_start, time.time() - 86400)
+        for listing in listings:
+            try:
+                await self._sync_listing(client, username, listing, since)
+            except httpx.RequestError:
+                # Network error - keep the ledger as is
+                pass
+
+        if self.batch_shadowban:
+            # Newest post, verified later by verify_shadowbans
+            fullname = self.activity_ledger.newest_post(username)
+            if fullname:
+                self._latest_posts[username.lower()] = fullname
+            else:
+                # No post among the items synced so far - look it up
+                await self._record_newest_post(client, username)
+
+        return self.activity_ledger.count(username, today_start)
+
+    async def get_activity_counts(
+        self, username: str, proxy_url: str | None = None
+    ) -> ActivityCounts:
         """Get today's activity counts for a Reddit account.
 
         Fetches recent comments and posts, counts those from today (UTC).
         Designed to be called AFTER check_account() confirms the account is active.
+        Uses overview.json when settings.reddit_activity_source is "overview",
+        and only fetches new items when settings.reddit_activity_cursors is set.
 
         Args:
             username: Reddit username to check
+            proxy_url: Profile proxy to route through (if proxy routing enabled)
 
         Returns:
             ActivityCounts with today's comment and post counts.
             Returns 0 counts on errors (account may be suspended/rate limited).
         """
-        if not self.client:
-            raise RuntimeError("Use async context manager")
+        client = self._client_for(proxy_url)
 
         today = datetime.now(tz=timezone.utc).date()
         fetched_at = datetime.now(tz=timezone.utc).isoformat()
@@ -212,16 +1185,47 @@ class RedditChecker:
         comments_today = 0
         posts_today = 0
 
+        if self.activity_cursors:
+            today_start = datetime.combine(today, datetime.min.time(), tzinfo=timezone.utc)
+            comments_today, posts_today = await self._ledger_activity(
+                client, username, today_start.timestamp()
+            )
+            return ActivityCounts(
+                username=username,
+                comments_today=comments_today,
+                posts_today=posts_today,
+                fetched_at=fetched_at,
+            )
+
+        if settings.reddit_activity_source == "overview":
+            today_start = datetime.combine(today, datetime.min.time(), tzinfo=timezone.utc)
+            try:
+                comments_today, posts_today = await self._count_overview(
+                    client, username, today_start.timestamp()
+                )
+            except httpx.RequestError:
+                # Network error - return 0 counts
+                pass
+
+            if self.batch_shadowban:
+                await self._record_newest_post(client, username)
+
+            return ActivityCounts(
+                username=username,
+                comments_today=comments_today,
+                posts_today=posts_today,
+                fetched_at=fetched_at,
+            )
+
         # Fetch recent comments
         try:
-            await self._random_delay()
-            comments_url = f"https://www.reddit.com/user/{username}/comments.json?limit=25"
-            comments_resp = await self.client.get(comments_url)
+            comments_url = f"{self.api_base}/user/{username}/comments.json?limit=25"
+            status_code, comments_data = await self._fetch_listing(client, comments_url)
 
-            if comments_resp.status_code == 200:
-                comments = comments_resp.json().get("data", {}).get("children", [])
+            if status_code == 200:
+                comments = comments_data.data.children
                 for c in comments:
-                    created_utc = c.get("data", {}).get("created_utc", 0)
+                    created_utc = c.data.created_utc
                     if created_utc > 0:
                         comment_date = datetime.fromtimestamp(
                             created_utc, tz=timezone.utc
@@ -234,16 +1238,21 @@ class RedditChecker:
             # Network error - return 0 counts
             pass
 
-        # Fetch recent submissions
+        # Fetch recent submissions (usually cached by check_shadowban)
         try:
-            await self._random_delay()
-            posts_url = f"https://www.reddit.com/user/{username}/submitted.json?limit=10"
-            posts_resp = await self.client.get(posts_url)
+            status_code, posts_data = await self._fetch_listing(
+                client, self._submitted_url(username)
+            )
 
-            if posts_resp.status_code == 200:
-                posts = posts_resp.json().get("data", {}).get("children", [])
+            if status_code == 200:
+                posts = posts_data.data.children
+                if self.batch_shadowban and posts:
+                    # Newest post, verified later by verify_shadowbans
+                    fullname = posts[0].data.name
+                    if fullname:
+                        self._latest_posts[username.lower()] = fullname
                 for p in posts:
-                    created_utc = p.get("data", {}).get("created_utc", 0)
+                    created_utc = p.data.created_utc
                     if created_utc > 0:
                         post_date = datetime.fromtimestamp(
                             created_utc, tz=timezone.utc
@@ -0,0 +1,89 @@
+"""
+Persisted Reddit username -> account fullname (t2_...) cache.
+
+Batched account lookups (/api/user_data_by_account_ids.json) take account
+fullnames, not usernames. Fullnames never change for an account, so they
+are learned once from about.json and kept on disk across runs. Shard
+worker processes share the file, so save() merges under a lock. The daemon
+saves from a worker thread: write() a snapshot() taken on the event loop.
+"""
+
+import json
+import logging
+from pathlib import Path
+
+from state import atomic_write_json, file_lock
+
+# Cache file location (tracker directory, next to the state files)
+REDDIT_IDS_FILE = Path(__file__).parent.parent / "reddit_ids.json"
+
+logger = logging.getLogger("tracker")
+
+
+class RedditIdCache:
+    """Username -> t2 fullname map (usernames are matched case-insensitively)."""
+
+    def __init__(self, path: Path = REDDIT_IDS_FILE):
+        self.path = path
+        self._ids: dict[str, str] = {}
+        self._learned: dict[str, str] = {}  # Not saved yet
+
+    def _read(self) -> dict[str, str]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            logger.warning(f"Failed to load Reddit ID cache: {e}")
+            return {}
+
+    def load(self) -> "RedditIdCache":
+        """Load the cache from disk (empty on missing or corrupt file)."""
+        self._ids = self._read()
+        return self
+
+    def snapshot(self) -> dict[str, str]:
+        """Copy the IDs learned since the last snapshot and mark them saved."""
+        learned = dict(self._learned)
+        self._learned.clear()
+        return learned
+
+    def restore(self, learned: dict[str, str]) -> None:
+        """Mark a snapshot's IDs unsaved again (after a failed save)."""
+        for key, fullname in learned.items():
+            self._learned.setdefault(key, fullname)
+
+    def save(self) -> None:
+        """Merge IDs learned since the last save into the file."""
+        learned = self.snapshot()
+        try:
+            self.write(learned)
+        except OSError:
+            self.restore(learned)
+            raise
+
+    def write(self, learned: dict[str, str]) -> None:
+        """Merge a snapshot() into the file (safe from a worker thread).
+
+        The file is re-read under a lock, so concurrent processes (shard
+        workers) never drop each other's entries.
+        """
+        if not learned:
+            return
+        with file_lock(self.path):
+            ids = self._read()
+            ids.update(learned)
+            atomic_write_json(self.path, ids)
+
+    def get(self, username: str) -> str | None:
+        return self._ids.get(username.lower())
+
+    def set(self, username: str, fullname: str) -> None:
+        """Remember an account's fullname (accepts bare IDs or t2_ fullnames)."""
+        if not fullname.startswith("t2_"):
+            fullname = f"t2_{fullname}"
+        key = username.lower()
+        if self._ids.get(key) != fullname:
+            self._ids[key] = fullname
+            self._learned[key] = fullname
@@ -0,0 +1,151 @@
+"""
+App-only OAuth tokens for Reddit (client_credentials grant).
+
+Authenticated requests go to oauth.reddit.com, which has a much higher
+rate limit than the anonymous www.reddit.com/*.json endpoints. Tokens are
+cached on disk and refreshed shortly before they expire, so runs don't
+request a new token every time. The token URL is configurable so a local
+stand-in can be used for testing.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from pathlib import Path
+
+import httpx
+
+from state import atomic_write_json
+
+# Token cache location (tracker directory, next to the state files)
+TOKEN_FILE = Path(__file__).parent.parent / "reddit_token.json"
+
+# Refresh tokens this long before they expire
+REFRESH_MARGIN_SECONDS = 300
+
+logger = logging.getLogger("tracker")
+
+
+class TokenManager:
+    """Fetch, cache and refresh an app-only Reddit OAuth token."""
+
+    def __init__(
+        self,
+        token_url: str,
+        client_id: str,
+        client_secret: str,
+        api_base: str = "",
+        path: Path = TOKEN_FILE,
+    ):
+        """
+        Args:
+            token_url: Token endpoint (client_credentials grant)
+            client_id: Reddit app client ID
+            client_secret: Reddit app secret
+            api_base: API the token is used against (part of the cache key)
+            path: Token cache file
+        """
+        self.token_url = token_url
+        self.api_base = api_base
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.path = path
+        self._token: str | None = None
+        self._expires_at = 0.0  # Unix time
+        self._lock = asyncio.Lock()
+        self._load()
+
+    def _cache_key(self) -> dict[str, str]:
+        # A token is only reused for the same app, token endpoint and API
+        return {
+            "client_id": self.client_id,
+            "token_url": self.token_url,
+            "api_base": self.api_base,
+        }
+
+    def _load(self) -> None:
+        """Load a cached token issued for this app and endpoint (if any)."""
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                cached = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            logger.warning(f"Failed to load Reddit token cache: {e}")
+            return
+
+        if all(cached.get(field) == value for field, value in self._cache_key().items()):
+            self._token = cached.get("access_token")
+            self._expires_at = float(cached.get("expires_at", 0))
+
+    def _valid(self) -> bool:
+        return bool(self._token) and time.time() < self._expires_at - REFRESH_MARGIN_SECONDS
+
+    async def get_token(self, client: httpx.AsyncClient) -> str:
+        """Return a valid access token, fetching a new one if needed.
+
+        Raises:
+            httpx.HTTPStatusError: If the token endpoint rejects the request
+            httpx.RequestError: On network errors, or a response without a
+                usable token (e.g. an HTML error page or {"error": ...})
+        """
+        if self._valid():
+            return self._token
+
+        # One refresh at a time; concurrent callers reuse its result
+        async with self._lock:
+            if self._valid():
+                return self._token
+
+            response = await client.post(
+                self.token_url,
+                auth=(self.client_id, self.client_secret),
+                data={"grant_type": "client_credentials"},
+            )
+            response.raise_for_status()
+            token, expires_in = _parse_token(response)
+
+            self._token = token
+            self._expires_at = time.time() + expires_in
+            logger.info("Fetched new Reddit OAuth token")
+
+            try:
+                atomic_write_json(self.path, {
+                    **self._cache_key(),
+                    "access_token": self._token,
+                    "expires_at": self._expires_at,
+                })
+            except OSError as e:
+                logger.warning(f"Failed to save Reddit token cache: {e}")
+
+            return self._token
+
+    def invalidate(self) -> None:
+        """Drop the current token (e.g. after a 401) so the next call refreshes."""
+        self._token = None
+        self._expires_at = 0.0
+
+
+def _parse_token(response: httpx.Response) -> tuple[str, float]:
+    """Read (access_token, expires_in seconds) from a token response.
+
+    Raises:
+        httpx.RequestError: If the body is not a token payload
+    """
+    try:
+        data = response.json()
+    except ValueError:
+        data = None
+    token = data.get("access_token") if isinstance(data, dict) else None
+    if not token or not isinstance(token, str):
+        error = data.get("error") if isinstance(data, dict) else "not JSON"
+        raise httpx.RequestError(
+            f"Reddit OAuth token response has no access_token ({error})",
+            request=response.request,
+        )
+    try:
+        expires_in = float(data.get("expires_in", 3600))
+    except (TypeError, ValueError):
+        expires_in = 3600.0
+    return token, expires_in
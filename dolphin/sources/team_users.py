@@ -0,0 +1,96 @@
+"""
+TTL cache for Dolphin team users.
+
+Every profile fetch needs the team user list (for the users[i] filter and
+the owner lookup), and it rarely changes. team_users_cache is shared by
+every DolphinClient in the process and persisted to team_users.json, so
+tool startups skip the /team/users round-trip for
+DOLPHIN_TEAM_USERS_TTL seconds. Entries are scoped to the API URL and a
+fingerprint of the API key, so switching teams never serves stale users.
+
+A user added to the team is only seen once the TTL expires or the cache
+is invalidated (DolphinClient.invalidate_team_users).
+"""
+
+import hashlib
+import json
+import logging
+import time
+from pathlib import Path
+
+from state import atomic_write_json
+
+# Cache location (tracker directory, next to the state files)
+TEAM_USERS_FILE = Path(__file__).parent.parent / "team_users.json"
+
+logger = logging.getLogger("tracker")
+
+
+def team_key(api_url: str, api_key: str) -> str:
+    """Cache scope for one Dolphin team (the API key itself is never stored)."""
+    fingerprint = hashlib.sha256(api_key.encode()).hexdigest()[:16]
+    return f"{api_url.rstrip('/')}#{fingerprint}"
+
+
+class TeamUsersCache:
+    """Team users with fetch time, in memory and on disk."""
+
+    def __init__(self, path: Path = TEAM_USERS_FILE):
+        self.path = path
+        self._key: str | None = None
+        self._users: list[dict] | None = None
+        self._fetched_at = 0.0  # Unix time
+        self._loaded = False
+
+    def _load(self) -> None:
+        self._loaded = True
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                cached = json.load(f)
+            self._key = cached["key"]
+            self._users = cached["users"]
+            self._fetched_at = float(cached["fetched_at"])
+        except (json.JSONDecodeError, IOError, KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Failed to load team users cache: {e}")
+
+    def get(self, key: str, ttl: float) -> list[dict] | None:
+        """Cached users for a team, or None if missing or older than `ttl` seconds."""
+        if not self._loaded:
+            self._load()
+        if self._users is None or self._key != key:
+            return None
+        if time.time() - self._fetched_at >= ttl:
+            return None
+        return list(self._users)
+
+    def set(self, key: str, users: list[dict]) -> None:
+        """Store freshly fetched users (in memory, and on disk if possible)."""
+        self._loaded = True
+        self._key = key
+        self._users = list(users)
+        self._fetched_at = time.time()
+        try:
+            atomic_write_json(self.path, {
+                "key": key,
+                "fetched_at": self._fetched_at,
+                "users": self._users,
+            })
+        except OSError as e:
+            logger.warning(f"Failed to save team users cache: {e}")
+
+    def invalidate(self) -> None:
+        """Drop cached users so the next lookup fetches them again."""
+        self._loaded = True
+        self._key = None
+        self._users = None
+        self._fetched_at = 0.0
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+# Shared by every DolphinClient in the process
+team_users_cache = TeamUsersCache()
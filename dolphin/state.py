@@ -5,14 +5,16 @@ Tracks account statuses and proxy health to detect new problems
 (bans, suspensions, proxy failures) that require alerts.
 """
 
+import fcntl
 import json
 import logging
 import os
 import tempfile
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
 
-from models import AccountResult
+from models import AccountResult, DolphinProfile
 
 # State file location (same directory as this module)
 STATE_FILE = Path(__file__).parent / "last_run_state.json"
@@ -20,17 +22,59 @@ STATE_FILE = Path(__file__).parent / "last_run_state.json"
 logger = logging.getLogger("tracker")
 
 
+@contextmanager
+def file_lock(path: Path):
+    """
+    Hold an exclusive lock for read-merge-write updates of `path`.
+
+    Serializes writers across processes (e.g. --workers shard processes)
+    via a sidecar .lock file, so `path` itself can still be replaced
+    atomically.
+    """
+    with open(path.with_name(f".{path.name}.lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def atomic_write_json(path: Path, data) -> None:
+    """
+    Write JSON atomically so readers never see a partial file.
+
+    Uses temp file + rename pattern for POSIX atomic write.
+    """
+    # Atomic write: temp file in same directory, then rename
+    temp_fd, temp_path = tempfile.mkstemp(
+        dir=path.parent,
+        prefix=f".{path.stem}_",
+        suffix=".tmp"
+    )
+    try:
+        with os.fdopen(temp_fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.rename(temp_path, path)
+    except Exception:
+        # Clean up temp file on failure
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
 def load_state() -> dict:
     """
     Load state from previous tracker run.
 
     Returns:
-        dict with 'accounts', 'account_history', 'proxies', and 'run_at' keys.
+        dict with 'accounts', 'account_history', 'proxies', 'schedule', and 'run_at' keys.
         Returns empty state structure if file missing or corrupt.
     """
     if not STATE_FILE.exists():
         logger.debug("No previous state file found, starting fresh")
-        return {"accounts": {}, "account_history": {}, "proxies": {}, "run_at": None}
+        return {"accounts": {}, "account_history": {}, "proxies": {}, "schedule": {}, "run_at": None}
 
     try:
         with open(STATE_FILE, encoding="utf-8") as f:
@@ -42,20 +86,20 @@ def load_state() -> dict:
             state["account_history"] = {}
         if not isinstance(state.get("proxies"), dict):
             state["proxies"] = {}
+        if not isinstance(state.get("schedule"), dict):
+            state["schedule"] = {}
         return state
     except (json.JSONDecodeError, IOError) as e:
         logger.warning(f"Failed to load state file, starting fresh: {e}")
-        return {"accounts": {}, "account_history": {}, "proxies": {}, "run_at": None}
+        return {"accounts": {}, "account_history": {}, "proxies": {}, "schedule": {}, "run_at": None}
 
 
 def save_state(state: dict) -> None:
     """
     Atomically save state to prevent corruption.
 
-    Uses temp file + rename pattern for POSIX atomic write.
-
     Args:
-        state: dict with 'accounts', 'account_history', 'proxies', and 'run_at' keys.
+        state: dict with 'accounts', 'account_history', 'proxies', 'schedule', and 'run_at' keys.
     """
     # Ensure state has required structure
     if "accounts" not in state:
@@ -64,27 +108,13 @@ def save_state(state: dict) -> None:
         state["account_history"] = {}
     if "proxies" not in state:
         state["proxies"] = {}
+    if "schedule" not in state:
+        state["schedule"] = {}
     if "run_at" not in state:
         state["run_at"] = datetime.now(tz=timezone.utc).isoformat()
 
-    # Atomic write: temp file in same directory, then rename
-    temp_fd, temp_path = tempfile.mkstemp(
-        dir=STATE_FILE.parent,
-        prefix=".state_",
-        suffix=".tmp"
-    )
-    try:
-        with os.fdopen(temp_fd, "w", encoding="utf-8") as f:
-            json.dump(state, f, indent=2)
-        os.rename(temp_path, STATE_FILE)
-        logger.debug(f"State saved to {STATE_FILE}")
-    except Exception:
-        # Clean up temp file on failure
-        try:
-            os.unlink(temp_path)
-        except OSError:
-            pass
-        raise
+    atomic_write_json(STATE_FILE, state)
+    logger.debug(f"State saved to {STATE_FILE}")
 
 
 def build_current_state(results: list[AccountResult]) -> dict:
@@ -117,6 +147,37 @@ def build_current_state(results: list[AccountResult]) -> dict:
     }
 
 
+def carry_forward_unchecked(
+    current: dict,
+    previous: dict,
+    unchecked: list[DolphinProfile],
+) -> dict:
+    """
+    Keep last known status for profiles skipped this run (not due yet).
+
+    Without this, skipped accounts would drop out of the saved state and a
+    later ban would not be detected as a transition.
+
+    Args:
+        current: State built from this run's results.
+        previous: State from previous run.
+        unchecked: Profiles that were still in Dolphin but not checked.
+
+    Returns:
+        The current state dict, updated in place.
+    """
+    prev_accounts = previous.get("accounts", {})
+    prev_proxies = previous.get("proxies", {})
+
+    for profile in unchecked:
+        if profile.name in prev_accounts and profile.name not in current["accounts"]:
+            current["accounts"][profile.name] = prev_accounts[profile.name]
+        if profile.proxy in prev_proxies and profile.proxy not in current["proxies"]:
+            current["proxies"][profile.proxy] = prev_proxies[profile.proxy]
+
+    return current
+
+
 def detect_changes(previous: dict, current: dict) -> dict:
     """
     Detect new problems between runs.
@@ -129,9 +190,11 @@ def detect_changes(previous: dict, current: dict) -> dict:
         dict with:
           - 'new_bans': list of usernames that went active -> suspended/not_found
           - 'new_proxy_failures': list of proxy URLs that went pass -> fail/blocked
+          - 'changed_accounts': list of usernames whose status changed at all
     """
     new_bans = []
     new_proxy_failures = []
+    changed_accounts = []
 
     prev_accounts = previous.get("accounts", {})
     curr_accounts = current.get("accounts", {})
@@ -142,6 +205,8 @@ def detect_changes(previous: dict, current: dict) -> dict:
     # Detect accounts that changed from active to banned states
     for username, status in curr_accounts.items():
         prev_status = prev_accounts.get(username)
+        if prev_status is not None and prev_status != status:
+            changed_accounts.append(username)
         # Only alert if previously active (or shadowbanned) and now suspended/not_found
         if prev_status in ("active", "shadowbanned") and status in ("suspended", "not_found"):
             new_bans.append(username)
@@ -156,6 +221,7 @@ def detect_changes(previous: dict, current: dict) -> dict:
     return {
         "new_bans": new_bans,
         "new_proxy_failures": new_proxy_failures,
+        "changed_accounts": changed_accounts,
     }
 
 
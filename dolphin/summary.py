@@ -0,0 +1,147 @@
+"""
+Single-pass run summary aggregation.
+
+RunSummary keeps every count the run summaries need (category, owner,
+status, warmup tier, limit status, karma, activity, proxy failures and
+warmup warnings) and updates them as each result arrives, so the logs,
+the sheet summary row and the warmup alerts read one aggregate instead of
+re-scanning the results. Results are keyed by profile ID: adding a newer
+result for a profile replaces its previous contribution, which keeps the
+daemon's rolling numbers current mid-cycle.
+"""
+
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+
+from enrichment import get_derived
+from models import AccountResult
+
+
+@dataclass
+class _Contribution:
+    """What one result added to the totals (so it can be taken back out)."""
+
+    category: str
+    owner: str
+    status: str
+    total_karma: int
+    karma_change: int
+    proxy_failed: bool
+    tier: str | None = None  # Set when the result has activity data
+    limit_status: str | None = None  # Set when activity and tier limits exist
+    comments: int = 0
+    posts: int = 0
+    warnings: list[dict] = field(default_factory=list)
+
+
+def _bump(counter: Counter, key: str, sign: int) -> None:
+    """Add sign to counter[key], dropping keys that reach zero."""
+    counter[key] += sign
+    if counter[key] == 0:
+        del counter[key]
+
+
+class RunSummary:
+    """Incrementally maintained aggregate over the latest result per profile."""
+
+    def __init__(
+        self,
+        results: list[AccountResult] | None = None,
+        fleet_size: int | None = None,
+    ):
+        """
+        Args:
+            results: Results to count
+            fleet_size: Profiles in the whole fleet, when results cover only
+                the accounts checked this run (adaptive schedule)
+        """
+        self.fleet_size = fleet_size
+        self._contributions: dict[str, _Contribution] = {}
+        self.categories: Counter = Counter()
+        self.statuses: Counter = Counter()
+        self.warmup_tiers: Counter = Counter()
+        self.limit_statuses: Counter = Counter()
+        self.owner_categories: dict[str, Counter] = defaultdict(Counter)
+        self.owner_karma: Counter = Counter()
+        self.total_karma = 0
+        self.total_delta = 0
+        self.total_comments = 0
+        self.total_posts = 0
+        self.proxy_failures = 0
+
+        for result in results or []:
+            self.add(result)
+
+    def __len__(self) -> int:
+        return len(self._contributions)
+
+    def add(self, result: AccountResult) -> None:
+        """Count a result, replacing any earlier result for the same profile."""
+        profile_id = str(result.profile.id)
+        self.discard(profile_id)
+
+        derived = get_derived(result)
+        contribution = _Contribution(
+            category=result.category,
+            owner=result.profile.owner,
+            status=result.reddit.status,
+            total_karma=result.reddit.total_karma or 0,
+            karma_change=result.karma_change or 0,
+            proxy_failed=bool(result.proxy_health and result.proxy_health.status != "pass"),
+        )
+        if result.activity:
+            contribution.tier = derived.tier
+            contribution.comments = result.activity.comments_today
+            contribution.posts = result.activity.posts_today
+            if derived.limits:
+                contribution.limit_status = derived.limit_status
+            if result.reddit.status == "active":
+                contribution.warnings = [
+                    {"username": result.profile.name, "message": warning}
+                    for warning in derived.warmup_warnings
+                ]
+
+        self._apply(contribution, 1)
+        self._contributions[profile_id] = contribution
+
+    def discard(self, profile_id: str) -> None:
+        """Remove a profile's result from the totals (no-op if absent)."""
+        contribution = self._contributions.pop(str(profile_id), None)
+        if contribution:
+            self._apply(contribution, -1)
+
+    @property
+    def partial(self) -> bool:
+        """True if this summary covers only part of the fleet."""
+        return self.fleet_size is not None and len(self) < self.fleet_size
+
+    def profile_ids(self) -> set[str]:
+        """Profile IDs currently counted."""
+        return set(self._contributions)
+
+    def _apply(self, c: _Contribution, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) one result's contribution."""
+        _bump(self.categories, c.category, sign)
+        _bump(self.statuses, c.status, sign)
+        _bump(self.owner_categories[c.owner], c.category, sign)
+        if not self.owner_categories[c.owner]:
+            del self.owner_categories[c.owner]
+        self.owner_karma[c.owner] += sign * c.total_karma
+        if c.owner not in self.owner_categories:
+            self.owner_karma.pop(c.owner, None)
+
+        self.total_karma += sign * c.total_karma
+        self.total_delta += sign * c.karma_change
+        self.total_comments += sign * c.comments
+        self.total_posts += sign * c.posts
+        self.proxy_failures += sign * int(c.proxy_failed)
+
+        if c.tier is not None:
+            _bump(self.warmup_tiers, c.tier, sign)
+        if c.limit_status is not None:
+            _bump(self.limit_statuses, c.limit_status, sign)
+
+    @property
+    def warmup_warnings(self) -> list[dict]:
+        """Warmup threshold warnings ({'username', 'message'}) for active accounts."""
+        return [w for c in self._contributions.values() for w in c.warnings]
@@ -0,0 +1,59 @@
+"""
+Shared test setup.
+
+Modules import each other top-level (from config import settings), so the
+tracker directory goes on sys.path. Settings require DOLPHIN_API_KEY; a
+dummy key keeps tests independent of a local .env.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault("DOLPHIN_API_KEY", "test-key")
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from models import AccountResult, ActivityCounts, DolphinProfile, ProxyHealth, RedditStatus
+
+
+@pytest.fixture
+def make_result():
+    """Factory for AccountResults (age in days, activity as (comments, posts))."""
+
+    def make(
+        name: str = "alice",
+        status: str = "active",
+        age_days: float = 60,
+        karma: int = 100,
+        karma_change: int = 0,
+        activity: tuple[int, int] | None = None,
+        owner: str = "owner",
+        category: str = "Active",
+        proxy_status: str = "pass",
+        profile_id: str | None = None,
+    ) -> AccountResult:
+        return AccountResult(
+            profile=DolphinProfile(
+                id=profile_id or name,
+                name=name,
+                owner=owner,
+                notes="",
+                created_at="",
+                updated_at="",
+            ),
+            reddit=RedditStatus(
+                username=name,
+                status=status,
+                total_karma=karma,
+                created_utc=time.time() - age_days * 86400 if age_days else 0,
+            ),
+            category=category,
+            karma_change=karma_change,
+            proxy_health=ProxyHealth(status=proxy_status),
+            activity=ActivityCounts(name, *activity) if activity else None,
+        )
+
+    return make
@@ -0,0 +1,109 @@
+import json
+import time
+
+from sources.activity_ledger import (
+    CURSOR_RESYNC_HOURS,
+    LEDGER_RETENTION_DAYS,
+    ActivityLedger,
+)
+
+
+def item(fullname: str, kind: str = "t1", age: float = 60) -> tuple[str, str, float]:
+    return fullname, kind, time.time() - age
+
+
+def test_snapshot_is_isolated_from_later_records(tmp_path):
+    ledger = ActivityLedger(tmp_path / "ledger.json")
+    ledger.record("Alice", "comments", [item("t1_b"), item("t1_a")])
+
+    snapshot = ledger.snapshot()
+    # Checks keep recording while the snapshot is saved from a thread
+    ledger.record("alice", "comments", [item("t1_c")])
+    ledger.record("bob", "comments", [item("t1_x")])
+    ledger.write(snapshot)
+
+    stored = json.loads(ledger.path.read_text())
+    assert set(stored) == {"alice"}
+    assert set(stored["alice"]["items"]) == {"t1_a", "t1_b"}
+    assert stored["alice"]["cursors"]["comments"] == "t1_b"
+
+    # Records made during the write are saved next time, not lost
+    ledger.save()
+    stored = json.loads(ledger.path.read_text())
+    assert set(stored) == {"alice", "bob"}
+    assert set(stored["alice"]["items"]) == {"t1_a", "t1_b", "t1_c"}
+    assert ledger.rolling_counts("alice") == (3, 0)
+
+
+def test_restore_marks_snapshot_unsaved(tmp_path):
+    ledger = ActivityLedger(tmp_path / "ledger.json")
+    ledger.record("alice", "comments", [item("t1_a")])
+
+    ledger.restore(ledger.snapshot())
+    ledger.save()
+
+    assert "alice" in json.loads(ledger.path.read_text())
+
+
+def test_shard_saves_merge_instead_of_overwriting(tmp_path):
+    path = tmp_path / "ledger.json"
+    first, second = ActivityLedger(path).load(), ActivityLedger(path).load()
+    first.record("alice", "comments", [item("t1_a")])
+    second.record("bob", "comments", [item("t1_b")])
+
+    first.save()
+    second.save()
+
+    merged = ActivityLedger(path).load()
+    assert merged.cursor("alice", "comments") == "t1_a"
+    assert merged.cursor("bob", "comments") == "t1_b"
+
+
+def test_merge_unions_items_and_keeps_the_latest_cursor(tmp_path):
+    path = tmp_path / "ledger.json"
+    stale = ActivityLedger(path).load()
+    stale.record("alice", "comments", [item("t1_a", age=120)])
+    stale.record("alice", "submitted", [item("t3_zz", kind="t3", age=120)])
+    fresh = ActivityLedger(path).load()
+    fresh.record("alice", "comments", [item("t1_b")])
+    fresh.record("alice", "submitted", [item("t3_aa", kind="t3")])
+
+    fresh.save()
+    stale._accounts["alice"]["synced_at"]["comments"] -= 60  # Synced earlier
+    stale.save()
+
+    merged = ActivityLedger(path).load()
+    assert merged.cursor("alice", "comments") == "t1_b"
+    assert merged.rolling_counts("alice") == (2, 2)
+    # Newest post by fullname order, whichever process saw it
+    assert merged.newest_post("alice") == "t3_zz"
+
+
+def test_stale_cursor_forces_a_full_fetch(tmp_path):
+    ledger = ActivityLedger(tmp_path / "ledger.json")
+    ledger.record("alice", "comments", [item("t1_a")])
+    ledger._accounts["alice"]["synced_at"]["comments"] -= CURSOR_RESYNC_HOURS * 3600 + 1
+
+    assert ledger.cursor("alice", "comments") is None
+
+
+def test_empty_page_keeps_the_sync_time(tmp_path):
+    ledger = ActivityLedger(tmp_path / "ledger.json")
+    ledger.record("alice", "comments", [item("t1_a")])
+    synced_at = ledger._accounts["alice"]["synced_at"]["comments"]
+
+    ledger.record("alice", "comments", [])
+    assert ledger._accounts["alice"]["synced_at"]["comments"] == synced_at
+
+    # A full fetch of an empty listing drops the cursor
+    ledger.record("alice", "comments", [], full_sync=True)
+    assert ledger.cursor("alice", "comments") is None
+
+
+def test_items_past_retention_are_pruned(tmp_path):
+    ledger = ActivityLedger(tmp_path / "ledger.json")
+    old = LEDGER_RETENTION_DAYS * 86400 + 60
+    ledger.record("alice", "comments", [item("t1_new"), item("t1_old", age=old)])
+
+    assert set(ledger._accounts["alice"]["items"]) == {"t1_new"}
+    assert ledger.count("alice", since=0) == (1, 0)
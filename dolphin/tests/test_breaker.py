@@ -0,0 +1,108 @@
+import asyncio
+import time
+
+import pytest
+
+from sources import breaker as breaker_module
+from sources.breaker import CircuitBreaker
+
+
+def expire(breaker: CircuitBreaker) -> None:
+    """Skip the rest of the cooldown."""
+    breaker.open_until = time.monotonic() - 1
+
+
+def test_opens_after_threshold_consecutive_failures():
+    breaker = CircuitBreaker("direct", threshold=3, cooldown=60)
+
+    breaker.record_failure(False)
+    breaker.record_failure(False)
+    breaker.record_success(False)  # Resets the streak
+    breaker.record_failure(False)
+    breaker.record_failure(False)
+    assert breaker.state == "closed"
+
+    breaker.record_failure(False)
+    assert breaker.state == "open"
+    assert breaker.open_until - time.monotonic() == pytest.approx(60, abs=1)
+
+
+def test_retry_after_extends_the_cooldown():
+    breaker = CircuitBreaker("direct", threshold=1, cooldown=60)
+
+    breaker.record_failure(False, retry_after=300)
+
+    assert breaker.open_until - time.monotonic() == pytest.approx(300, abs=1)
+
+
+def test_stragglers_do_not_extend_an_open_breaker():
+    breaker = CircuitBreaker("direct", threshold=1, cooldown=60)
+    breaker.record_failure(False)
+    open_until = breaker.open_until
+
+    breaker.record_failure(False, retry_after=600)
+
+    assert breaker.open_until == open_until
+
+
+def test_disabled_breaker_never_opens():
+    breaker = CircuitBreaker("direct", threshold=0, cooldown=60)
+    for _ in range(10):
+        breaker.record_failure(False)
+
+    assert breaker.state == "closed"
+    assert asyncio.run(breaker.before_request()) is False
+
+
+def test_single_probe_closes_on_success():
+    breaker = CircuitBreaker("direct", threshold=1, cooldown=60)
+    breaker.record_failure(False)
+    expire(breaker)
+
+    assert asyncio.run(breaker.before_request()) is True
+    assert breaker.state == "half_open"
+
+    breaker.record_success(True)
+    assert breaker.state == "closed"
+    assert asyncio.run(breaker.before_request()) is False
+
+
+def test_failed_probe_reopens_with_doubled_cooldown():
+    breaker = CircuitBreaker("direct", threshold=1, cooldown=60)
+    breaker.record_failure(False)
+    expire(breaker)
+    assert asyncio.run(breaker.before_request()) is True
+
+    breaker.record_failure(True)
+
+    assert breaker.state == "open"
+    assert breaker.open_until - time.monotonic() == pytest.approx(120, abs=1)
+
+
+def test_other_workers_wait_for_the_probe(monkeypatch):
+    monkeypatch.setattr(breaker_module, "PROBE_POLL_SECONDS", 0.01)
+    breaker = CircuitBreaker("direct", threshold=1, cooldown=60)
+    breaker.record_failure(False)
+    expire(breaker)
+
+    async def run() -> list[bool]:
+        probe = await breaker.before_request()
+        waiter = asyncio.create_task(breaker.before_request())
+        await asyncio.sleep(0.05)
+        assert not waiter.done()  # Held while the probe is in flight
+
+        breaker.record_success(probe)
+        return [probe, await waiter]
+
+    assert asyncio.run(run()) == [True, False]
+
+
+def test_abandoned_probe_frees_the_slot():
+    breaker = CircuitBreaker("direct", threshold=1, cooldown=60)
+    breaker.record_failure(False)
+    expire(breaker)
+    assert asyncio.run(breaker.before_request()) is True
+
+    breaker.abandon(True)
+
+    assert asyncio.run(breaker.before_request()) is True
@@ -0,0 +1,49 @@
+import asyncio
+import json
+
+import httpx
+
+from sources.reddit import RedditChecker
+
+
+def check(body: bytes, status_code: int = 200):
+    """check_account against one canned about.json response."""
+    # Batch shadowban mode - no follow-up shadowban requests
+    reddit = RedditChecker(use_profile_proxies=False, batch_shadowban=True)
+    reddit.client = object()  # No requests are sent
+
+    async def get(client, url):
+        return httpx.Response(status_code, content=body)
+
+    reddit._get = get
+    return asyncio.run(reddit.check_account("alice"))
+
+
+def about(**data) -> bytes:
+    return json.dumps({"kind": "t2", "data": data}).encode()
+
+
+def test_active_account():
+    status = check(about(id="t2_1", total_karma=30, comment_karma=20, link_karma=10, created_utc=1.5))
+
+    assert status.status == "active"
+    assert (status.total_karma, status.comment_karma, status.link_karma) == (30, 20, 10)
+    assert status.created_utc == 1.5
+
+
+def test_null_fields_read_as_zero():
+    status = check(
+        about(id=None, total_karma=None, comment_karma=None, link_karma=5, created_utc=None)
+    )
+
+    assert status.status == "active"
+    assert (status.total_karma, status.comment_karma, status.link_karma) == (5, 0, 5)
+    assert status.created_utc == 0
+
+
+def test_malformed_response_is_an_error_for_that_account_only():
+    for body in (b"<html>Too many requests</html>", about(comment_karma="lots")):
+        status = check(body)
+
+        assert status.status == "error"
+        assert "about.json" in status.error_message
@@ -0,0 +1,100 @@
+import asyncio
+
+import tracker
+from models import DolphinProfile
+from sources.reddit import RedditChecker
+
+COUNT = 20
+
+
+class FakeReddit(RedditChecker):
+    """RedditChecker without a client or cache files; shadowbans user3."""
+
+    def __init__(self):
+        super().__init__(use_profile_proxies=False, batch_lookup=False, batch_shadowban=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def verify_shadowbans(self, usernames):
+        return {"user3"} & set(usernames)
+
+
+def make_profile(index: int) -> DolphinProfile:
+    return DolphinProfile(
+        id=str(index),
+        name=f"user{index}",
+        owner="owner",
+        notes="",
+        created_at="",
+        updated_at="",
+    )
+
+
+def run(monkeypatch, make_result, concurrency: int, reddit=FakeReddit):
+    """Check COUNT profiles; return (results, reported, max profiles ahead of checks)."""
+    yielded = 0
+    started = 0
+    max_ahead = 0
+
+    async def profiles():
+        nonlocal yielded, max_ahead
+        for i in range(COUNT):
+            yielded += 1
+            max_ahead = max(max_ahead, yielded - started)
+            yield make_profile(i)
+
+    async def check_profile(reddit, proxy_checker, profile, history, position):
+        nonlocal started
+        started += 1
+        # Earlier profiles take longer, so workers finish out of order
+        await asyncio.sleep(0.001 * (COUNT - int(profile.id)))
+        return make_result(name=profile.name)
+
+    monkeypatch.setattr(tracker, "RedditChecker", reddit)
+    monkeypatch.setattr(tracker, "check_profile", check_profile)
+
+    reported = []
+    results = asyncio.run(
+        tracker.check_profiles(
+            profiles(), {}, concurrency=concurrency, on_result=reported.append
+        )
+    )
+    return results, reported, max_ahead
+
+
+def test_results_are_returned_in_yield_order(monkeypatch, make_result):
+    results, reported, _ = run(monkeypatch, make_result, concurrency=4)
+
+    names = [f"user{i}" for i in range(COUNT)]
+    assert [r.profile.name for r in results] == names
+    # on_result sees every profile once, in completion order
+    assert sorted(r.profile.name for r in reported) == sorted(names)
+    assert [r.profile.name for r in reported] != names
+
+
+def test_profiles_are_consumed_with_backpressure(monkeypatch, make_result):
+    concurrency = 2
+    results, _, max_ahead = run(monkeypatch, make_result, concurrency)
+
+    assert len(results) == COUNT
+    # Queued (2x concurrency), plus one waiting to be queued and one being yielded
+    assert max_ahead <= concurrency * 2 + 2
+    assert max_ahead < COUNT
+
+
+def test_batch_shadowban_results_are_final_when_reported(monkeypatch, make_result):
+    class BatchShadowbanReddit(FakeReddit):
+        def __init__(self):
+            super().__init__()
+            self.batch_shadowban = True
+
+    results, reported, _ = run(monkeypatch, make_result, 4, reddit=BatchShadowbanReddit)
+
+    banned = [r for r in results if r.reddit.status == "shadowbanned"]
+    assert [r.profile.name for r in banned] == ["user3"]
+    assert banned[0].category == tracker.categorize_account("", "shadowbanned")
+    assert {r.profile.name: r.reddit.status for r in reported}["user3"] == "shadowbanned"
@@ -0,0 +1,67 @@
+import asyncio
+
+from config import settings
+from sources.decoders import ProfilePage, ProfileRecord
+from sources.dolphin import PAGE_SIZE, DolphinClient
+
+LAST_PAGE = 50
+
+
+def make_client() -> tuple[DolphinClient, list[int]]:
+    dolphin = DolphinClient(use_cache=False)
+    fetched: list[int] = []
+
+    async def page_params():
+        return {"limit": PAGE_SIZE}, {}
+
+    async def get_page(params, page):
+        fetched.append(page)
+        await asyncio.sleep(0)
+        count = PAGE_SIZE if page <= LAST_PAGE else 0
+        records = [
+            ProfileRecord(id=f"{page}-{i}", name=f"user{page}_{i}") for i in range(count)
+        ]
+        return ProfilePage(data=records, last_page=LAST_PAGE)
+
+    dolphin._page_params = page_params
+    dolphin._get_page = get_page
+    return dolphin, fetched
+
+
+def test_pages_are_fetched_a_bounded_window_ahead(monkeypatch):
+    monkeypatch.setattr(settings, "dolphin_page_concurrency", 4)
+    dolphin, fetched = make_client()
+
+    async def consume(count: int) -> list[str]:
+        names = []
+        crawl = dolphin._crawl_profiles()
+        async for profile in crawl:
+            names.append(profile.name)
+            if len(names) == count:
+                break
+        # Let any scheduled fetches run before checking the window
+        await asyncio.sleep(0.01)
+        await crawl.aclose()
+        return names
+
+    names = asyncio.run(consume(PAGE_SIZE + 1))
+
+    assert names[-1] == "user2_0"
+    # Page 1, the page being consumed, and at most 4 pages ahead
+    assert max(fetched) <= 2 + 4
+    assert len(fetched) == len(set(fetched))
+
+
+def test_full_crawl_yields_every_page_in_order(monkeypatch):
+    monkeypatch.setattr(settings, "dolphin_page_concurrency", 3)
+    dolphin, fetched = make_client()
+
+    async def crawl() -> list[str]:
+        return [p.id async for p in dolphin._crawl_profiles()]
+
+    ids = asyncio.run(crawl())
+
+    assert len(ids) == LAST_PAGE * PAGE_SIZE
+    assert ids[::PAGE_SIZE] == [f"{n}-0" for n in range(1, LAST_PAGE + 1)]
+    # Full last page: the crawl checks once for pages past the reported count
+    assert sorted(fetched) == list(range(1, LAST_PAGE + 2))
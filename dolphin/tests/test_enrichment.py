@@ -0,0 +1,43 @@
+from datetime import datetime, timezone
+
+from enrichment import enrich_result, enrich_results, get_derived
+
+
+def test_derived_fields_for_an_active_account(make_result):
+    result = make_result(age_days=3, karma=12, karma_change=5, activity=(3, 0))
+
+    derived = enrich_result(result)
+
+    assert result.derived is derived
+    assert derived.tier == "new"
+    assert derived.limit_status == "EXCEEDED"  # 3 of 3 comments
+    assert derived.warmup_warnings == ["EXCEEDED: alice has 3 comments (limit: 3)"]
+    assert derived.account_age == "3d"
+    assert derived.warmup_status == "warming"  # 10+ karma
+    assert derived.karma_delta == "+5"
+
+
+def test_limit_status_without_activity(make_result):
+    assert enrich_result(make_result()).limit_status == "OK"
+    assert enrich_result(make_result(status="suspended", age_days=0)).limit_status == "N/A"
+    assert enrich_result(make_result(karma_change=-3)).karma_delta == "-3"
+
+
+def test_get_derived_computes_once(make_result):
+    result = make_result(activity=(1, 0))
+    first = get_derived(result)
+
+    assert get_derived(result) is first
+
+
+def test_batch_shares_one_reference_time(make_result):
+    now = datetime(2026, 1, 10, tzinfo=timezone.utc)
+    created = datetime(2026, 1, 1, tzinfo=timezone.utc).timestamp()
+    results = [make_result("a"), make_result("b")]
+    for r in results:
+        r.reddit.created_utc = created
+
+    enrich_results(results, now)
+
+    assert [r.derived.account_age for r in results] == ["9d", "9d"]
+    assert [r.derived.tier for r in results] == ["warming", "warming"]
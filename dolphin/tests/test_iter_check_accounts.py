@@ -0,0 +1,147 @@
+import asyncio
+
+import pytest
+
+from models import RedditStatus
+from sources.reddit import RedditChecker
+
+# Seconds each account's check takes - later accounts finish first
+DELAYS = {"a": 0.03, "b": 0.02, "c": 0.01}
+
+
+def make_checker(batch_shadowban: bool = False) -> tuple[RedditChecker, list]:
+    reddit = RedditChecker(use_profile_proxies=False, batch_shadowban=batch_shadowban)
+    reddit.client = object()  # No requests are sent
+    calls = []
+
+    async def check_account(username, proxy_url=None):
+        calls.append(("check", username, proxy_url))
+        await asyncio.sleep(DELAYS[username])
+        return RedditStatus(username=username, status="active")
+
+    async def record_newest_post(client, username):
+        calls.append(("record", username))
+
+    async def verify_shadowbans(usernames):
+        calls.append(("verify", sorted(usernames)))
+        return {"b"}
+
+    reddit.check_account = check_account
+    reddit._record_newest_post = record_newest_post
+    reddit.verify_shadowbans = verify_shadowbans
+    return reddit, calls
+
+
+async def collect(reddit: RedditChecker, **kwargs) -> list[RedditStatus]:
+    return [status async for status in reddit.iter_check_accounts(["a", "b", "c"], **kwargs)]
+
+
+def test_as_completed_yields_in_finish_order_with_each_proxy():
+    reddit, calls = make_checker()
+    proxies = {"a": "http://p1:8000", "b": None, "c": "http://p3:8000"}
+
+    statuses = asyncio.run(collect(reddit, proxy_urls=proxies, concurrency=3))
+
+    assert [s.username for s in statuses] == ["c", "b", "a"]
+    assert sorted(c for c in calls if c[0] == "check") == [
+        ("check", "a", "http://p1:8000"),
+        ("check", "b", None),
+        ("check", "c", "http://p3:8000"),
+    ]
+
+
+def test_ordered_yields_in_input_order():
+    reddit, _ = make_checker()
+
+    statuses = asyncio.run(collect(reddit, concurrency=3, ordered=True))
+
+    assert [s.username for s in statuses] == ["a", "b", "c"]
+
+
+def test_batch_shadowban_holds_results_until_verified():
+    for ordered in (False, True):
+        reddit, calls = make_checker(batch_shadowban=True)
+
+        async def run() -> list[tuple[str, str]]:
+            # Status as yielded - a provisional "active" must never escape
+            yielded = []
+            async for status in reddit.iter_check_accounts(
+                ["a", "b", "c"], concurrency=3, ordered=ordered
+            ):
+                calls.append(("yield", status.username))
+                yielded.append((status.username, status.status))
+            return yielded
+
+        yielded = asyncio.run(run())
+
+        assert sorted(yielded) == [("a", "active"), ("b", "shadowbanned"), ("c", "active")]
+        assert [c[0] for c in calls].index("verify") < [c[0] for c in calls].index("yield")
+        assert ("verify", ["a", "b", "c"]) in calls
+        assert sum(1 for c in calls if c[0] == "record") == 3
+        if ordered:
+            assert [username for username, _ in yielded] == ["a", "b", "c"]
+
+
+def test_check_accounts_keeps_input_order():
+    reddit, _ = make_checker()
+
+    statuses = asyncio.run(reddit.check_accounts(["a", "b", "c"], concurrency=3))
+
+    assert [s.username for s in statuses] == ["a", "b", "c"]
+
+
+def test_failed_check_raises_and_cancels_the_rest():
+    reddit, _ = make_checker()
+    cancelled = []
+    check_account = reddit.check_account
+
+    async def failing_check_account(username, proxy_url=None):
+        if username == "c":
+            raise ValueError("boom")
+        try:
+            return await check_account(username, proxy_url)
+        except asyncio.CancelledError:
+            cancelled.append(username)
+            raise
+
+    reddit.check_account = failing_check_account
+
+    with pytest.raises(ValueError, match="boom"):
+        asyncio.run(collect(reddit, concurrency=3))
+    assert sorted(cancelled) == ["a", "b"]
+
+
+def test_iter_checks_consumes_an_async_source_in_prefetched_chunks():
+    reddit, _ = make_checker()
+    reddit.batch_lookup = True
+    prefetched = []
+
+    async def prefetch_accounts(usernames):
+        prefetched.append(usernames)
+        return len(usernames)
+
+    reddit.prefetch_accounts = prefetch_accounts
+
+    async def usernames():
+        for username in ["a", "b", "c"]:
+            yield username
+
+    async def check(index, username):
+        return RedditStatus(username=username, status="active")
+
+    async def run() -> list[tuple[int, str]]:
+        return [
+            (index, status.username)
+            async for index, status in reddit.iter_checks(
+                usernames(),
+                check,
+                status_of=lambda status: status,
+                username_of=lambda username: username,
+                concurrency=2,
+                ordered=True,
+            )
+        ]
+
+    assert asyncio.run(run()) == [(0, "a"), (1, "b"), (2, "c")]
+    # Fewer than BATCH_LOOKUP_SIZE accounts - one lookup for all of them
+    assert prefetched == [["a", "b", "c"]]
@@ -0,0 +1,45 @@
+import asyncio
+
+import httpx
+
+from sources.reddit import RedditChecker
+
+LISTING = b'{"data": {"children": [{"kind": "t3", "data": {"name": "t3_a"}}]}}'
+
+
+def make_checker() -> tuple[RedditChecker, list[str]]:
+    reddit = RedditChecker(use_profile_proxies=False)
+    requested = []
+
+    async def get(client, url, params=None):
+        requested.append(url)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, content=LISTING)
+
+    reddit._get = get
+    return reddit, requested
+
+
+def test_listing_is_shared_within_an_account_then_released():
+    reddit, requested = make_checker()
+    alice = "https://www.reddit.com/user/Alice/submitted.json?limit=25"
+    bob = "https://www.reddit.com/user/bob/submitted.json?limit=25"
+
+    async def run() -> None:
+        # Concurrent and later callers share one request
+        await asyncio.gather(
+            reddit._fetch_listing(None, alice), reddit._fetch_listing(None, alice)
+        )
+        await reddit._fetch_listing(None, alice)
+        await reddit._fetch_listing(None, bob)
+        assert reddit._cached_listing(alice) is not None
+
+        reddit.release_account("alice")
+        assert reddit._cached_listing(alice) is None
+        assert reddit._cached_listing(bob) is not None
+        await reddit._fetch_listing(None, alice)
+
+    asyncio.run(run())
+
+    assert requested == [alice, bob, alice]
+    assert list(reddit._listings) == ["bob", "alice"]
@@ -0,0 +1,106 @@
+import asyncio
+import math
+import time
+
+from config import settings
+from models import DolphinProfile
+from sources.decoders import ProfilePage, ProfileRecord
+from sources.dolphin import PAGE_SIZE, DolphinClient
+from sources.profile_cache import ProfileCache
+
+
+def record(profile_id: int, updated_at: str) -> ProfileRecord:
+    return ProfileRecord(id=profile_id, name=f"user{profile_id}", updated_at=updated_at)
+
+
+def make_client(tmp_path, fleet: list[ProfileRecord]) -> tuple[DolphinClient, list[dict]]:
+    """Client whose /browser_profiles pages are served from `fleet`."""
+    dolphin = DolphinClient(use_cache=False)
+    dolphin.cache = ProfileCache(tmp_path / "profiles.db")
+    requests = []
+
+    async def page_params():
+        return {"limit": PAGE_SIZE}, {}
+
+    async def get_page(params, page):
+        requests.append({**params, "page": page})
+        rows = list(fleet)
+        if params.get("sortBy") == "updated_at":
+            rows.sort(key=lambda r: r.updated_at, reverse=True)
+        start = (page - 1) * PAGE_SIZE
+        return ProfilePage(
+            data=rows[start:start + PAGE_SIZE],
+            total=len(rows),
+            last_page=max(1, math.ceil(len(rows) / PAGE_SIZE)),
+        )
+
+    dolphin._page_params = page_params
+    dolphin._get_page = get_page
+    return dolphin, requests
+
+
+def cached_ids(dolphin: DolphinClient) -> list[str]:
+    return [p.id for p in asyncio.run(dolphin._cached_profiles())]
+
+
+def test_store_keeps_api_order_and_appends_new_rows(tmp_path):
+    cache = ProfileCache(tmp_path / "profiles.db")
+
+    def make(i: int, updated: str = "") -> DolphinProfile:
+        return DolphinProfile(str(i), f"u{i}", "", "", "", updated)
+
+    cache.replace_all([make(2), make(1)])
+
+    cache.upsert([make(1, "2026-01-02"), make(3)])
+
+    assert [p.id for p in cache.all()] == ["2", "1", "3"]
+    assert cache.all()[1].updated_at == "2026-01-02"
+    assert cache.watermark() == "2026-01-02"
+    assert cache.is_fresh(60)
+    cache.invalidate()
+    assert not cache.is_fresh(60)
+
+
+def test_fresh_cache_skips_the_api(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "dolphin_profile_cache_ttl", 900)
+    dolphin, requests = make_client(tmp_path, [record(1, "2026-01-01")])
+
+    assert cached_ids(dolphin) == ["1"]
+    assert cached_ids(dolphin) == ["1"]
+    assert len(requests) == 1
+
+
+def test_stale_cache_fetches_only_changed_profiles(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "dolphin_profile_cache_ttl", 0)
+    fleet = [record(i, f"2026-01-01 00:00:{i:02d}") for i in range(3 * PAGE_SIZE)]
+    dolphin, requests = make_client(tmp_path, fleet)
+    cached_ids(dolphin)
+    requests.clear()
+
+    fleet[5] = record(5, "2026-02-01 00:00:00")
+    fleet.append(record(999, "2026-02-01 00:00:01"))
+    ids = cached_ids(dolphin)
+
+    # One sorted page reaches back past the watermark
+    assert len(requests) == 1 and requests[0]["sortBy"] == "updated_at"
+    assert ids[-1] == "999" and len(ids) == 3 * PAGE_SIZE + 1
+    assert dolphin.cache.all()[5].updated_at == "2026-02-01 00:00:00"
+
+
+def test_deletion_or_old_crawl_forces_a_full_crawl(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "dolphin_profile_cache_ttl", 0)
+    fleet = [record(i, f"2026-01-01 00:00:{i:02d}") for i in range(5)]
+    dolphin, requests = make_client(tmp_path, fleet)
+    cached_ids(dolphin)
+
+    del fleet[2]
+    assert cached_ids(dolphin) == ["0", "1", "3", "4"]
+    assert "sortBy" not in requests[-1]
+
+    # Counts match, but the last full crawl is too old
+    requests.clear()
+    monkeypatch.setattr(settings, "dolphin_profile_cache_full_sync_hours", 1)
+    with dolphin.cache._conn() as db:
+        dolphin.cache._set_meta(db, "crawled_at", time.time() - 7200)
+    cached_ids(dolphin)
+    assert ["sortBy" in r for r in requests] == [False]
@@ -0,0 +1,69 @@
+import pytest
+
+from cleanup_profiles import STATE_TIMEZONES, plan_timezones
+from models import DolphinProfile
+from profile_plan import ProfilePlan
+from remediate_proxies import assign_state, generate_proxy_url, plan_remediation
+
+
+def profile(profile_id: str, proxy_url: str = "", timezone: str = "") -> DolphinProfile:
+    return DolphinProfile(
+        id=profile_id,
+        name=f"user{profile_id}",
+        owner="owner",
+        notes="",
+        created_at="",
+        updated_at="",
+        proxy_url=proxy_url,
+        timezone=timezone,
+    )
+
+
+def test_remediation_only_plans_profiles_that_differ():
+    healthy = profile("1", generate_proxy_url("user1", "texas"))
+    wrong_host = profile("2", "http://someone:pw@other.example.com:8000")
+    no_proxy = profile("3")
+
+    plan = plan_remediation([healthy, wrong_host, no_proxy])
+
+    assert [c.profile_id for c in plan.changes] == ["2", "3"]
+    assert plan.unchanged == 1
+    assert plan.changes[0].current == "someone"
+    # Displays never include the proxy password
+    assert all("pw" not in c.current and "pw" not in c.target for c in plan.changes)
+
+
+def test_rerun_on_a_remediated_fleet_plans_nothing():
+    profiles = [profile(str(i)) for i in range(20)]
+    assert len(plan_remediation(profiles).changes) == 20
+
+    # As applied: each profile on its round-robin state's session
+    fixed = [
+        profile(p.id, generate_proxy_url(p.name, assign_state(i))) for i, p in enumerate(profiles)
+    ]
+
+    assert not plan_remediation(fixed).changes
+
+
+def test_timezones_only_planned_when_different():
+    state, timezone = next(iter(STATE_TIMEZONES.items()))
+    proxy = generate_proxy_url("user", state)
+    profiles = [profile("1", proxy, timezone), profile("2", proxy), profile("3")]
+
+    plan = plan_timezones(profiles)
+
+    assert [(c.profile_id, c.current, c.target) for c in plan.changes] == [("2", "auto", timezone)]
+    assert plan.unchanged == 2
+
+
+def test_saved_plan_round_trips(tmp_path):
+    plan = plan_remediation([profile("1")])
+    path = tmp_path / "plan.json"
+    plan.save(path)
+
+    loaded = ProfilePlan.load(path, kind="remediate_proxies")
+
+    assert loaded == plan
+    assert [m.profile_id for m in loaded.mutations()] == ["1"]
+    with pytest.raises(ValueError):
+        ProfilePlan.load(path, kind="fix_timezones")
@@ -0,0 +1,84 @@
+import asyncio
+
+import httpx
+import pytest
+
+from sources import ratelimit
+from sources.ratelimit import RESERVE, RateLimiter
+
+
+@pytest.fixture
+def waits(monkeypatch) -> list[float]:
+    """Record acquire() waits instead of sleeping."""
+    recorded = []
+
+    async def sleep(seconds):
+        recorded.append(seconds)
+
+    monkeypatch.setattr(ratelimit.asyncio, "sleep", sleep)
+    return recorded
+
+
+def headers(remaining: float, reset: float, used: float | None = None) -> httpx.Headers:
+    values = {"x-ratelimit-remaining": str(remaining), "x-ratelimit-reset": str(reset)}
+    if used is not None:
+        values["x-ratelimit-used"] = str(used)
+    return httpx.Headers(values)
+
+
+def test_configured_spacing_until_headers_arrive():
+    limiter = RateLimiter(2.0, 5.0)
+
+    for _ in range(50):
+        assert 2.0 <= limiter._spacing(0.0) <= 5.0
+
+
+def test_share_widens_configured_and_header_spacing():
+    limiter = RateLimiter(2.0, 5.0, share=3)
+    for _ in range(50):
+        assert 6.0 <= limiter._spacing(0.0) <= 15.0
+
+    limiter.update(headers(remaining=11, reset=100))
+    at = limiter.reset_at - 100
+    for _ in range(50):
+        # 100s over 10 usable requests = 10s apart, jittered 0.5x-1.5x, times 3
+        assert 15.0 <= limiter._spacing(at) <= 45.0
+
+
+def test_headers_without_budget_are_ignored():
+    limiter = RateLimiter(2.0, 5.0)
+    limiter.update(httpx.Headers({"x-ratelimit-used": "3"}))
+
+    assert limiter.remaining is None
+
+
+def test_concurrent_acquires_queue_behind_each_other(waits):
+    limiter = RateLimiter(1.0, 1.0)
+
+    async def run() -> None:
+        await asyncio.gather(*(limiter.acquire() for _ in range(4)))
+
+    asyncio.run(run())
+
+    # Slots are reserved synchronously: 0s, ~1s, ~2s, ~3s
+    assert [round(w) for w in waits] == [1, 2, 3]
+
+
+def test_spent_budget_waits_for_the_reset(waits):
+    limiter = RateLimiter(0.0, 0.0)
+    limiter.update(headers(remaining=RESERVE, reset=30, used=99))
+
+    asyncio.run(limiter.acquire())
+
+    assert 30.0 <= waits[-1] <= 31.1
+    # A fresh window is assumed once the old one has ended
+    assert limiter.remaining == 100 - 1
+
+
+def test_pause_holds_the_next_request(waits):
+    limiter = RateLimiter(0.0, 0.0)
+    limiter.pause(20)
+
+    asyncio.run(limiter.acquire())
+
+    assert waits[-1] == pytest.approx(20, abs=0.1)
@@ -0,0 +1,114 @@
+import asyncio
+import json
+import time
+
+from sources.activity_ledger import ActivityLedger
+from sources.decoders import decode_listing
+from sources.reddit import RedditChecker
+
+
+def listing(*names: str, after: str | None = None) -> bytes:
+    now = time.time()
+    children = [
+        {"kind": "t1", "data": {"name": name, "created_utc": now - i}}
+        for i, name in enumerate(names)
+    ]
+    return json.dumps({"data": {"children": children, "after": after}}).encode()
+
+
+def make_checker(tmp_path, pages: dict[str, bytes]) -> tuple[RedditChecker, list[str]]:
+    """Checker whose listing requests are answered from `pages` (by query string)."""
+    reddit = RedditChecker(use_profile_proxies=False)
+    reddit.activity_ledger = ActivityLedger(tmp_path / "ledger.json")
+    requested = []
+
+    async def fetch_listing(client, url):
+        requested.append(url)
+        query = url.partition("/user/alice/comments.json?")[2]
+        assert query in pages, f"Unexpected request {url}"
+        return 200, decode_listing(pages[query])
+
+    reddit._fetch_listing = fetch_listing
+    return reddit, requested
+
+
+def sync(reddit: RedditChecker) -> None:
+    asyncio.run(reddit._sync_listing(None, "alice", "comments", since=0))
+
+
+def test_idle_cursor_is_kept(tmp_path):
+    reddit, requested = make_checker(
+        tmp_path, {"limit=100": listing("t1_a", "t1_older", after="t1_older")}
+    )
+    reddit.activity_ledger.record("alice", "comments", [("t1_a", "t1", time.time())])
+
+    sync(reddit)
+
+    assert reddit.activity_ledger.cursor("alice", "comments") == "t1_a"
+    assert len(requested) == 1
+
+
+def test_new_items_on_the_newest_page_advance_the_cursor(tmp_path):
+    reddit, requested = make_checker(
+        tmp_path, {"limit=100": listing("t1_c", "t1_b", "t1_a", after="t1_a")}
+    )
+    reddit.activity_ledger.record("alice", "comments", [("t1_a", "t1", time.time() - 60)])
+
+    sync(reddit)
+
+    assert reddit.activity_ledger.cursor("alice", "comments") == "t1_c"
+    assert reddit.activity_ledger.rolling_counts("alice") == (3, 0)
+    assert len(requested) == 1
+
+
+def test_cursor_past_the_newest_page_pages_with_before(tmp_path):
+    reddit, requested = make_checker(
+        tmp_path,
+        {
+            "limit=100": listing("t1_c", "t1_b", after="t1_b"),
+            "limit=100&before=t1_a": listing("t1_c", "t1_b"),
+        },
+    )
+    reddit.activity_ledger.record("alice", "comments", [("t1_a", "t1", time.time() - 60)])
+
+    sync(reddit)
+
+    assert reddit.activity_ledger.cursor("alice", "comments") == "t1_c"
+    assert reddit.activity_ledger.rolling_counts("alice") == (3, 0)
+    assert len(requested) == 2
+
+
+def test_deleted_cursor_resyncs_at_once(tmp_path):
+    # The whole listing fits on the newest page, without the cursor
+    reddit, requested = make_checker(
+        tmp_path, {"limit=100": listing("t1_new", "t1_old")}
+    )
+    reddit.activity_ledger.record("alice", "comments", [("t1_gone", "t1", time.time() - 60)])
+
+    sync(reddit)
+
+    assert reddit.activity_ledger.cursor("alice", "comments") == "t1_new"
+    assert reddit.activity_ledger.rolling_counts("alice") == (3, 0)
+    assert len(requested) == 1
+
+
+def test_deleted_cursor_resync_continues_from_the_newest_page(tmp_path):
+    reddit, requested = make_checker(
+        tmp_path,
+        {
+            "limit=100": listing("t1_new", after="t1_new"),
+            "limit=100&before=t1_gone": listing(),
+            "limit=100&after=t1_new": listing("t1_old"),
+        },
+    )
+    reddit.activity_ledger.record("alice", "comments", [("t1_gone", "t1", time.time() - 60)])
+
+    sync(reddit)
+
+    assert reddit.activity_ledger.cursor("alice", "comments") == "t1_new"
+    assert reddit.activity_ledger.rolling_counts("alice") == (3, 0)
+    assert [url.partition("?")[2] for url in requested] == [
+        "limit=100",
+        "limit=100&before=t1_gone",
+        "limit=100&after=t1_new",
+    ]
@@ -0,0 +1,51 @@
+import asyncio
+
+import httpx
+import pytest
+
+from sources.reddit_oauth import TokenManager
+
+TOKEN_URL = "https://www.reddit.com/api/v1/access_token"
+
+
+def get_token(manager: TokenManager, handler) -> str:
+    async def run() -> str:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await manager.get_token(client)
+
+    return asyncio.run(run())
+
+
+def token_response(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"access_token": "tok", "expires_in": 3600})
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        httpx.Response(200, text="<html>Service unavailable</html>"),
+        httpx.Response(200, json={"error": "invalid_grant"}),
+        httpx.Response(200, json=["not", "a", "token"]),
+    ],
+)
+def test_bad_token_payload_is_a_request_error(tmp_path, response):
+    manager = TokenManager(TOKEN_URL, "id", "secret", path=tmp_path / "token.json")
+
+    with pytest.raises(httpx.RequestError):
+        get_token(manager, lambda request: response)
+
+
+def test_cached_token_is_reused_for_the_same_endpoint_only(tmp_path):
+    path = tmp_path / "token.json"
+    first = TokenManager(TOKEN_URL, "id", "secret", api_base="https://oauth.reddit.com", path=path)
+    assert get_token(first, token_response) == "tok"
+
+    same = TokenManager(TOKEN_URL, "id", "secret", api_base="https://oauth.reddit.com", path=path)
+    assert same._valid()
+
+    other_api = TokenManager(TOKEN_URL, "id", "secret", api_base="http://localhost:8080", path=path)
+    other_url = TokenManager(
+        "http://localhost:8080/token", "id", "secret", api_base="https://oauth.reddit.com", path=path
+    )
+    assert not other_api._valid()
+    assert not other_url._valid()
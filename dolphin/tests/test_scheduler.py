@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta, timezone
+
+from scheduler import (
+    AT_RISK_INTERVAL,
+    STATUS_INTERVALS,
+    TIER_INTERVALS,
+    compute_check_interval,
+    is_due,
+    update_schedule,
+)
+
+NOW = datetime(2026, 1, 10, 12, tzinfo=timezone.utc)
+
+
+def entry(last_checked: datetime, interval: timedelta) -> dict:
+    return {
+        "last_checked": last_checked.isoformat(),
+        "next_check": (last_checked + interval).isoformat(),
+    }
+
+
+def test_interval_by_tier_status_and_risk():
+    assert compute_check_interval("established", "active") == TIER_INTERVALS["established"]
+    assert compute_check_interval("new", "suspended") == STATUS_INTERVALS["suspended"]
+    assert compute_check_interval("established", "active", status_changed=True) == AT_RISK_INTERVAL
+    # Falling or spiking karma halves the interval, never below the at-risk one
+    assert compute_check_interval("established", "active", karma_velocity=-1) == timedelta(hours=24)
+    assert compute_check_interval("established", "active", karma_velocity=80) == timedelta(hours=24)
+    assert compute_check_interval("new", "active", karma_velocity=-1) == timedelta(hours=3)
+    assert compute_check_interval("bogus", "active") == TIER_INTERVALS["unknown"]
+
+
+def test_unscheduled_or_unreadable_accounts_are_due():
+    assert is_due({}, "alice", NOW)
+    assert is_due({"alice": {"next_check": ""}}, "alice", NOW)
+    assert is_due({"alice": {"next_check": "not a date"}}, "alice", NOW)
+
+
+def test_due_within_the_grace_window():
+    # 24h interval: due from 2.4h before next_check (a daily run starting early)
+    schedule = {"alice": entry(NOW - timedelta(hours=23), timedelta(hours=24))}
+    assert is_due(schedule, "alice", NOW)
+
+    schedule = {"alice": entry(NOW - timedelta(hours=20), timedelta(hours=24))}
+    assert not is_due(schedule, "alice", NOW)
+
+
+def test_missing_last_checked_means_no_grace():
+    schedule = {"alice": {"next_check": (NOW + timedelta(minutes=1)).isoformat()}}
+
+    assert not is_due(schedule, "alice", NOW)
+    assert is_due(schedule, "alice", NOW + timedelta(minutes=1))
+
+
+def test_update_schedule_records_checked_accounts_only(make_result):
+    schedule = {"bob": {"next_check": "kept"}}
+    results = [make_result("alice", age_days=3), make_result("carol", status="error")]
+
+    updated = update_schedule(schedule, results, changed_accounts=[], velocities={}, now=NOW)
+
+    assert updated["bob"] == {"next_check": "kept"}
+    assert updated["alice"]["tier"] == "new"
+    assert updated["alice"]["next_check"] == (NOW + TIER_INTERVALS["new"]).isoformat()
+    assert updated["carol"]["tier"] == "unknown"
+    assert updated["carol"]["next_check"] == (NOW + STATUS_INTERVALS["error"]).isoformat()
+    assert not is_due(updated, "alice", NOW + timedelta(hours=5))
+    assert is_due(updated, "alice", NOW + timedelta(hours=6))
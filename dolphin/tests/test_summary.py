@@ -0,0 +1,53 @@
+from summary import RunSummary
+
+
+def test_aggregates_in_one_pass(make_result):
+    summary = RunSummary([
+        make_result("a", karma=100, karma_change=5, activity=(3, 0), age_days=3, owner="ann"),
+        make_result("b", karma=50, karma_change=-2, activity=(1, 1), owner="ann"),
+        make_result("c", status="suspended", category="Banned", karma=0, owner="bo",
+                    proxy_status="fail"),
+    ])
+
+    assert len(summary) == 3
+    assert summary.statuses == {"active": 2, "suspended": 1}
+    assert summary.categories == {"Active": 2, "Banned": 1}
+    assert summary.owner_categories == {"ann": {"Active": 2}, "bo": {"Banned": 1}}
+    assert summary.owner_karma == {"ann": 150, "bo": 0}
+    assert (summary.total_karma, summary.total_delta) == (150, 3)
+    assert (summary.total_comments, summary.total_posts) == (4, 1)
+    assert summary.proxy_failures == 1
+    assert summary.warmup_tiers == {"new": 1, "established": 1}
+    assert summary.limit_statuses == {"EXCEEDED": 1, "OK": 1}
+    assert [w["username"] for w in summary.warmup_warnings] == ["a"]
+
+
+def test_newer_result_replaces_the_old_one(make_result):
+    summary = RunSummary([make_result("a", karma=100, activity=(3, 0), age_days=3)])
+
+    summary.add(make_result("a", status="shadowbanned", category="Shadowbanned", karma=90))
+
+    assert len(summary) == 1
+    assert summary.statuses == {"shadowbanned": 1}
+    assert summary.total_karma == 90
+    assert summary.total_comments == 0
+    assert not summary.warmup_tiers
+    assert summary.warmup_warnings == []
+
+
+def test_discard_removes_every_trace(make_result):
+    summary = RunSummary([make_result("a", owner="ann", activity=(1, 0)), make_result("b")])
+
+    summary.discard("a")
+    summary.discard("missing")
+
+    assert summary.profile_ids() == {"b"}
+    assert "ann" not in summary.owner_categories
+    assert "ann" not in summary.owner_karma
+    assert summary.total_comments == 0
+
+
+def test_partial_when_fleet_is_larger(make_result):
+    assert RunSummary([make_result("a")], fleet_size=5).partial
+    assert not RunSummary([make_result("a")], fleet_size=1).partial
+    assert not RunSummary([make_result("a")]).partial
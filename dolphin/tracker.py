@@ -6,24 +6,52 @@ Fetches profiles from Dolphin Anty and checks Reddit karma for each account.
 Uses async modules for Dolphin API and Reddit checking with anti-detection.
 """
 
+import argparse
 import asyncio
+import copy
 import csv
 import json
 import logging
 import re
+import signal
 import sys
-from collections import Counter
-from datetime import datetime
+import time
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, Callable
 
 from alerts import notify_bans, notify_proxy_failures, notify_warmup_warnings
-from config import setup_logging
-from models import DolphinProfile, RedditStatus, AccountResult, ProxyHealth
-from warmup import get_warmup_limits, check_warmup_thresholds
+from config import settings, setup_logging
+from journal import RunJournal
+from metrics import run_metrics
+from shards import (
+    clear_manifest,
+    clear_shard_outputs,
+    load_shard_outputs,
+    parse_shard_spec,
+    run_workers,
+    shard_for,
+    shard_run_window,
+    shard_journal,
+    shard_key,
+    write_manifest,
+)
+from models import DolphinProfile, AccountResult
+from enrichment import enrich_result, enrich_results
+from summary import RunSummary
 from sheets_sync import sync_to_sheet, archive_stale_profiles, archive_dead_accounts
 from sources import DolphinClient, RedditChecker
 from sources.proxy_health import ProxyHealthChecker
-from state import load_state, save_state, build_current_state, detect_changes, update_not_found_tracking
+from reporting import calculate_karma_velocity, snapshot_karma
+from scheduler import is_due, update_schedule
+from state import (
+    load_state,
+    save_state,
+    build_current_state,
+    carry_forward_unchecked,
+    detect_changes,
+    update_not_found_tracking,
+)
 
 # Module-level logger
 logger = logging.getLogger("tracker")
@@ -83,253 +111,785 @@ def save_history(history: dict) -> None:
         json.dump(history, f, indent=2)
 
 
-async def run_tracker(limit: int | None = None) -> int:
+def record_history(history: dict, results: list[AccountResult], today: str) -> None:
+    """Store today's karma snapshot for every active account in results."""
+    for r in results:
+        if r.reddit.status != "active":
+            continue
+        if r.profile.name not in history:
+            history[r.profile.name] = {}
+        history[r.profile.name][today] = {
+            "total_karma": r.reddit.total_karma,
+            "comment_karma": r.reddit.comment_karma,
+            "link_karma": r.reddit.link_karma,
+        }
+
+
+async def check_profile(
+    reddit: RedditChecker,
+    proxy_checker: ProxyHealthChecker,
+    profile: DolphinProfile,
+    history: dict,
+    position: str,
+) -> AccountResult:
     """
-    Main tracking function. Pass limit to only check first N profiles.
+    Run all Reddit and proxy checks for a single profile.
 
-    Returns:
-        int: Exit code (0=success, 1=failure)
+    History is only read here (for karma_change); record_history applies
+    the results once checking is done, including results resumed from
+    the run journal.
     """
+    logger.info(f"{position} Checking {profile.name}...")
+
     try:
-        logger.info("Starting tracker...")
+        # Check Reddit status
+        status = await reddit.check_account(profile.name, profile.proxy_url)
+        run_metrics.incr(f"status.{status.status}")
+
+        # Fetch activity counts for active accounts
+        activity = None
+        karma_change = 0
+        if status.status == "active":
+            logger.info(
+                f"  {profile.name} karma: {status.total_karma} "
+                f"(comment: {status.comment_karma}, link: {status.link_karma})"
+            )
 
-        # Fetch Dolphin profiles
-        logger.info("Fetching Dolphin profiles...")
-        async with DolphinClient() as dolphin:
-            profiles = await dolphin.get_profiles()
-        logger.info(f"Found {len(profiles)} profiles")
+            # Fetch activity counts
+            with run_metrics.span("reddit.activity"):
+                activity = await reddit.get_activity_counts(profile.name, profile.proxy_url)
+            logger.debug(f"  {profile.name} activity: {activity.comments_today} comments, {activity.posts_today} posts today")
+
+            # Calculate karma change
+            if profile.name in history and history[profile.name]:
+                last_entry = list(history[profile.name].values())[-1]
+                # Same definition as snapshot_karma, whichever lookup path ran
+                karma = status.comment_karma + status.link_karma
+                karma_change = karma - snapshot_karma(last_entry)
+        else:
+            logger.info(f"  {profile.name} status: {status.status}")
+    finally:
+        # Listings are only shared between one account's own checks
+        reddit.release_account(profile.name)
+
+    # Categorize account
+    category = categorize_account(profile.notes, status.status)
+
+    # Check proxy health (use full URL with credentials)
+    with run_metrics.span("proxy_health"):
+        proxy_health = await proxy_checker.check(profile.proxy_url or "")
+
+    return AccountResult(
+        profile=profile,
+        reddit=status,
+        category=category,
+        karma_change=karma_change,
+        checked_at=datetime.now().isoformat(),
+        proxy_health=proxy_health,
+        activity=activity,
+    )
+
+
+def mark_shadowbanned(result: AccountResult) -> None:
+    """Downgrade a provisionally active result to shadowbanned."""
+    result.reddit.status = "shadowbanned"
+    result.category = categorize_account(result.profile.notes, "shadowbanned")
+    # Match results from the inline check: no activity or karma change
+    result.activity = None
+    result.karma_change = 0
+    result.derived = None
+    run_metrics.incr("status.active", -1)
+    run_metrics.incr("status.shadowbanned")
+
+
+def log_shadowbanned(result: AccountResult) -> None:
+    """Log and downgrade a result found shadowbanned by a batched check."""
+    logger.info(f"  {result.profile.name} status: shadowbanned")
+    mark_shadowbanned(result)
+
+
+async def apply_shadowban_checks(reddit: RedditChecker, results: list[AccountResult]) -> None:
+    """Batch-verify provisionally active results (REDDIT_BATCH_SHADOWBAN)."""
+    active = [r for r in results if r.reddit.status == "active"]
+    if not active:
+        return
+
+    shadowbanned = await reddit.verify_shadowbans([r.reddit.username for r in active])
+    for r in active:
+        if r.reddit.username in shadowbanned:
+            log_shadowbanned(r)
+
+
+async def check_profiles(
+    profiles: AsyncIterable[DolphinProfile],
+    history: dict,
+    concurrency: int = 1,
+    on_result: Callable[[AccountResult], None] | None = None,
+) -> list[AccountResult]:
+    """
+    Check profiles with at most `concurrency` accounts in flight at once.
 
-        # Extract profile IDs for stale detection
-        dolphin_profile_ids = {str(p.id) for p in profiles}
+    Profiles are consumed as the iterator yields them, so checking starts
+    while later Dolphin pages are still loading. Every Reddit request still
+    goes through RedditChecker._random_delay, whose randomized pacing
+    (INFRA-02) is per egress: workers on the same connection or proxy take
+    turns, so more workers only add throughput across egresses.
 
-        if limit:
-            profiles = profiles[:limit]
-            logger.info(f"Test mode: checking only first {limit} profiles")
+    Runs check_profile for each profile on RedditChecker.iter_checks, the
+    same engine as iter_check_accounts, so batched lookups and batched
+    shadowban checks follow one set of rules.
 
-        # Load history
-        history = load_history()
-        today = datetime.now().strftime("%Y-%m-%d")
+    on_result is called as soon as each profile finishes (e.g. to journal it).
+    With batched shadowban checks, results are held until their batch has
+    been verified, so on_result only ever sees final statuses.
 
-        # Check Reddit status for each profile
-        results: list[AccountResult] = []
-        proxy_checker = ProxyHealthChecker()
-
-        async with RedditChecker() as reddit:
-            for i, profile in enumerate(profiles):
-                logger.info(f"[{i+1}/{len(profiles)}] Checking {profile.name}...")
-
-                # Check Reddit status
-                status = await reddit.check_account(profile.name)
-
-                # Fetch activity counts for active accounts
-                activity = None
-                if status.status == "active":
-                    logger.info(f"  Karma: {status.total_karma} (comment: {status.comment_karma}, link: {status.link_karma})")
-
-                    # Fetch activity counts
-                    activity = await reddit.get_activity_counts(profile.name)
-                    logger.debug(f"  Activity: {activity.comments_today} comments, {activity.posts_today} posts today")
-
-                    # Calculate karma change
-                    karma_change = 0
-                    if profile.name in history and history[profile.name]:
-                        last_entry = list(history[profile.name].values())[-1]
-                        karma_change = status.total_karma - last_entry.get("total_karma", 0)
-
-                    # Update history
-                    if profile.name not in history:
-                        history[profile.name] = {}
-                    history[profile.name][today] = {
-                        "total_karma": status.total_karma,
-                        "comment_karma": status.comment_karma,
-                        "link_karma": status.link_karma,
-                    }
-                else:
-                    logger.info(f"  Status: {status.status}")
-                    karma_change = 0
-
-                # Categorize account
-                category = categorize_account(profile.notes, status.status)
-
-                # Check proxy health (use full URL with credentials)
-                proxy_health = await proxy_checker.check(profile.proxy_url or "")
-
-                # Create result
-                result = AccountResult(
-                    profile=profile,
-                    reddit=status,
-                    category=category,
-                    karma_change=karma_change,
-                    checked_at=datetime.now().isoformat(),
-                    proxy_health=proxy_health,
-                    activity=activity,
+    Returns:
+        list[AccountResult] in the same order the profiles were yielded.
+    """
+    results: dict[int, AccountResult] = {}
+    proxy_checker = ProxyHealthChecker()
+
+    async with RedditChecker() as reddit:
+
+        async def check(index: int, profile: DolphinProfile) -> AccountResult:
+            with run_metrics.span("check_profile"):
+                return await check_profile(
+                    reddit,
+                    proxy_checker,
+                    profile,
+                    history,
+                    position=f"[{index + 1}]",
                 )
-                results.append(result)
 
-        # Save history
-        save_history(history)
+        async for index, result in reddit.iter_checks(
+            profiles,
+            check,
+            status_of=lambda result: result.reddit,
+            username_of=lambda profile: profile.name,
+            concurrency=concurrency,
+            on_shadowbanned=log_shadowbanned,
+        ):
+            results[index] = result
+            if on_result:
+                on_result(result)
+
+    return [results[i] for i in sorted(results)]
+
+
+def send_warmup_alerts(summary: RunSummary) -> None:
+    """Alert on the warmup threshold warnings collected in a summary."""
+    warmup_warnings = summary.warmup_warnings
+    if warmup_warnings:
+        logger.warning(f"Warmup warnings: {len(warmup_warnings)} account(s)")
+        notify_warmup_warnings(warmup_warnings)
+
+
+def update_state(
+    results: list[AccountResult],
+    previous_state: dict,
+    unchecked: list[DolphinProfile],
+    history: dict,
+    now_utc: datetime,
+) -> dict:
+    """
+    Diff results against the previous state, alert on new problems and save.
 
-        # Check warmup thresholds and collect warnings
-        warmup_warnings = []
-        for result in results:
-            if result.activity and result.reddit.status == "active":
-                limits_info = get_warmup_limits(result.reddit.created_utc)
-                if limits_info["limits"]:
-                    warnings = check_warmup_thresholds(
-                        result.activity,
-                        limits_info["limits"],
-                    )
-                    for warning in warnings:
-                        warmup_warnings.append({
-                            "username": result.profile.name,
-                            "message": warning,
-                        })
-
-        # Send warmup alerts
-        if warmup_warnings:
-            logger.warning(f"Warmup warnings: {len(warmup_warnings)} account(s)")
-            notify_warmup_warnings(warmup_warnings)
-
-        # State tracking and alerts
-        try:
-            previous_state = load_state()
-            current_state = build_current_state(results)
-            changes = detect_changes(previous_state, current_state)
-
-            # Send alerts for new problems
-            if changes["new_bans"]:
-                logger.warning(f"New bans detected: {changes['new_bans']}")
-                notify_bans(changes["new_bans"])
-
-            if changes["new_proxy_failures"]:
-                logger.warning(f"New proxy failures detected: {changes['new_proxy_failures']}")
-                notify_proxy_failures(changes["new_proxy_failures"])
-
-            # Track not_found duration and archive dead accounts
-            account_history = previous_state.get("account_history", {})
-            updated_history, dead_accounts = update_not_found_tracking(
-                current_state["accounts"],
-                account_history,
-                threshold_days=7,
-            )
-            current_state["account_history"] = updated_history
+    Args:
+        results: Results to apply (a whole run, or one daemon flush).
+        previous_state: Last saved state.
+        unchecked: Profiles still in Dolphin but not in results (carried forward).
+        history: Karma history (for schedule velocity).
+        now_utc: Reference time for the check schedule.
 
-            if dead_accounts:
-                logger.info(f"Archiving {len(dead_accounts)} dead account(s): {dead_accounts}")
-                try:
-                    archive_dead_accounts(dead_accounts)
-                except Exception as e:
-                    logger.warning(f"Failed to archive dead accounts: {e}")
-
-            # Save current state for next run
-            save_state(current_state)
+    Returns:
+        The new state dict that was saved.
+    """
+    current_state = build_current_state(results)
+    carry_forward_unchecked(current_state, previous_state, unchecked)
+    changes = detect_changes(previous_state, current_state)
+
+    # Send alerts for new problems
+    if changes["new_bans"]:
+        logger.warning(f"New bans detected: {changes['new_bans']}")
+        notify_bans(changes["new_bans"])
+
+    if changes["new_proxy_failures"]:
+        logger.warning(f"New proxy failures detected: {changes['new_proxy_failures']}")
+        notify_proxy_failures(changes["new_proxy_failures"])
+
+    # Track not_found duration and archive dead accounts
+    account_history = previous_state.get("account_history", {})
+    updated_history, dead_accounts = update_not_found_tracking(
+        current_state["accounts"],
+        account_history,
+        threshold_days=7,
+    )
+    current_state["account_history"] = updated_history
+    # Carried-forward accounts were archived when last checked; re-archiving
+    # them on every daemon flush would reopen the Sheet each time
+    checked = {r.reddit.username for r in results}
+    dead_accounts = [username for username in dead_accounts if username in checked]
+
+    # Pick next-check times for the accounts in results
+    current_state["schedule"] = update_schedule(
+        previous_state.get("schedule", {}),
+        results,
+        changes["changed_accounts"],
+        calculate_karma_velocity(history, days=7),
+        now=now_utc,
+    )
+
+    if dead_accounts:
+        logger.info(f"Archiving {len(dead_accounts)} dead account(s): {dead_accounts}")
+        try:
+            archive_dead_accounts(dead_accounts)
         except Exception as e:
-            logger.warning(f"Alerting failed: {e}")
-            # Continue with CSV export and Sheets sync
-
-        # Export to CSV
-        csv_file = Path(__file__).parent / f"tracking_{today}.csv"
-        csv_rows = []
-        for r in results:
-            # Clean notes for CSV (remove HTML tags)
-            clean_notes = re.sub(r'<[^>]+>', '', r.profile.notes).strip() if r.profile.notes else ""
-
-            csv_rows.append({
-                "profile_id": r.profile.id,
-                "reddit_username": r.profile.name,
-                "owner": r.profile.owner,
-                "category": r.category,
-                "dolphin_created": r.profile.created_at,
-                "dolphin_last_active": r.profile.updated_at,
-                "total_karma": r.reddit.total_karma,
-                "comment_karma": r.reddit.comment_karma,
-                "link_karma": r.reddit.link_karma,
-                "karma_change": r.karma_change,
-                "reddit_status": r.reddit.status,
-                "notes": clean_notes,
-                "checked_at": r.checked_at,
-            })
-
-        if csv_rows:
-            with open(csv_file, "w", newline="") as f:
-                writer = csv.DictWriter(f, fieldnames=csv_rows[0].keys())
+            logger.warning(f"Failed to archive dead accounts: {e}")
+
+    # Save current state for next run
+    save_state(current_state)
+    return current_state
+
+
+def export_csv(results: list[AccountResult], today: str, append: bool = False) -> None:
+    """Write results to tracking_{today}.csv (append adds rows to an existing file)."""
+    csv_file = Path(__file__).parent / f"tracking_{today}.csv"
+    csv_rows = []
+    for r in results:
+        # Clean notes for CSV (remove HTML tags)
+        clean_notes = re.sub(r'<[^>]+>', '', r.profile.notes).strip() if r.profile.notes else ""
+
+        csv_rows.append({
+            "profile_id": r.profile.id,
+            "reddit_username": r.profile.name,
+            "owner": r.profile.owner,
+            "category": r.category,
+            "dolphin_created": r.profile.created_at,
+            "dolphin_last_active": r.profile.updated_at,
+            "total_karma": r.reddit.total_karma,
+            "comment_karma": r.reddit.comment_karma,
+            "link_karma": r.reddit.link_karma,
+            "karma_change": r.karma_change,
+            "reddit_status": r.reddit.status,
+            "notes": clean_notes,
+            "checked_at": r.checked_at,
+        })
+
+    if csv_rows:
+        write_header = not append or not csv_file.exists()
+        with open(csv_file, "a" if append else "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=csv_rows[0].keys())
+            if write_header:
                 writer.writeheader()
-                writer.writerows(csv_rows)
-            logger.info(f"Results saved to {csv_file}")
+            writer.writerows(csv_rows)
+        logger.info(f"Results saved to {csv_file}")
 
-        # Sync to Google Sheets
-        try:
-            logger.info("Syncing to Google Sheets...")
-            stats = sync_to_sheet(results)
-            logger.info(f"Sheets sync complete: {stats['updated']} updated, {stats['inserted']} inserted")
 
-            # Archive profiles deleted from Dolphin
-            archive_stats = archive_stale_profiles(dolphin_profile_ids)
+def sync_sheets(
+    results: list[AccountResult],
+    dolphin_profile_ids: set[str] | None = None,
+    summary: RunSummary | None = None,
+) -> None:
+    """
+    Upsert results to Google Sheets and archive profiles gone from Dolphin.
+
+    Best-effort: failures are logged, never raised.
+    """
+    try:
+        logger.info("Syncing to Google Sheets...")
+        with run_metrics.span("sheets_sync"):
+            stats = sync_to_sheet(results, summary=summary)
+        logger.info(f"Sheets sync complete: {stats['updated']} updated, {stats['inserted']} inserted")
+
+        # Archive profiles deleted from Dolphin
+        if dolphin_profile_ids is not None:
+            with run_metrics.span("sheets_archive"):
+                archive_stats = archive_stale_profiles(dolphin_profile_ids)
             if archive_stats["archived"] > 0:
                 logger.info(f"Archived {archive_stats['archived']} stale profile(s)")
-        except Exception as e:
-            logger.warning(f"Sheets sync failed: {e}")
-            # Don't fail the whole run - CSV export already succeeded
+    except Exception as e:
+        logger.warning(f"Sheets sync failed: {e}")
+        # Don't fail the whole run - CSV export already succeeded
 
-        # Log summary by category
-        categories = Counter(r.category for r in results)
-        total_karma_all = sum(r.reddit.total_karma for r in results)
 
+def log_summary(summary: RunSummary) -> None:
+    """Log category, warmup and per-owner breakdowns."""
+    # Log summary by category
+    if summary.partial:
+        logger.info(f"=== SUMMARY BY CATEGORY ({len(summary)} of {summary.fleet_size} checked this run) ===")
+    else:
         logger.info("=== SUMMARY BY CATEGORY ===")
-        for cat, count in categories.most_common():
+    for cat, count in summary.categories.most_common():
+        logger.info(f"  {cat}: {count}")
+    scope = "checked accounts" if summary.partial else "all accounts"
+    logger.info(f"Total karma across {scope}: {summary.total_karma}")
+
+    # Log warmup status breakdown
+    if summary.warmup_tiers:
+        logger.info("=== WARMUP STATUS ===")
+        for tier, count in summary.warmup_tiers.most_common():
+            logger.info(f"  {tier}: {count}")
+        for status, count in summary.limit_statuses.most_common():
+            logger.info(f"  {status}: {count}")
+
+    # Log category breakdown by owner
+    logger.info("=== BY OWNER ===")
+    for owner, owner_cats in summary.owner_categories.items():
+        logger.info(f"{owner}:")
+        for cat, count in owner_cats.most_common():
             logger.info(f"  {cat}: {count}")
-        logger.info(f"Total karma across all accounts: {total_karma_all}")
-
-        # Log warmup status breakdown
-        warmup_tiers = Counter()
-        limit_statuses = Counter()
-        for r in results:
-            if r.activity and r.reddit.status == "active":
-                limits_info = get_warmup_limits(r.reddit.created_utc)
-                warmup_tiers[limits_info["tier"]] += 1
-                warnings = check_warmup_thresholds(r.activity, limits_info.get("limits", {}))
-                if any("EXCEEDED" in w for w in warnings):
-                    limit_statuses["EXCEEDED"] += 1
-                elif any("WARNING" in w for w in warnings):
-                    limit_statuses["WARNING"] += 1
-                else:
-                    limit_statuses["OK"] += 1
-
-        if warmup_tiers:
-            logger.info("=== WARMUP STATUS ===")
-            for tier, count in warmup_tiers.most_common():
-                logger.info(f"  {tier}: {count}")
-            for status, count in limit_statuses.most_common():
-                logger.info(f"  {status}: {count}")
-
-        # Log category breakdown by owner
-        logger.info("=== BY OWNER ===")
-        owners = set(r.profile.owner for r in results)
-        for owner in owners:
-            owner_results = [r for r in results if r.profile.owner == owner]
-            owner_cats = Counter(r.category for r in owner_results)
-            owner_karma = sum(r.reddit.total_karma for r in owner_results)
-            logger.info(f"{owner}:")
-            for cat, count in owner_cats.most_common():
-                logger.info(f"  {cat}: {count}")
-            logger.info(f"  Total karma: {owner_karma}")
+        logger.info(f"  Total karma: {summary.owner_karma[owner]}")
+
+
+def write_run_metrics() -> None:
+    """Log the slowest stages and export this run's metrics file."""
+    try:
+        run_metrics.log_slowest()
+        path = run_metrics.write()
+        logger.info(f"Run metrics saved to {path}")
+    except Exception as e:
+        logger.warning(f"Failed to write run metrics: {e}")
+
+
+def publish_results(
+    results: list[AccountResult],
+    history: dict,
+    previous_state: dict,
+    unchecked: list[DolphinProfile],
+    dolphin_profile_ids: set[str],
+    today: str,
+    now_utc: datetime,
+) -> None:
+    """Send a completed run's results to history, state/alerts, CSV and Sheets."""
+    # Derived fields (tier, limits, age) once per result, shared by every sink
+    enrich_results(results, now_utc)
+    # Not-due accounts keep their earlier rows; the summary says it is partial
+    summary = RunSummary(results, fleet_size=len(results) + len(unchecked))
+
+    # Save history
+    with run_metrics.span("history_save"):
+        record_history(history, results, today)
+        save_history(history)
+
+    with run_metrics.span("warmup_alerts"):
+        send_warmup_alerts(summary)
+
+    # State tracking and alerts
+    try:
+        with run_metrics.span("state_diff"):
+            update_state(results, previous_state, unchecked, history, now_utc)
+    except Exception as e:
+        logger.warning(f"Alerting failed: {e}")
+        # Continue with CSV export and Sheets sync
+
+    with run_metrics.span("csv_export"):
+        # Adaptive runs check a slice of the fleet several times a day -
+        # append so earlier runs' rows for today are kept
+        export_csv(results, today, append=settings.tracker_adaptive_schedule)
+    sync_sheets(results, dolphin_profile_ids, summary=summary)
+    log_summary(summary)
+
+
+async def run_tracker(
+    limit: int | None = None,
+    resume: bool = False,
+    shard: tuple[int, int] | None = None,
+    run_window: str | None = None,
+) -> int:
+    """
+    Main tracking function. Pass limit to only check first N profiles.
+
+    Every finished profile is appended to the run journal. With resume=True,
+    profiles already journaled today are reused instead of re-checked.
+
+    With shard=(index, count), only checks the profiles owned by that shard
+    and leaves its journal and manifest for merge_shards instead of
+    publishing results itself. run_window (default today) is the date the
+    run is journaled and recorded under; run_sharded gives all its workers
+    the same one, even if some start after midnight.
+
+    Returns:
+        int: Exit code (0=success, 1=failure)
+    """
+    run_metrics.reset(label=f"shard{shard[0] + 1}of{shard[1]}" if shard else "run")
+    try:
+        logger.info("Starting tracker...")
+
+        # Load history
+        history = load_history()
+        today = run_window or datetime.now().strftime("%Y-%m-%d")
+
+        # Previous run state (also holds the adaptive check schedule)
+        previous_state = load_state()
+        schedule = previous_state.get("schedule", {})
+        adaptive = settings.tracker_adaptive_schedule
+        now_utc = datetime.now(tz=timezone.utc)
+
+        # Profile IDs for stale detection (collected while streaming)
+        dolphin_profile_ids: set[str] = set()
+        # Profiles skipped because they are not due yet (adaptive schedule)
+        not_due: list[DolphinProfile] = []
+
+        # Crash-safe journal of finished profiles for this run window
+        if shard:
+            shard_index, shard_count = shard
+            logger.info(f"Shard worker {shard_index + 1}/{shard_count}")
+            journal = shard_journal(shard_index, shard_count, today)
+            clear_manifest(shard_index, shard_count)
+        else:
+            journal = RunJournal(run_window=today)
+        if resume:
+            resumed = journal.load()
+            logger.info(f"Resuming run: {len(resumed)} profile(s) already checked today")
+        else:
+            journal.clear()
+            resumed = {}
+        resumed_results: list[AccountResult] = []
+
+        if limit:
+            logger.info(f"Test mode: checking only first {limit} profiles")
+
+        async def stream_profiles(dolphin: DolphinClient) -> AsyncIterator[DolphinProfile]:
+            async for profile in dolphin.iter_profiles():
+                dolphin_profile_ids.add(str(profile.id))
+                if shard and shard_for(shard_key(profile), shard_count) != shard_index:
+                    continue
+                # Keep paging past the limit so stale detection sees every ID
+                if limit and len(dolphin_profile_ids) > limit:
+                    continue
+                if str(profile.id) in resumed:
+                    resumed_results.append(resumed[str(profile.id)])
+                    continue
+                if adaptive and not is_due(schedule, profile.name, now_utc):
+                    not_due.append(profile)
+                    continue
+                yield profile
+
+        # Stream Dolphin profiles straight into Reddit checking (bounded concurrency)
+        logger.info("Fetching Dolphin profiles...")
+        async with DolphinClient() as dolphin:
+            results = await check_profiles(
+                stream_profiles(dolphin),
+                history,
+                concurrency=settings.tracker_concurrency,
+                on_result=journal.append,
+            )
+        results = resumed_results + results
+        run_metrics.incr("profiles_seen", len(dolphin_profile_ids))
+        run_metrics.incr("profiles_checked", len(results) - len(resumed_results))
+        run_metrics.incr("profiles_resumed", len(resumed_results))
+        run_metrics.incr("profiles_not_due", len(not_due))
+        logger.info(f"Found {len(dolphin_profile_ids)} profiles, checked {len(results)}")
+        if not_due:
+            logger.info(f"Adaptive schedule: skipped {len(not_due)} account(s) not due yet")
+
+        if shard:
+            # Merge step publishes once every shard has finished
+            write_manifest(shard_index, shard_count, today, dolphin_profile_ids, not_due)
+            logger.info(f"Shard {shard_index + 1}/{shard_count} finished")
+            return 0
+
+        publish_results(
+            results,
+            history,
+            previous_state,
+            not_due,
+            dolphin_profile_ids,
+            today,
+            now_utc,
+        )
+
+        # Run completed - nothing left to resume
+        journal.clear()
 
         return 0
 
     except Exception as e:
         logger.exception(f"Tracker failed with error: {e}")
         return 1
+    finally:
+        write_run_metrics()
+
+
+async def merge_shards(count: int, run_window: str | None = None) -> int:
+    """
+    Combine the results of `count` finished shard workers and publish them.
+
+    The run window defaults to the one recorded in the shard outputs, so a
+    run that crosses midnight is still merged under the date it started.
+
+    Returns:
+        int: Exit code (0=success, 1=failure)
+    """
+    run_metrics.reset(label="merge")
+    try:
+        today = run_window or shard_run_window(count)
+        if not today:
+            raise RuntimeError(f"No shard outputs to merge for {count} shard(s)")
+        results, dolphin_profile_ids, unchecked = load_shard_outputs(count, today)
+        logger.info(f"Merging {len(results)} result(s) from {count} shard(s)")
+
+        # Stable output order regardless of how profiles were sharded
+        results.sort(key=lambda r: r.profile.id)
+
+        publish_results(
+            results,
+            load_history(),
+            load_state(),
+            unchecked,
+            dolphin_profile_ids,
+            today,
+            datetime.now(tz=timezone.utc),
+        )
+
+        clear_shard_outputs(count)
+        return 0
+
+    except Exception as e:
+        logger.exception(f"Shard merge failed with error: {e}")
+        return 1
+    finally:
+        write_run_metrics()
+
+
+async def run_sharded(count: int, resume: bool = False) -> int:
+    """
+    Run `count` local shard worker processes, then merge their results.
+
+    If a worker fails, its finished profiles stay journaled; re-run with
+    resume=True to only check the rest. A resumed run keeps the run window
+    of the interrupted one, even on the next day.
+
+    Returns:
+        int: Exit code (0=success, 1=failure)
+    """
+    run_window = (resume and shard_run_window(count)) or datetime.now().strftime("%Y-%m-%d")
+    exit_codes = await run_workers(
+        count,
+        Path(__file__),
+        ["--run-window", run_window, *(["--resume"] if resume else [])],
+    )
+    failed = [i + 1 for i, code in enumerate(exit_codes) if code != 0]
+    if failed:
+        logger.error(f"Shard worker(s) failed: {failed} - re-run with --resume")
+        return 1
 
+    return await merge_shards(count, run_window)
 
-def main() -> int:
+
+async def run_daemon() -> int:
+    """
+    Long-running tracker that spreads checks evenly over a rolling cycle.
+
+    Keeps HTTP clients, karma history and run state in memory. Each cycle
+    re-reads the Dolphin profile list and starts one account check every
+    DAEMON_CYCLE_HOURS / N, so Reddit traffic is flat instead of one daily
+    burst. Finished results are flushed to history, state/alerts, CSV and
+    Sheets every DAEMON_FLUSH_SECONDS, so a ban is noticed within minutes.
+
+    Returns:
+        int: Exit code (0 when stopped by SIGTERM/SIGINT)
+    """
+    cycle_seconds = settings.daemon_cycle_hours * 3600
+    history = load_history()
+    state = load_state()
+    profiles: list[DolphinProfile] = []
+    # Rolling aggregate of the newest result per profile (sheet summary row,
+    # cycle summary); updated as each check finishes
+    summary = RunSummary()
+    pending: list[AccountResult] = []
+    last_flush = time.monotonic()
+
+    semaphore = asyncio.Semaphore(max(1, settings.tracker_concurrency))
+    proxy_checker = ProxyHealthChecker()
+
+    # launchd stops jobs with SIGTERM - cancel cleanly so pending results flush
+    loop = asyncio.get_running_loop()
+    main_task = asyncio.current_task()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, main_task.cancel)
+
+    async def flush() -> None:
+        """Push finished results to every sink."""
+        nonlocal pending, last_flush
+        batch, pending = pending, []
+        last_flush = time.monotonic()
+        if not batch:
+            return
+
+        logger.info(f"Flushing {len(batch)} result(s)")
+        if reddit.batch_shadowban:
+            try:
+                await apply_shadowban_checks(reddit, batch)
+            except asyncio.CancelledError:
+                # Stopped mid-flush: hand the batch back to the final flush
+                pending = batch + pending
+                raise
+            for result in batch:
+                if result.derived is None:
+                    enrich_result(result)
+                    summary.add(result)
+        # Sheets, Slack and file writes block - run them off the event loop
+        # so in-flight checks keep going. Checks keep updating `summary`,
+        # the ID cache and the activity ledger, so the thread gets snapshots.
+        reddit_state = reddit.snapshot_state()
+        publish = asyncio.ensure_future(
+            asyncio.to_thread(
+                publish_batch, batch, list(profiles), copy.deepcopy(summary), reddit_state
+            )
+        )
+        saved = False
+        try:
+            saved = await asyncio.shield(publish)
+        except asyncio.CancelledError:
+            # History is already being written - finish the batch, then stop
+            saved = await publish
+            raise
+        finally:
+            if not saved:
+                reddit.restore_state(reddit_state)
+
+    def publish_batch(
+        batch: list[AccountResult],
+        profiles: list[DolphinProfile],
+        summary_snapshot: RunSummary,
+        reddit_state: tuple[dict, dict],
+    ) -> bool:
+        """Write one flushed batch to history, state/alerts, CSV and Sheets.
+
+        Returns:
+            False if the Reddit state snapshot failed to save
+        """
+        nonlocal state
+        now_utc = datetime.now(tz=timezone.utc)
+        today = datetime.now().strftime("%Y-%m-%d")
+        record_history(history, batch, today)
+        save_history(history)
+
+        send_warmup_alerts(RunSummary(batch))
+
+        checked_ids = {r.profile.id for r in batch}
+        try:
+            state = update_state(
+                batch,
+                state,
+                [p for p in profiles if p.id not in checked_ids],
+                history,
+                now_utc,
+            )
+        except Exception as e:
+            logger.warning(f"Alerting failed: {e}")
+
+        export_csv(batch, today, append=True)
+        sync_sheets(batch, summary=summary_snapshot)
+        return reddit.save_state(reddit_state)
+
+    async with RedditChecker() as reddit:
+
+        async def check(profile: DolphinProfile, position: str) -> None:
+            try:
+                async with semaphore:
+                    with run_metrics.span("check_profile"):
+                        result = await check_profile(reddit, proxy_checker, profile, history, position)
+            except Exception as e:
+                logger.exception(f"Check failed for {profile.name}: {e}")
+                return
+            enrich_result(result)
+            pending.append(result)
+            summary.add(result)
+
+        in_flight: set[asyncio.Task] = set()
+        try:
+            while True:
+                cycle_start = time.monotonic()
+                run_metrics.reset(label="daemon")
+                # Listings cached last cycle are a whole cycle old
+                reddit.clear_cache()
+
+                try:
+                    async with DolphinClient() as dolphin:
+                        profiles = await dolphin.get_profiles()
+                except Exception as e:
+                    logger.warning(f"Dolphin profile fetch failed, retrying in 60s: {e}")
+                    await asyncio.sleep(60)
+                    continue
+                if not profiles:
+                    # Nothing to schedule (and nothing to archive against) -
+                    # wait out the cycle instead of re-fetching in a loop
+                    logger.warning("Dolphin returned no profiles, waiting for the next cycle")
+                    await flush()
+                    await asyncio.sleep(max(0.0, cycle_start + cycle_seconds - time.monotonic()))
+                    continue
+                dolphin_profile_ids = {str(p.id) for p in profiles}
+
+                # Forget results for profiles deleted from Dolphin
+                for profile_id in summary.profile_ids() - dolphin_profile_ids:
+                    summary.discard(profile_id)
+                try:
+                    archive_stats = await asyncio.to_thread(
+                        archive_stale_profiles, dolphin_profile_ids
+                    )
+                    if archive_stats["archived"] > 0:
+                        logger.info(f"Archived {archive_stats['archived']} stale profile(s)")
+                except Exception as e:
+                    logger.warning(f"Stale profile archiving failed: {e}")
+
+                spacing = cycle_seconds / max(len(profiles), 1)
+                logger.info(
+                    f"Daemon cycle: {len(profiles)} profiles, one check every {spacing:.0f}s"
+                )
+
+                for i, profile in enumerate(profiles):
+                    task = asyncio.create_task(check(profile, f"[{i + 1}/{len(profiles)}]"))
+                    in_flight.add(task)
+                    task.add_done_callback(in_flight.discard)
+
+                    if time.monotonic() - last_flush >= settings.daemon_flush_seconds:
+                        await flush()
+
+                    # Wait for this profile's slot to end (keeps the cycle on schedule)
+                    await asyncio.sleep(max(0.0, cycle_start + (i + 1) * spacing - time.monotonic()))
+
+                if in_flight:
+                    await asyncio.gather(*in_flight)
+                await flush()
+                log_summary(summary)
+                write_run_metrics()
+
+        except asyncio.CancelledError:
+            logger.info("Daemon stopping...")
+            for task in in_flight:
+                task.cancel()
+            return 0
+        finally:
+            await flush()
+
+
+def main(
+    resume: bool = False,
+    daemon: bool = False,
+    shard: tuple[int, int] | None = None,
+    workers: int | None = None,
+    merge: int | None = None,
+    run_window: str | None = None,
+) -> int:
     """Entry point for scheduled execution."""
     setup_logging()
 
     logger.info("=" * 60)
-    logger.info("Starting scheduled tracker run")
+    logger.info("Starting tracker daemon" if daemon else "Starting scheduled tracker run")
 
     try:
-        exit_code = asyncio.run(run_tracker())
+        if daemon:
+            exit_code = asyncio.run(run_daemon())
+        elif workers:
+            exit_code = asyncio.run(run_sharded(workers, resume=resume))
+        elif merge:
+            exit_code = asyncio.run(merge_shards(merge, run_window))
+        else:
+            exit_code = asyncio.run(
+                run_tracker(resume=resume, shard=shard, run_window=run_window)
+            )
         if exit_code == 0:
             logger.info("Tracker completed successfully")
         else:
@@ -344,11 +904,39 @@ def main() -> int:
 
 
 if __name__ == "__main__":
-    test_mode = "--test" in sys.argv
-    if test_mode:
+    parser = argparse.ArgumentParser(description="Track Reddit accounts for Dolphin profiles")
+    parser.add_argument("--test", action="store_true", help="Interactive run on the first 5 profiles")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip profiles already journaled by an interrupted run today",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Long-running mode: rolling checks spread over the day",
+    )
+    parser.add_argument("--shard", metavar="I/N", help="Run as shard worker I of N (publish with --merge N)")
+    parser.add_argument("--workers", type=int, metavar="N", help="Run N local shard workers, then merge")
+    parser.add_argument("--merge", type=int, metavar="N", help="Merge and publish results of N finished shards")
+    parser.add_argument("--run-window", metavar="YYYY-MM-DD", help="Run window of a shard worker or merge (default: today, or the shards' own)")
+    parser.add_argument("--refresh-team", action="store_true", help="Re-fetch Dolphin team users (e.g. after adding a member)")
+    args = parser.parse_args()
+
+    if args.refresh_team:
+        DolphinClient.invalidate_team_users()
+
+    if args.test:
         # Interactive testing - setup logging but stay in foreground
         setup_logging()
-        asyncio.run(run_tracker(limit=5))
+        asyncio.run(run_tracker(limit=5, resume=args.resume))
     else:
         # Scheduled execution - proper entry point with exit codes
-        sys.exit(main())
+        sys.exit(main(
+            resume=args.resume,
+            daemon=args.daemon,
+            shard=parse_shard_spec(args.shard) if args.shard else None,
+            workers=args.workers,
+            merge=args.merge,
+            run_window=args.run_window,
+        ))
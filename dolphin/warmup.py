@@ -43,11 +43,12 @@ WARMUP_TIERS = {
 }
 
 
-def get_warmup_limits(created_utc: float) -> dict:
+def get_warmup_limits(created_utc: float, now: datetime | None = None) -> dict:
     """Get activity limits based on account age.
 
     Args:
         created_utc: Unix timestamp from Reddit API (UTC)
+        now: Reference time (defaults to current UTC time)
 
     Returns:
         dict with 'tier' name and 'limits' from WARMUP_TIERS
@@ -58,7 +59,7 @@ def get_warmup_limits(created_utc: float) -> dict:
 
     try:
         created = datetime.fromtimestamp(created_utc, tz=timezone.utc)
-        now = datetime.now(tz=timezone.utc)
+        now = now or datetime.now(tz=timezone.utc)
         delta = now - created
         age_days = delta.days
 